@@ -0,0 +1,253 @@
+"""
+alert_dispatcher.py - alert_seller용 카카오톡 알림 발송 큐
+
+- alert_seller Tool은 큐에 넣고 message_id만 바로 반환 → 에이전트 루프가 발송을 기다리지 않음
+- 같은 판매자/수준/내용의 알림은 dedupe 구간(초) 안에서 한 번만 발송 (같은 message_id 반환)
+- info / warning 알림은 판매자별로 coalesce 구간 동안 모아서 요약(digest) 1건으로 발송
+- urgent 알림은 모으지 않고 바로 발송
+- 발송은 asyncio 워커 1개가 담당하고, 동시에 진행 중인 발송 수는 max_in_flight로 제한
+- 실제 발송(sender)은 교체 가능: MockKakaoSender(기록만) / KakaoHttpSender(keep-alive 연결 풀로 HTTP POST)
+"""
+
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from http_pool import PooledHttpClient
+
+ALERT_LEVELS = ("info", "warning", "urgent")
+DEFAULT_SELLER_ID = "me"
+LEVEL_LABELS = {"info": "정보", "warning": "경고", "urgent": "긴급"}
+# status()로 조회할 수 있는 최근 message_id 수
+MAX_TRACKED_MESSAGES = 10000
+
+
+def alert_message_id(seller_id: str, message: str, alert_level: str) -> str:
+    """같은 알림이면 항상 같은 ID (dedupe 키 겸용)"""
+    digest = hashlib.sha256(f"{seller_id}\x1f{alert_level}\x1f{message}".encode("utf-8")).hexdigest()
+    return f"KA-{digest[:10]}"
+
+
+def format_digest(alerts: List[Dict[str, Any]]) -> str:
+    lines = [f"[스마트스토어 알림 {len(alerts)}건]"]
+    lines.extend(f"- ({LEVEL_LABELS.get(a['level'], a['level'])}) {a['message']}" for a in alerts)
+    return "\n".join(lines)
+
+
+class MockKakaoSender:
+    """네트워크 없이 발송 내용만 기록"""
+
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+
+    async def __call__(self, seller_id: str, text: str, alert_level: str):
+        self.sent.append({"seller_id": seller_id, "text": text, "level": alert_level})
+
+    def close(self):
+        pass
+
+
+class KakaoHttpSender:
+    """카카오 메시지 API(호환 엔드포인트)로 POST (호스트별 keep-alive 연결 재사용)"""
+
+    def __init__(
+        self,
+        endpoint: str,
+        token: Optional[str] = None,
+        max_connections: int = 4,
+        timeout: float = 5.0,
+        http: Optional[PooledHttpClient] = None
+    ):
+        self.endpoint = endpoint
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        # http를 받으면 다른 업스트림과 연결 풀을 공유 (닫는 것은 만든 쪽에서)
+        self._owns_http = http is None
+        self.http = http or PooledHttpClient(max_connections_per_host=max_connections, timeout=timeout)
+
+    async def __call__(self, seller_id: str, text: str, alert_level: str):
+        payload = {"receiver_id": seller_id, "text": text, "level": alert_level}
+        status, body = await asyncio.to_thread(self.http.request_json, "POST", self.endpoint, payload, self.headers)
+        if status >= 400:
+            raise RuntimeError(f"Kakao API {status}: {body}")
+
+    def close(self):
+        if self._owns_http:
+            self.http.close()
+
+
+class AlertDispatcher:
+    """
+    submit()은 Tool 스레드 풀에서 호출 (스레드 안전), 발송은 start()한 이벤트 루프에서 진행
+    start() 전에 들어온 알림은 큐에 남아 있다가 start() 후 발송
+    """
+
+    def __init__(
+        self,
+        sender: Optional[Callable] = None,
+        coalesce_seconds: float = 2.0,
+        dedupe_seconds: float = 300.0,
+        max_digest: int = 20,
+        max_in_flight: int = 4,
+        max_retries: int = 2
+    ):
+        self.sender = sender or MockKakaoSender()
+        self.coalesce_seconds = coalesce_seconds
+        self.dedupe_seconds = dedupe_seconds
+        self.max_digest = max_digest
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._urgent: List[Dict[str, Any]] = []
+        self._digests: Dict[str, Dict[str, Any]] = {} # seller_id → {"since", "alerts"}
+        self._recent: "OrderedDict[str, float]" = OrderedDict() # message_id → 접수 시각 (dedupe)
+        self._status: "OrderedDict[str, str]" = OrderedDict() # message_id → queued / sent / failed
+        self.stats = {"submitted": 0, "deduplicated": 0, "deliveries": 0, "delivered_alerts": 0, "failed_alerts": 0, "retries": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._closing = False
+
+    # ---------- 접수 (Tool 스레드) ----------
+
+    def submit(self, message: str, alert_level: str, seller_id: str = DEFAULT_SELLER_ID) -> Dict[str, Any]:
+        """큐에 넣고 바로 반환: {"status", "message_id", "delivery"} (+ 중복이면 "deduplicated")"""
+        now = time.monotonic()
+        message_id = alert_message_id(seller_id, message, alert_level)
+        delivery = "immediate" if alert_level == "urgent" else "digest"
+        with self._lock:
+            while self._recent:
+                received_at = next(iter(self._recent.values()))
+                if now - received_at < self.dedupe_seconds:
+                    break
+                self._recent.popitem(last=False)
+            if message_id in self._recent:
+                self.stats["deduplicated"] += 1
+                return {"status": self._status.get(message_id, "queued"), "message_id": message_id, "delivery": delivery, "deduplicated": True}
+
+            self._recent[message_id] = now
+            self._set_status(message_id, "queued")
+            self.stats["submitted"] += 1
+            alert = {"message_id": message_id, "seller_id": seller_id, "message": message, "level": alert_level}
+            if delivery == "immediate":
+                self._urgent.append(alert)
+            else:
+                self._digests.setdefault(seller_id, {"since": now, "alerts": []})["alerts"].append(alert)
+        self._notify()
+        return {"status": "queued", "message_id": message_id, "delivery": delivery}
+
+    def status(self, message_id: str) -> Optional[str]:
+        with self._lock:
+            return self._status.get(message_id)
+
+    def _set_status(self, message_id: str, status: str):
+        # 호출하는 쪽에서 self._lock을 잡고 있어야 함
+        self._status[message_id] = status
+        self._status.move_to_end(message_id)
+        while len(self._status) > MAX_TRACKED_MESSAGES:
+            self._status.popitem(last=False)
+
+    def _notify(self):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    # ---------- 발송 (이벤트 루프) ----------
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._worker = asyncio.create_task(self._run())
+
+    async def close(self):
+        """남은 알림(모으는 중인 digest 포함)을 모두 발송한 뒤 종료"""
+        if self._worker is not None:
+            self._closing = True
+            self._wakeup.set()
+            await self._worker
+            self._worker = None
+            self._loop = None
+        self.sender.close()
+
+    def _take_ready(self, now: float) -> Tuple[List[List[Dict[str, Any]]], Optional[float]]:
+        """지금 보낼 묶음들과 다음으로 digest가 준비되는 시각"""
+        with self._lock:
+            batches = [[alert] for alert in self._urgent]
+            self._urgent = []
+            next_deadline = None
+            for seller_id in list(self._digests):
+                pending = self._digests[seller_id]
+                deadline = pending["since"] + self.coalesce_seconds
+                if self._closing or now >= deadline or len(pending["alerts"]) >= self.max_digest:
+                    alerts = pending["alerts"]
+                    batches.extend(alerts[i:i + self.max_digest] for i in range(0, len(alerts), self.max_digest))
+                    del self._digests[seller_id]
+                elif next_deadline is None or deadline < next_deadline:
+                    next_deadline = deadline
+            return batches, next_deadline
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.max_in_flight)
+        in_flight = set()
+
+        async def deliver(batch):
+            async with slots:
+                await self._deliver(batch)
+
+        while True:
+            self._wakeup.clear()
+            batches, next_deadline = self._take_ready(time.monotonic())
+            for batch in batches:
+                task = asyncio.create_task(deliver(batch))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if self._closing and next_deadline is None:
+                break
+            timeout = None if next_deadline is None else max(0.0, next_deadline - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def _deliver(self, batch: List[Dict[str, Any]]):
+        seller_id = batch[0]["seller_id"]
+        if len(batch) == 1:
+            text, level = batch[0]["message"], batch[0]["level"]
+        else:
+            text = format_digest(batch)
+            level = "warning" if any(a["level"] == "warning" for a in batch) else "info"
+
+        status = "failed"
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.sender(seller_id, text, level)
+                status = "sent"
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"  ⚠️  알림 발송 실패 ({len(batch)}건): {type(e).__name__}: {e}")
+                    break
+                with self._lock:
+                    self.stats["retries"] += 1
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+        with self._lock:
+            for alert in batch:
+                self._set_status(alert["message_id"], status)
+            if status == "sent":
+                self.stats["deliveries"] += 1
+                self.stats["delivered_alerts"] += len(batch)
+            else:
+                self.stats["failed_alerts"] += len(batch)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._urgent) + sum(len(p["alerts"]) for p in self._digests.values())
+            return {**self.stats, "pending": pending}
@@ -0,0 +1,257 @@
+"""
+catalog_store.py - analyze_product_strategy용 로컬 상품 카탈로그 (SQLite)
+
+- products 테이블: product_id(PRIMARY KEY) → 상품명, 카테고리, 재고, 대표 키워드, 키워드 트렌드 변화율
+- keyword 보조 인덱스: 분석 키워드로 트렌드 조회
+- stock_level 보조 인덱스: get_store_dashboard의 재고부족 조회 (재고 적은 순, 결과 개수만큼만 읽음)
+  (이 인덱스가 없는 예전 카탈로그도 동작하지만 전체 스캔 → load로 다시 적재하면 생성)
+- 여러 상품/키워드는 IN (...) 조회 한 번으로 (analyze_products_batch용)
+- 재고 변경 이벤트(update_stock)는 쓰기 연결 1개로 해당 행만 갱신 (WAL → 조회 연결은 다음 조회부터 새 값)
+- 조회는 읽기 전용 + 메모리 맵(mmap) 연결을 스레드마다 하나씩 사용 → 시작 시 전체를 메모리에 올리지 않고 수 µs 단위 조회
+- CSV / JSONL 일괄 적재 (같은 product_id는 덮어씀)
+
+입력 파일 컬럼 (CSV 헤더 또는 JSONL 키):
+    product_id, name, category, stock_level, keyword, trend_change_percent
+
+실행:
+    python catalog_store.py load --db data/catalog.sqlite products.csv more_products.jsonl
+    python catalog_store.py lookup --db data/catalog.sqlite P123
+"""
+
+import os
+import csv
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from typing import Dict, Any, List, Iterator, Optional
+
+CATALOG_COLUMNS = ("product_id", "name", "category", "stock_level", "keyword", "trend_change_percent")
+LOAD_BATCH_SIZE = 5000
+MMAP_SIZE = 256 * 1024 * 1024
+# IN (?, ...) 한 번에 넣는 값 수 (SQLite 변수 개수 제한)
+_MAX_SQL_VARIABLES = 500
+
+
+def _connect_for_load(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF") # 일괄 적재 중에는 fsync 생략 (실패 시 다시 적재)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS products ("
+        " product_id TEXT PRIMARY KEY,"
+        " name TEXT,"
+        " category TEXT,"
+        " stock_level INTEGER,"
+        " keyword TEXT,"
+        " trend_change_percent REAL"
+        ") WITHOUT ROWID"
+    )
+    return conn
+
+
+def _read_rows(source: str) -> Iterator[Dict[str, Any]]:
+    """CSV / JSONL 파일의 행을 하나씩 반환 (확장자로 형식 판단)"""
+    with open(source, "r", encoding="utf-8-sig", newline="") as f:
+        if source.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def _to_record(row: Dict[str, Any]) -> tuple:
+    stock = row.get("stock_level")
+    trend = row.get("trend_change_percent")
+    return (
+        str(row["product_id"]).strip(),
+        row.get("name") or None,
+        row.get("category") or None,
+        int(stock) if stock not in (None, "") else None,
+        (row.get("keyword") or "").strip() or None,
+        float(trend) if trend not in (None, "") else None
+    )
+
+
+def load_catalog(db_path: str, sources: List[str]) -> int:
+    """CSV/JSONL 파일들을 카탈로그에 일괄 적재하고 적재한 행 수 반환"""
+    conn = _connect_for_load(db_path)
+    # 적재 중에는 보조 인덱스를 없애고 마지막에 한 번에 생성 (행마다 인덱스 갱신 비용 제거)
+    conn.execute("DROP INDEX IF EXISTS idx_products_keyword")
+    conn.execute("DROP INDEX IF EXISTS idx_products_stock")
+    placeholders = ", ".join("?" for _ in CATALOG_COLUMNS)
+    insert_sql = f"INSERT OR REPLACE INTO products ({', '.join(CATALOG_COLUMNS)}) VALUES ({placeholders})"
+
+    loaded = 0
+    try:
+        conn.execute("BEGIN")
+        for source in sources:
+            batch = []
+            for row in _read_rows(source):
+                batch.append(_to_record(row))
+                if len(batch) >= LOAD_BATCH_SIZE:
+                    conn.executemany(insert_sql, batch)
+                    loaded += len(batch)
+                    batch = []
+            if batch:
+                conn.executemany(insert_sql, batch)
+                loaded += len(batch)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_products_keyword ON products(keyword)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_products_stock ON products(stock_level, product_id)")
+        conn.execute("ANALYZE")
+        conn.close()
+    return loaded
+
+
+class CatalogStore:
+    """카탈로그 조회기 (Tool 스레드 풀의 워커마다 읽기 전용 연결, 재고 갱신은 공유 쓰기 연결 1개)"""
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"카탈로그 파일이 없습니다: {path}")
+        self.path = path
+        self._local = threading.local()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get_product(self, product_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT * FROM products WHERE product_id = ?", (product_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_keyword_trend(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """keyword 인덱스로 해당 키워드의 트렌드 변화율 조회 (트렌드가 기록된 상품 기준)"""
+        row = self._conn().execute(
+            "SELECT keyword, trend_change_percent FROM products"
+            " WHERE keyword = ? AND trend_change_percent IS NOT NULL LIMIT 1",
+            (keyword.strip(),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_products(self, product_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """product_id 여러 개 → {product_id: 상품} (없는 ID는 빠짐)"""
+        ids = list(dict.fromkeys(product_ids))
+        found = {}
+        for i in range(0, len(ids), _MAX_SQL_VARIABLES):
+            chunk = ids[i:i + _MAX_SQL_VARIABLES]
+            rows = self._conn().execute(
+                f"SELECT * FROM products WHERE product_id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((row["product_id"], dict(row)) for row in rows)
+        return found
+
+    def get_keyword_trends(self, keywords: List[str]) -> Dict[str, Dict[str, Any]]:
+        """키워드 여러 개 → {요청 키워드: 트렌드} (get_keyword_trend와 같은 행, 트렌드가 없는 키워드는 빠짐)"""
+        requested = {}
+        for keyword in keywords:
+            requested.setdefault(keyword.strip(), []).append(keyword)
+        stripped = list(requested)
+        found = {}
+        for i in range(0, len(stripped), _MAX_SQL_VARIABLES):
+            chunk = stripped[i:i + _MAX_SQL_VARIABLES]
+            rows = self._conn().execute(
+                "SELECT keyword, trend_change_percent FROM products"
+                f" WHERE keyword IN ({','.join('?' * len(chunk))}) AND trend_change_percent IS NOT NULL",
+                chunk
+            )
+            for row in rows:
+                for keyword in requested[row["keyword"]]:
+                    found.setdefault(keyword, dict(row)) # 키워드별 첫 행 (keyword 인덱스 순서)
+        return found
+
+    def update_stock(self, product_id: str, stock: int, name: Optional[str] = None):
+        """재고 변경 이벤트 반영 (해당 행만 갱신, 신규 상품이면 추가, inventory_index.InventoryIndex와 같은 형식)"""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=30.0)
+            self._writer.execute(
+                "INSERT INTO products (product_id, name, stock_level) VALUES (?, ?, ?)"
+                " ON CONFLICT(product_id) DO UPDATE SET"
+                " stock_level = excluded.stock_level, name = COALESCE(excluded.name, products.name)",
+                (product_id, name, int(stock))
+            )
+
+    def count_below(self, threshold: int) -> int:
+        """재고가 threshold 미만인 상품 수 (stock_level 인덱스 범위 조회, inventory_index.InventoryIndex와 같은 형식)"""
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM products WHERE stock_level < ?", (threshold,)
+        ).fetchone()[0]
+
+    def below(self, threshold: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """재고가 threshold 미만인 상품 (재고 적은 순, 최대 limit개, inventory_index.InventoryIndex와 같은 형식)"""
+        rows = self._conn().execute(
+            "SELECT product_id, name, stock_level FROM products"
+            " WHERE stock_level < ? ORDER BY stock_level, product_id LIMIT ?",
+            (threshold, -1 if limit is None else limit)
+        )
+        return [{"product_id": row[0], "name": row[1], "stock": row[2]} for row in rows]
+
+    def lowest(self, k: int) -> List[Dict[str, Any]]:
+        """재고가 가장 적은 k개 상품 (stock_level 인덱스 앞에서부터 k개)"""
+        rows = self._conn().execute(
+            "SELECT product_id, name, stock_level FROM products"
+            " WHERE stock_level IS NOT NULL ORDER BY stock_level, product_id LIMIT ?",
+            (k,)
+        )
+        return [{"product_id": row[0], "name": row[1], "stock": row[2]} for row in rows]
+
+    def iter_trend_keywords(self) -> Iterator[str]:
+        """트렌드 변화율이 있는 키워드 목록 (keyword 인덱스 순서, 중복 없음)"""
+        cursor = self._conn().execute(
+            "SELECT DISTINCT keyword FROM products WHERE keyword IS NOT NULL AND trend_change_percent IS NOT NULL"
+        )
+        for row in cursor:
+            yield row[0]
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상품 카탈로그 적재 / 조회")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = subparsers.add_parser("load", help="CSV/JSONL 파일을 카탈로그에 일괄 적재")
+    load_parser.add_argument("--db", default="data/catalog.sqlite", help="카탈로그 SQLite 파일")
+    load_parser.add_argument("sources", nargs="+", help="적재할 .csv / .jsonl 파일")
+
+    lookup_parser = subparsers.add_parser("lookup", help="product_id 조회")
+    lookup_parser.add_argument("--db", default="data/catalog.sqlite", help="카탈로그 SQLite 파일")
+    lookup_parser.add_argument("product_ids", nargs="+")
+
+    args = parser.parse_args()
+
+    if args.command == "load":
+        started = time.perf_counter()
+        loaded = load_catalog(args.db, args.sources)
+        elapsed = time.perf_counter() - started
+        print(f"✅ {loaded:,}개 상품 적재 완료 ({elapsed:.1f}초) → {args.db}")
+    else:
+        store = CatalogStore(args.db)
+        for product_id in args.product_ids:
+            started = time.perf_counter()
+            product = store.get_product(product_id)
+            elapsed_us = (time.perf_counter() - started) * 1e6
+            print(f"{product_id}: {json.dumps(product, ensure_ascii=False)} ({elapsed_us:.0f}µs)")
+
+
+if __name__ == "__main__":
+    main()
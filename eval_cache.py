@@ -0,0 +1,112 @@
+"""
+eval_cache.py - run_evaluation.py용 증분 평가 캐시 (입력 JSONL 옆의 SQLite 사이드카 파일)
+
+- 키: 각 줄 tool_calls를 정규화(키 정렬)한 JSON의 해시
+  → 값: 평가 결과 JSON (scenario_id / scenario_type 제외) + 요약 집계용 통과 플래그 (비트 묶음)
+  평가 결과는 tool_calls만으로 정해지므로 같은 tool_calls면 다른 줄/다른 실행에서도 그대로 재사용
+- 규칙 버전: Tool JSON 스키마 + 스키마에서 생성된 검증 함수 코드 + 평가 로직 버전(run_evaluation.EVALUATOR_VERSION)의 해시
+  저장된 버전과 다르면(규칙 변경) 저장된 결과를 모두 지우고 전부 다시 평가
+- 조회/저장은 CACHE_BATCH_SIZE개 줄 단위로 묶어서 (SELECT ... IN / executemany 1번)
+  → 다시 실행하면 새로 추가되거나 바뀐 줄만 평가 (나머지는 디코딩 + 해시 + 조회만)
+- --workers 병렬 평가 시 프로세스마다 같은 파일을 열어 사용 (WAL + busy timeout)
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+from typing import Dict, Any, Iterable, List, Tuple
+
+try:
+    import orjson
+except ImportError: # 선택 의존성
+    orjson = None
+
+# 조회/저장을 묶는 줄 수 (저장 트랜잭션 1번 = 묶음 1개)
+CACHE_BATCH_SIZE = 2048
+# SELECT ... IN (?, ...) 한 번에 넣는 키 수 (SQLite 변수 개수 제한)
+_MAX_SQL_VARIABLES = 500
+# 저장 형식이 바뀌면 올림 (규칙 버전에 포함)
+CACHE_FORMAT_VERSION = 1
+
+
+def sidecar_path(input_path: str) -> str:
+    return f"{input_path}.evalcache.sqlite"
+
+
+def rules_version(tables: Dict[str, Any]) -> str:
+    """규칙 테이블 전체를 정규화한 JSON의 SHA-256 (set은 정렬한 리스트로)"""
+    payload = {"format": CACHE_FORMAT_VERSION, **tables}
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=sorted)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def tool_calls_key(tool_calls: Any) -> bytes:
+    """tool_calls 내용 해시 (orjson이 있으면 orjson으로 정규화, 결과는 같은 환경 안에서만 비교)"""
+    if orjson is not None:
+        try:
+            canonical = orjson.dumps(tool_calls, option=orjson.OPT_SORT_KEYS)
+        except TypeError: # 큰 정수 등
+            canonical = None
+        if canonical is not None:
+            return hashlib.blake2b(canonical, digest_size=16).digest()
+    canonical = json.dumps(tool_calls, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+def load_result(value: str) -> Dict[str, Any]:
+    return orjson.loads(value) if orjson is not None else json.loads(value)
+
+
+class EvaluationCache:
+    """tool_calls 해시 → 저장된 평가 결과(JSON 문자열)"""
+
+    def __init__(self, path: str, version: str):
+        self.path = path
+        self.version = version
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "invalidated": 0}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # 값은 rowid 순서로 뒤에 추가되고 키 인덱스만 무작위 삽입 (WITHOUT ROWID보다 쓰기 페이지 분할이 적음)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results (key BLOB NOT NULL UNIQUE, value TEXT NOT NULL, flags INTEGER NOT NULL)")
+        self._check_version()
+
+    def _check_version(self):
+        """규칙 버전이 다르면 저장된 결과 전체 삭제"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'rules_version'").fetchone()
+            if row is None or row[0] != self.version:
+                self.stats["invalidated"] = self._conn.execute("DELETE FROM results").rowcount
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rules_version', ?)", (self.version,))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Tuple[str, int]]:
+        """키 → (value, flags), 없는 키는 빠짐"""
+        keys = list(keys)
+        found = {}
+        for i in range(0, len(keys), _MAX_SQL_VARIABLES):
+            chunk = keys[i:i + _MAX_SQL_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(f"SELECT key, value, flags FROM results WHERE key IN ({placeholders})", chunk)
+            found.update((key, (value, flags)) for key, value, flags in rows)
+        return found
+
+    def put_many(self, items: List[tuple]):
+        """[(key, value, flags)] 저장 (트랜잭션 1번)"""
+        if not items:
+            return
+        self._conn.execute("BEGIN")
+        self._conn.executemany("INSERT OR REPLACE INTO results (key, value, flags) VALUES (?, ?, ?)", items)
+        self._conn.execute("COMMIT")
+        self.stats["writes"] += len(items)
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,227 @@
+"""
+fake_services.py - tool_backends.HttpBackend용 로컬 가짜 업스트림 서비스 (오프라인 벤치마크/검증용)
+
+서비스마다 별도 포트의 HTTP 서버 1개 (호스트별 연결 풀이 실제처럼 서비스 수만큼 생김)
+- commerce  GET  /v1/store/summary, GET /v1/products/{product_id}, GET /v1/products?ids=...&ids=... (일괄)
+            GET  /v1/inventory/low-stock?threshold=N&limit=M, PUT /v1/products/{product_id}/stock
+- datalab   GET  /v1/keyword-trend?keyword=..., GET /v1/keyword-trends?keyword=...&keyword=... (일괄)
+- blog      POST /v1/blogs/{blog_id}/posts
+- cafe      POST /v1/cafes/{cafe_id}/menus/{menu_id}/articles
+- kakao     POST /v2/api/talk/memo/send
+응답 데이터는 MockBackend(또는 --catalog 카탈로그)와 같음 → mock / http 백엔드의 Tool 결과가 같음
+지연 시간 분포 / 오류율은 stub_server.py와 같은 옵션 사용
+
+실행:
+    python fake_services.py --latency-ms 20 --write-config outputs/backend_http.json
+    python run_scenarios.py --tool-backend http --backend-config outputs/backend_http.json
+"""
+
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from typing import Dict, Any, List, Optional, Tuple
+
+from stub_server import StubBehavior, add_behavior_args, behavior_from_args
+from catalog_store import CatalogStore
+from tool_backends import MockBackend, MOCK_PRODUCT_DB, UPSTREAM_SERVICES, FAKE_SERVICES_BASE_PORT, KAKAO_SEND_PATH
+
+PRODUCT_PATH = re.compile(r"^/v1/products/([^/]+)$")
+PRODUCT_STOCK_PATH = re.compile(r"^/v1/products/([^/]+)/stock$")
+BLOG_POST_PATH = re.compile(r"^/v1/blogs/([^/]+)/posts$")
+CAFE_ARTICLE_PATH = re.compile(r"^/v1/cafes/([^/]+)/menus/([^/]+)/articles$")
+
+
+class FakeUpstream:
+    """모든 가짜 서비스가 공유하는 데이터 (MockBackend / 카탈로그)"""
+
+    def __init__(self, catalog: Optional[CatalogStore] = None):
+        self.catalog = catalog
+        self.backend = MockBackend(catalog)
+        self.mock_trends = {data["keyword"]: data["trend"] for data in MOCK_PRODUCT_DB.values()}
+        self.sent_alerts = 0
+        self._lock = threading.Lock()
+
+    def product(self, product_id: str) -> Optional[Dict[str, Any]]:
+        if self.catalog is not None:
+            return self.catalog.get_product(product_id)
+        data = MOCK_PRODUCT_DB.get(product_id)
+        if data is None:
+            return None
+        return {
+            "product_id": product_id,
+            "name": data["name"],
+            "stock_level": data["stock_level"],
+            "keyword": data["keyword"],
+            "trend_change_percent": data["trend"]
+        }
+
+    def keyword_trend(self, keyword: str) -> Optional[Dict[str, Any]]:
+        if self.catalog is not None:
+            return self.catalog.get_keyword_trend(keyword)
+        if keyword not in self.mock_trends:
+            return None
+        return {"keyword": keyword, "trend_change_percent": self.mock_trends[keyword]}
+
+    def products(self, product_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """{product_id: 상품} (없는 ID는 빠짐)"""
+        if self.catalog is not None:
+            return self.catalog.get_products(product_ids)
+        found = {product_id: self.product(product_id) for product_id in product_ids}
+        return {product_id: product for product_id, product in found.items() if product}
+
+    def keyword_trends(self, keywords: List[str]) -> Dict[str, Dict[str, Any]]:
+        """{요청 키워드: 트렌드} (트렌드가 없는 키워드는 빠짐)"""
+        if self.catalog is not None:
+            return self.catalog.get_keyword_trends(keywords)
+        found = {keyword: self.keyword_trend(keyword) for keyword in keywords}
+        return {keyword: trend for keyword, trend in found.items() if trend}
+
+    def handle(self, service: str, method: str, path: str, query: Dict[str, List[str]], body: Dict[str, Any]) -> Tuple[int, Any]:
+        """(상태 코드, JSON 응답)"""
+        if service == "commerce" and method == "GET":
+            if path == "/v1/store/summary":
+                return 200, self.backend.store_summary()
+            if path == "/v1/products":
+                return 200, {"products": self.products(query.get("ids", []))}
+            if path == "/v1/inventory/low-stock":
+                try:
+                    threshold = int((query.get("threshold") or ["10"])[0])
+                    limit = int((query.get("limit") or ["20"])[0])
+                except ValueError:
+                    return 400, {"error": "threshold / limit must be integers"}
+                return 200, self.backend.low_stock(threshold, limit)
+            match = PRODUCT_PATH.match(path)
+            if match:
+                product = self.product(unquote(match.group(1)))
+                return (200, product) if product else (404, {"error": "product not found"})
+        elif service == "commerce" and method == "PUT" and PRODUCT_STOCK_PATH.match(path):
+            if not isinstance(body.get("stock_level"), int):
+                return 400, {"error": "stock_level must be an integer"}
+            product_id = unquote(PRODUCT_STOCK_PATH.match(path).group(1))
+            self.backend.update_stock(product_id, body["stock_level"], body.get("name"))
+            return 200, {"product_id": product_id, "stock_level": body["stock_level"]}
+        elif service == "datalab" and method == "GET" and path == "/v1/keyword-trend":
+            trend = self.keyword_trend((query.get("keyword") or [""])[0])
+            return (200, trend) if trend else (404, {"error": "no trend data"})
+        elif service == "datalab" and method == "GET" and path == "/v1/keyword-trends":
+            return 200, {"trends": self.keyword_trends(query.get("keyword", []))}
+        elif service == "blog" and method == "POST" and BLOG_POST_PATH.match(path):
+            return 201, self.backend.publish_blog(body.get("title", ""), body.get("content", ""))
+        elif service == "cafe" and method == "POST":
+            match = CAFE_ARTICLE_PATH.match(path)
+            if match:
+                cafe_id, menu_id = unquote(match.group(1)), unquote(match.group(2))
+                return 201, self.backend.publish_cafe(cafe_id, menu_id, body.get("title", ""), body.get("content", ""))
+        elif service == "kakao" and method == "POST" and path == KAKAO_SEND_PATH:
+            with self._lock:
+                self.sent_alerts += 1
+            return 200, {"result_code": 0}
+        return 404, {"error": f"Unknown path: {method} {path}"}
+
+
+def make_handler(service: str, upstream: FakeUpstream, behavior: StubBehavior):
+    class FakeServiceHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # keep-alive 지원
+        disable_nagle_algorithm = True # 헤더/본문을 따로 쓸 때 keep-alive 연결에서 ~40ms 지연(delayed ACK) 방지
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: Any):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _handle(self, method: str):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": "Invalid JSON body"})
+                return
+
+            time.sleep(behavior.sample_latency())
+            failure = behavior.sample_failure()
+            if failure is not None:
+                self._send_json(failure, {"error": f"injected {failure} ({service})"})
+                return
+
+            parts = urlsplit(self.path)
+            status, response = upstream.handle(service, method, parts.path, parse_qs(parts.query), body)
+            self._send_json(status, response)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PUT(self):
+            self._handle("PUT")
+
+    return FakeServiceHandler
+
+
+def start_fake_services(
+    host: str = "127.0.0.1",
+    base_port: int = 0,
+    behavior: Optional[StubBehavior] = None,
+    catalog: Optional[CatalogStore] = None
+) -> Tuple[List[ThreadingHTTPServer], Dict[str, str]]:
+    """
+    백그라운드 스레드에서 가짜 서비스 시작 → (servers, 서비스 → base URL)
+    base_port=0이면 서비스마다 빈 포트 자동 선택
+    """
+    upstream = FakeUpstream(catalog)
+    behavior = behavior or StubBehavior(latency_ms=0.0)
+    servers, endpoints = [], {}
+    for i, service in enumerate(UPSTREAM_SERVICES):
+        server = ThreadingHTTPServer((host, base_port + i if base_port else 0), make_handler(service, upstream, behavior))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"fake-{service}", daemon=True).start()
+        servers.append(server)
+        endpoints[service] = f"http://{host}:{server.server_address[1]}"
+    return servers, endpoints
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HttpBackend용 로컬 가짜 업스트림 서비스 (커머스/쇼핑인사이트/블로그/카페/카카오)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=FAKE_SERVICES_BASE_PORT, help=f"첫 서비스 포트 (서비스 순서: {', '.join(UPSTREAM_SERVICES)})")
+    parser.add_argument("--catalog", default=None, help="상품/트렌드를 조회할 카탈로그 SQLite 파일 (기본: Mock 데이터)")
+    parser.add_argument("--write-config", default=None, help="run_scenarios.py --backend-config로 넘길 설정 JSON 저장 경로")
+    add_behavior_args(parser)
+    parser.set_defaults(latency_ms=20.0)
+    args = parser.parse_args()
+
+    catalog = CatalogStore(args.catalog) if args.catalog else None
+    servers, endpoints = start_fake_services(args.host, args.base_port, behavior_from_args(args), catalog)
+    config = {"endpoints": endpoints}
+    if args.write_config:
+        with open(args.write_config, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+    print(f"🧪 가짜 업스트림 서비스 실행 중 (Ctrl+C로 종료):")
+    for service, url in endpoints.items():
+        print(f"  - {service}: {url}")
+    if args.write_config:
+        print(f"  → 설정 저장: {args.write_config}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
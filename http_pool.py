@@ -0,0 +1,131 @@
+"""
+http_pool.py - 외부 API(카카오 알림 등) 호출용 호스트별 keep-alive 연결 풀 (표준 라이브러리만 사용)
+
+- 호스트(scheme, host, port)마다 http.client 연결을 재사용 → 요청마다 TCP/TLS 연결을 새로 맺지 않음
+- 호스트별 동시 요청 수 상한(세마포어)과 요청 타임아웃
+- 재사용한 연결이 서버 쪽에서 이미 끊겼으면 새 연결로 한 번만 다시 보냄
+- 동기 함수(request_json)라서 asyncio 코드에서는 asyncio.to_thread 등으로 호출
+"""
+
+import json
+import threading
+import http.client
+from urllib.parse import urlsplit
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_TIMEOUT = 10.0
+
+
+class HostPool:
+    """호스트 1개에 대한 keep-alive 연결 풀"""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], max_connections: int, timeout: float):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.stats = {"requests": 0, "connections_opened": 0, "reused": 0}
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.stats["connections_opened"] += 1
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                self.stats["reused"] += 1
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def _checkin(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.append(conn)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """요청 1건 전송 후 (상태 코드, 응답 본문) 반환"""
+        with self._slots:
+            with self._lock:
+                self.stats["requests"] += 1
+            conn, reused = self._checkout()
+            try:
+                try:
+                    conn.request(method, path, body=body, headers=headers or {})
+                    response = conn.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    if not reused:
+                        raise
+                    # 유휴 중에 서버가 닫은 연결 → 새 연결로 한 번만 재시도
+                    conn = self._new_connection()
+                    conn.request(method, path, body=body, headers=headers or {})
+                    response = conn.getresponse()
+                data = response.read()
+            except BaseException:
+                # 요청/응답 도중 실패한 연결은 상태를 알 수 없으므로 풀에 돌려놓지 않고 닫음 (소켓 누수 방지)
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(conn)
+            return response.status, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class PooledHttpClient:
+    """URL의 호스트별로 HostPool을 하나씩 만들어 공유"""
+
+    def __init__(self, max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self._pools: Dict[Tuple[str, str, Optional[int]], HostPool] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, url: str) -> HostPool:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = HostPool(*key, self.max_connections_per_host, self.timeout)
+            return pool
+
+    def request_json(self, method: str, url: str, payload: Any = None, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        """JSON 요청/응답 (응답이 JSON이 아니면 본문 문자열 그대로)"""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        all_headers = {"Accept": "application/json", **(headers or {})}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            all_headers["Content-Type"] = "application/json; charset=utf-8"
+        status, data = self.pool(url).request(method, path, body=body, headers=all_headers)
+        text = data.decode("utf-8", errors="replace")
+        try:
+            return status, json.loads(text) if text else None
+        except ValueError:
+            return status, text
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {f"{scheme}://{host}" + (f":{port}" if port else ""): dict(pool.stats)
+                    for (scheme, host, port), pool in self._pools.items()}
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,81 @@
+"""
+inventory_index.py - get_store_dashboard용 재고 순 정렬 인덱스
+
+- (재고, product_id) 정렬 리스트 + product_id → (재고, 상품명) dict
+- 재고 변경 이벤트마다 해당 상품 1개만 제거/삽입 (bisect) → 전체 재정렬/전체 스캔 없음
+- "재고 N개 미만 상품", "재고가 가장 적은 k개" 조회는 이진 탐색 후 결과 개수만큼만 읽음
+- Tool 스레드 풀에서 동시에 조회/갱신되므로 락으로 보호
+- --catalog를 쓰면 같은 조회/갱신을 카탈로그의 stock_level 인덱스로 처리 (catalog_store.CatalogStore, 같은 메서드)
+"""
+
+import bisect
+import threading
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+
+class InventoryIndex:
+
+    def __init__(self):
+        self._sorted: List[Tuple[int, str]] = []
+        self._products: Dict[str, Tuple[int, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, Optional[str], int]]) -> "InventoryIndex":
+        """(product_id, 상품명, 재고) 목록으로 초기 인덱스 생성 (한 번만 정렬)"""
+        index = cls()
+        for product_id, name, stock in items:
+            if stock is None:
+                continue
+            index._products[product_id] = (int(stock), name)
+        index._sorted = sorted((stock, product_id) for product_id, (stock, _) in index._products.items())
+        return index
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def update_stock(self, product_id: str, stock: int, name: Optional[str] = None):
+        """재고 변경 이벤트 반영 (신규 상품이면 추가)"""
+        stock = int(stock)
+        with self._lock:
+            old = self._products.get(product_id)
+            if old is not None:
+                old_stock, old_name = old
+                if old_stock == stock and (name is None or name == old_name):
+                    return
+                self._remove_sorted(old_stock, product_id)
+                name = name if name is not None else old_name
+            self._products[product_id] = (stock, name)
+            bisect.insort(self._sorted, (stock, product_id))
+
+    def remove(self, product_id: str):
+        with self._lock:
+            old = self._products.pop(product_id, None)
+            if old is not None:
+                self._remove_sorted(old[0], product_id)
+
+    def _remove_sorted(self, stock: int, product_id: str):
+        i = bisect.bisect_left(self._sorted, (stock, product_id))
+        if i < len(self._sorted) and self._sorted[i] == (stock, product_id):
+            del self._sorted[i]
+
+    def _entry(self, stock: int, product_id: str) -> Dict[str, Any]:
+        return {"product_id": product_id, "name": self._products[product_id][1], "stock": stock}
+
+    def count_below(self, threshold: int) -> int:
+        """재고가 threshold 미만인 상품 수 (이진 탐색 1회)"""
+        with self._lock:
+            return bisect.bisect_left(self._sorted, (threshold, ""))
+
+    def below(self, threshold: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """재고가 threshold 미만인 상품 (재고 적은 순, 최대 limit개)"""
+        with self._lock:
+            end = bisect.bisect_left(self._sorted, (threshold, ""))
+            if limit is not None:
+                end = min(end, limit)
+            return [self._entry(stock, product_id) for stock, product_id in self._sorted[:end]]
+
+    def lowest(self, k: int) -> List[Dict[str, Any]]:
+        """재고가 가장 적은 k개 상품"""
+        with self._lock:
+            return [self._entry(stock, product_id) for stock, product_id in self._sorted[:k]]
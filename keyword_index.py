@@ -0,0 +1,132 @@
+"""
+keyword_index.py - 트렌드 데이터가 있는 키워드 중 비슷한 키워드 추천
+
+"No data found" 오류 payload에 대체 키워드를 넣어, 모델이 사용자에게 되묻지 않고 같은 턴에 바로 재시도할 수 있게 함
+
+- 한글 음절을 자모(초성/중성/종성)로 분해한 뒤 공백을 뺀 자모 3-gram 역색인 (오타/띄어쓰기 차이에 강함)
+- 후보 찾기: 질의 n-gram 중 posting이 짧은(드문) 것부터 일정 길이까지만 합쳐 후보 선정 → 어휘 크기와 무관한 비용
+- 선정된 후보만 나머지 n-gram posting에서 이진 탐색해 정확한 겹침 수 → Dice 계수 (NumPy)
+- 상위 후보만 음절 단위 편집 거리로 재정렬
+"""
+
+from collections import defaultdict
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+NGRAM_SIZE = 3
+# 후보 선정에 사용할 posting 길이 합 상한 (드문 n-gram부터)
+CANDIDATE_POSTING_BUDGET = 8000
+# 정확한 Dice 계수를 계산할 후보 수 / 편집 거리로 재정렬할 후보 수
+PRESELECT_CANDIDATES = 1000
+RERANK_CANDIDATES = 20
+# 이 점수 미만은 추천하지 않음 (겹치는 자모가 우연히 몇 개뿐인 키워드)
+MIN_SUGGESTION_SCORE = 0.15
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 자모로 분해 (공백 제거, 영문은 소문자, 나머지 문자는 그대로)"""
+    out = []
+    for ch in text.lower():
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHOSEONG[code // 588])
+            out.append(_JUNGSEONG[(code % 588) // 28])
+            if code % 28:
+                out.append(_JONGSEONG[code % 28])
+        elif not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+def ngrams(text: str, n: int = NGRAM_SIZE) -> set:
+    jamo = f"^{to_jamo(text)}$"
+    if len(jamo) <= n:
+        return {jamo}
+    return {jamo[i:i + n] for i in range(len(jamo) - n + 1)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """음절 단위 Levenshtein 거리"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class KeywordIndex:
+    """키워드 어휘에 대한 자모 n-gram 역색인 (생성 후 읽기 전용)"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        seen = set()
+        postings = defaultdict(list)
+        gram_counts = []
+        for keyword in keywords:
+            keyword = keyword.strip() if keyword else ""
+            if not keyword or keyword in seen:
+                continue
+            seen.add(keyword)
+            keyword_id = len(self.keywords)
+            self.keywords.append(keyword)
+            grams = ngrams(keyword)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(keyword_id)
+        self._postings: Dict[str, np.ndarray] = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._gram_counts = np.array(gram_counts, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def suggest(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """query와 비슷한 키워드 상위 k개 (query 자체는 제외)"""
+        query_grams = ngrams(query)
+        lists = sorted((self._postings[g] for g in query_grams if g in self._postings), key=len)
+        if not lists:
+            return []
+
+        # 드문 n-gram부터 예산만큼 → 후보와 (그 n-gram들 기준) 겹침 수
+        used = 1
+        total = len(lists[0])
+        while used < len(lists) and total + len(lists[used]) <= CANDIDATE_POSTING_BUDGET:
+            total += len(lists[used])
+            used += 1
+        candidates, overlaps = np.unique(np.concatenate(lists[:used]), return_counts=True)
+        if len(candidates) > PRESELECT_CANDIDATES:
+            keep = np.argpartition(-overlaps, PRESELECT_CANDIDATES - 1)[:PRESELECT_CANDIDATES]
+            candidates, overlaps = candidates[keep], overlaps[keep]
+
+        # 나머지(흔한) n-gram은 후보만 이진 탐색 (posting은 id 오름차순)
+        for posting in lists[used:]:
+            pos = np.searchsorted(posting, candidates)
+            overlaps = overlaps + (posting[np.minimum(pos, len(posting) - 1)] == candidates)
+
+        dice = 2.0 * overlaps / (len(query_grams) + self._gram_counts[candidates])
+        top = min(RERANK_CANDIDATES, len(candidates))
+        best = np.argpartition(-dice, top - 1)[:top]
+
+        normalized_query = " ".join(query.split())
+        compact_query = normalized_query.replace(" ", "")
+        results = []
+        for i in best:
+            keyword = self.keywords[candidates[i]]
+            if keyword == normalized_query:
+                continue
+            compact = keyword.replace(" ", "")
+            similarity = 1.0 - edit_distance(compact_query, compact) / max(len(compact_query), len(compact), 1)
+            score = 0.7 * float(dice[i]) + 0.3 * similarity
+            if score >= MIN_SUGGESTION_SCORE:
+                results.append({"keyword": keyword, "score": round(score, 3)})
+        results.sort(key=lambda r: (-r["score"], r["keyword"]))
+        return results[:k]
+
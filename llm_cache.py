@@ -0,0 +1,134 @@
+"""
+llm_cache.py - call_solar_api 앞단의 영구(디스크) LLM 응답 캐시
+
+- 키: model, messages, tools 스펙, temperature, tool_choice를 정규화한 JSON의 SHA-256 (content-addressed)
+- 값: 응답 ChatCompletionMessage의 model_dump() + usage (그대로 복원 → conversation_log 동일)
+- 저장소: SQLite 파일 1개, 전체 크기 상한 초과 시 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+- 모드
+  - readwrite: 캐시에 있으면 재사용, 없으면 실제 호출 후 저장
+  - replay:    캐시만 사용 (읽기 전용), 미스가 나면 실패
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from typing import Dict, Any, List, Optional
+
+CACHE_MODES = ("off", "readwrite", "replay")
+
+
+class CacheMissError(Exception):
+    """replay 모드에서 캐시에 없는 요청이 들어온 경우"""
+
+
+def _to_jsonable(message: Any) -> Any:
+    """ChatCompletionMessage 등 pydantic 객체를 dict로 변환"""
+    if hasattr(message, "model_dump"):
+        return message.model_dump(exclude_none=True)
+    return message
+
+
+class LLMResponseCache:
+    """SQLite 기반 LRU 응답 캐시"""
+
+    def __init__(self, path: str = "outputs/llm_cache.sqlite", max_bytes: int = 512 * 1024 * 1024, mode: str = "readwrite"):
+        if mode not in CACHE_MODES or mode == "off":
+            raise ValueError(f"지원하지 않는 캐시 모드: {mode}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM responses").fetchone()
+        self.total_bytes, self.num_entries = row
+
+    @staticmethod
+    def make_key(model: str, messages: List[Any], tools_spec: Optional[List[Dict]], temperature: float, tool_choice: Any) -> str:
+        """요청 내용을 정규화(키 정렬, 공백 제거)한 JSON의 SHA-256"""
+        payload = {
+            "model": model,
+            "messages": [_to_jsonable(m) for m in messages],
+            "tools": tools_spec or [],
+            "temperature": temperature,
+            "tool_choice": tool_choice
+        }
+        canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회. 있으면 접근 시각 갱신 후 저장된 payload 반환, 없으면 None (replay 모드는 예외)"""
+        row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.stats["misses"] += 1
+            if self.mode == "replay":
+                raise CacheMissError(f"replay 모드 캐시 미스: {key[:16]}")
+            return None
+
+        self.stats["hits"] += 1
+        if self.mode != "replay":
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, payload: Dict[str, Any]):
+        """응답 저장 후 크기 상한을 넘으면 LRU 삭제"""
+        if self.mode == "replay":
+            return
+        value = json.dumps(payload, ensure_ascii=False)
+        size = len(value.encode("utf-8"))
+
+        old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, value, size, time.time())
+        )
+        if old:
+            self.total_bytes -= old[0]
+        else:
+            self.num_entries += 1
+        self.total_bytes += size
+        self.stats["writes"] += 1
+        self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.num_entries > 0:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            freed = []
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                freed.append((key,))
+                self.total_bytes -= size
+                self.num_entries -= 1
+                self.stats["evictions"] += 1
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", freed)
+
+    def summary(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "mode": self.mode,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": self.num_entries,
+            "size_mb": round(self.total_bytes / (1024 * 1024), 2)
+        }
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,240 @@
+"""
+load_test.py - Stub LLM 서버를 이용한 오프라인 부하 테스트
+
+stub_server.py를 백그라운드로 띄우고 run_scenarios.py의 실행기(run_all_scenarios)를
+동시 실행 수(concurrency)별로 돌려 처리량과 지연 시간을 측정합니다. (api.upstage.ai 호출 없음)
+
+측정 항목:
+- scenarios/sec
+- 턴(사용자 질문 1개 → 최종 답변까지, LLM 호출 여러 번 + Tool 실행)별 지연 시간 p50 / p95 / p99
+- LLM 호출 1회별 지연 시간 p50 / p95 / p99
+- LLM 호출 실패율(재시도 후에도 실패), 시나리오 실패율, 재시도/429 횟수
+- (--stream) 첫 토큰까지의 시간(TTFT) p50 / p95
+
+실행:
+    python load_test.py --concurrency 1,4,16,64 --scenarios 200 --latency-ms 300 --latency-dist lognormal --error-rate 0.02
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+from typing import Dict, Any, List
+
+# run_scenarios.py는 import 시 API 키를 확인하므로 Stub용 더미 키를 먼저 지정
+os.environ.setdefault("UPSTAGE_API_KEY", "stub-key")
+
+import run_scenarios
+from rate_limiter import RateLimiter
+from tool_cache import ToolResultCache
+from alert_dispatcher import AlertDispatcher
+from publish_queue import PublishQueue
+from run_metrics import percentile
+from stub_server import start_stub_server, add_behavior_args, behavior_from_args
+
+
+def build_workload(num_scenarios: int) -> Dict[str, List[Dict]]:
+    """시나리오 파일의 Single/Multi 시나리오를 복제해 num_scenarios개의 부하 생성 (id는 고유하게)"""
+    with open("scenarios_single_smartstore.json", "r", encoding="utf-8") as f:
+        single_base = json.load(f)["scenarios"]
+    with open("scenarios_multi_smartstore.json", "r", encoding="utf-8") as f:
+        multi_base = json.load(f)["scenarios"]
+
+    base = [("single", s) for s in single_base] + [("multi", s) for s in multi_base]
+    workload = {"single": [], "multi": []}
+    for i in range(num_scenarios):
+        kind, scenario = base[i % len(base)]
+        workload[kind].append({**scenario, "id": f"{scenario['id']}#{i:06d}"})
+    return workload
+
+
+class CallRecorder:
+    """call_solar_api를 감싸서 LLM 호출별 지연 시간과 성공 여부 기록"""
+
+    def __init__(self, call_api):
+        self.call_api = call_api
+        self.latencies: List[float] = []
+        self.failures = 0
+
+    async def __call__(self, messages, tools_spec, on_tool_call=None):
+        started = time.perf_counter()
+        response = await self.call_api(messages, tools_spec, on_tool_call)
+        self.latencies.append(time.perf_counter() - started)
+        if not response["success"]:
+            self.failures += 1
+        return response
+
+
+def _is_failed(result: Dict[str, Any]) -> bool:
+    if "error" in result:
+        return True
+    return any(
+        isinstance(m, dict) and str(m.get("content") or "").startswith("API 호출 오류")
+        for m in result.get("conversation", [])
+    )
+
+
+async def run_level(concurrency: int, workload: Dict[str, List[Dict]], args: argparse.Namespace) -> Dict[str, Any]:
+    """동시 실행 수 하나에 대한 측정"""
+    run_scenarios.rate_limiter = RateLimiter(
+        max_retries=args.max_retries,
+        base_delay=args.backoff_base,
+        timeout=args.timeout
+    )
+    # 앞 단계에서 채워진 캐시 히트로 다음 단계가 빨라 보이지 않도록 단계마다 빈 캐시로 시작
+    if run_scenarios.tool_cache is not None:
+        run_scenarios.tool_cache = ToolResultCache(max_entries=run_scenarios.tool_cache.max_entries)
+    if run_scenarios.llm_cache is not None:
+        run_scenarios.llm_cache.close()
+        run_scenarios.llm_cache = None # 디스크 응답 캐시는 지울 수 없으므로 부하 테스트에서는 사용 안 함
+    # 알림 발송 / 발행 작업도 run_scenarios.main_async와 같이 측정 구간 안에서 시작하고 끝까지 처리
+    run_scenarios.alert_dispatcher = AlertDispatcher(sender=run_scenarios.tool_backend.alert_sender())
+    run_scenarios.publish_queue = PublishQueue()
+    original_call = run_scenarios.call_solar_api
+    recorder = CallRecorder(original_call)
+    run_scenarios.call_solar_api = recorder
+    try:
+        started = time.perf_counter()
+        await run_scenarios.alert_dispatcher.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()): # 시나리오 진행 로그 숨김
+                results = await run_scenarios.run_all_scenarios(
+                    workload["single"], workload["multi"], run_scenarios.tools,
+                    concurrency=concurrency
+                )
+        finally:
+            await run_scenarios.alert_dispatcher.close()
+            await asyncio.to_thread(run_scenarios.publish_queue.close)
+        elapsed = time.perf_counter() - started
+    finally:
+        run_scenarios.call_solar_api = original_call
+
+    num_calls = len(recorder.latencies)
+    failed_scenarios = sum(1 for r in results if _is_failed(r))
+    turn_latencies = [
+        turn["elapsed_ms"]
+        for r in results
+        for turn in r.get("metadata", {}).get("turns", [])
+        if turn.get("elapsed_ms") is not None
+    ]
+    ttfts = [
+        call["ttft_ms"]
+        for r in results
+        for turn in r.get("metadata", {}).get("turns", [])
+        for call in turn["llm_calls"]
+        if call.get("ttft_ms") is not None
+    ]
+    limiter_stats = run_scenarios.rate_limiter.summary()
+    alert_stats = run_scenarios.alert_dispatcher.summary()
+    publish_stats = run_scenarios.publish_queue.summary()
+    return {
+        "concurrency": concurrency,
+        "scenarios": len(results),
+        "elapsed_sec": round(elapsed, 3),
+        "scenarios_per_sec": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+        "llm_calls": num_calls,
+        "turns": len(turn_latencies),
+        "turn_latency_ms": {
+            "p50": round(percentile(turn_latencies, 50), 1),
+            "p95": round(percentile(turn_latencies, 95), 1),
+            "p99": round(percentile(turn_latencies, 99), 1)
+        },
+        "llm_call_latency_ms": {
+            "p50": round(percentile(recorder.latencies, 50) * 1000, 1),
+            "p95": round(percentile(recorder.latencies, 95) * 1000, 1),
+            "p99": round(percentile(recorder.latencies, 99) * 1000, 1)
+        },
+        "ttft_ms": {
+            "p50": round(percentile(ttfts, 50), 1),
+            "p95": round(percentile(ttfts, 95), 1)
+        } if ttfts else None,
+        "llm_call_error_rate": round(recorder.failures / num_calls, 4) if num_calls else 0.0,
+        "scenario_error_rate": round(failed_scenarios / len(results), 4) if results else 0.0,
+        "retries": limiter_stats["retries"],
+        "rate_limited": limiter_stats["rate_limited"],
+        "alerts_delivered": alert_stats["delivered_alerts"],
+        "alert_deliveries": alert_stats["deliveries"],
+        "publish_jobs_succeeded": publish_stats["succeeded"],
+        "publish_jobs_failed": publish_stats["failed"]
+    }
+
+
+def print_report(levels: List[Dict[str, Any]]):
+    print("\n" + "="*96)
+    print("📈 부하 테스트 결과 (Stub LLM 서버)")
+    print("="*96)
+    print(f"{'동시실행':>8} {'시나리오/s':>11} {'턴 p50(ms)':>11} {'p95(ms)':>9} {'p99(ms)':>9} {'LLM 오류율':>11} {'시나리오 오류율':>14} {'재시도':>7}")
+    for level in levels:
+        latency = level["turn_latency_ms"]
+        print(
+            f"{level['concurrency']:>8} {level['scenarios_per_sec']:>11.2f} {latency['p50']:>11.1f} {latency['p95']:>9.1f} "
+            f"{latency['p99']:>9.1f} {level['llm_call_error_rate']*100:>10.2f}% {level['scenario_error_rate']*100:>13.2f}% {level['retries']:>7}"
+        )
+        call_latency = level["llm_call_latency_ms"]
+        print(f"{'':>8} LLM 호출 {level['llm_calls']}회 p50 {call_latency['p50']:.1f}ms / p95 {call_latency['p95']:.1f}ms / p99 {call_latency['p99']:.1f}ms")
+        if level.get("ttft_ms"):
+            print(f"{'':>8} TTFT p50 {level['ttft_ms']['p50']:.1f}ms / p95 {level['ttft_ms']['p95']:.1f}ms")
+        print(
+            f"{'':>8} 알림 발송 {level['alerts_delivered']}건 ({level['alert_deliveries']}회) / "
+            f"발행 작업 성공 {level['publish_jobs_succeeded']}건, 실패 {level['publish_jobs_failed']}건"
+        )
+    print("="*96)
+
+
+async def main_async(args: argparse.Namespace):
+    behavior = behavior_from_args(args)
+    server, base_url = start_stub_server(port=args.port, behavior=behavior)
+    run_scenarios.client = run_scenarios.create_client(base_url=base_url, api_key="stub-key")
+    run_scenarios.STREAM_COMPLETIONS = args.stream
+    print(f"🧪 Stub LLM 서버: {base_url}")
+
+    workload = build_workload(args.scenarios)
+    levels = []
+    try:
+        for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            print(f"  ▶ 동시 실행 {concurrency} 측정 중... ({args.scenarios}개 시나리오)")
+            levels.append(await run_level(concurrency, workload, args))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print_report(levels)
+
+    report = {
+        "stub": {
+            "latency_ms": args.latency_ms,
+            "latency_dist": args.latency_dist,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+            "stream": args.stream
+        },
+        "levels": levels
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub LLM 서버 기반 오프라인 부하 테스트")
+    parser.add_argument("--concurrency", default="1,4,16", help="측정할 동시 실행 수 목록 (쉼표 구분)")
+    parser.add_argument("--scenarios", type=int, default=100, help="동시 실행 수마다 실행할 시나리오 수")
+    parser.add_argument("--port", type=int, default=0, help="Stub 서버 포트 (0 = 자동)")
+    parser.add_argument("--max-retries", type=int, default=5, help="일시적 오류 재시도 횟수")
+    parser.add_argument("--backoff-base", type=float, default=0.2, help="재시도 backoff 기본 대기(초)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="LLM 호출 1건당 타임아웃(초)")
+    parser.add_argument("--stream", action="store_true", help="스트리밍 모드로 실행 (TTFT p50/p95 추가 측정)")
+    parser.add_argument("--output", default="artifacts/load_test_report.json", help="결과 .json 파일")
+    add_behavior_args(parser)
+
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+product_analytics.py - 여러 상품의 재입고 vs 광고 우선순위를 한 번에 계산하는 벡터화(NumPy) 분석
+
+- 입력: 상품별 재고 / 키워드 트렌드 변화율(%) 배열 (백엔드에서 일괄 조회한 실제 값, 같은 순서)
+- 출력: 재입고 vs 광고 우선순위 점수와 순위
+- 상품 수와 관계없이 배열 연산 한 번으로 계산 (상품마다 따로 계산하지 않음)
+"""
+
+from typing import Dict, Any, List
+
+import numpy as np
+
+# 이 재고 이상이면 "재고 충분"으로 보고 재입고 점수 0
+RESTOCK_REFERENCE_STOCK = 100
+
+
+def rank_restock_vs_ads(stock_levels: List[float], trend_change_percents: List[float]) -> Dict[str, np.ndarray]:
+    """
+    재입고 vs 광고 우선순위 (모든 상품을 한 번에 계산)
+    - 재입고 점수: 재고가 적을수록, 수요가 오를수록 높음
+    - 광고 점수: 재고가 많을수록, 수요가 떨어질수록 높음
+    - 반환 배열은 입력 순서, rank는 1부터 (점수 높은 순)
+    """
+    stock = np.asarray(stock_levels, dtype=float)
+    trend = np.asarray(trend_change_percents, dtype=float)
+
+    stock_ratio = np.clip(stock / RESTOCK_REFERENCE_STOCK, 0.0, 1.0)
+    growth = np.clip(trend / 100.0, -1.0, 1.0)
+    restock_score = (1.0 - stock_ratio) * (1.0 + np.maximum(growth, 0.0))
+    ad_score = stock_ratio * (1.0 + np.maximum(-growth, 0.0))
+
+    priority = np.maximum(restock_score, ad_score)
+    order = np.argsort(-priority, kind="stable")
+    rank = np.empty(len(order), dtype=int)
+    rank[order] = np.arange(1, len(order) + 1)
+    return {
+        "action": np.where(restock_score >= ad_score, "restock", "advertise"),
+        "priority_score": priority,
+        "rank": rank
+    }
+
+
+def analyze_batch(
+    product_ids: List[str],
+    keywords: List[str],
+    stock_levels: List[float],
+    trend_change_percents: List[float]
+) -> List[Dict[str, Any]]:
+    """같은 순서의 상품별 배열 → 우선순위 순으로 정렬된 분석 결과"""
+    if not product_ids:
+        return []
+    ranked = rank_restock_vs_ads(stock_levels, trend_change_percents)
+    results = [
+        {
+            "rank": int(ranked["rank"][i]),
+            "product_id": product_ids[i],
+            "keyword": keywords[i],
+            "stock_level": stock_levels[i],
+            "trend_change_percent": trend_change_percents[i],
+            "recommended_action": str(ranked["action"][i]),
+            "priority_score": round(float(ranked["priority_score"][i]), 3)
+        }
+        for i in range(len(product_ids))
+    ]
+    results.sort(key=lambda r: r["rank"])
+    return results
@@ -0,0 +1,127 @@
+"""
+publish_queue.py - post_blog_promotion / post_cafe_article용 백그라운드 발행 작업 큐
+
+- Tool은 발행 작업을 큐에 넣고 job 핸들(job_id)만 바로 반환 → 에이전트 턴이 발행을 기다리지 않음
+- 멱등성 키: 발행 대상(블로그/카페+게시판) + 제목 + 본문의 SHA-256 → job_id
+  같은 키로 다시 제출하면(모델 재시도 등) 새 작업을 만들지 않고 기존 작업 핸들 반환 → 중복 게시 없음
+  (최종 실패한 작업만 다시 제출 시 재실행)
+- 워커 스레드 풀이 작업을 실행하고, 예외가 나면 지수 backoff로 재시도
+- status(job_id)로 queued / running / succeeded / failed와 최종 결과(post_url / article_url) 조회
+"""
+
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
+
+JOB_STATES = ("queued", "running", "succeeded", "failed")
+# status()로 조회할 수 있는 최근 작업 수 (끝난 작업부터 삭제)
+MAX_TRACKED_JOBS = 10000
+
+
+def idempotency_key(target: str, title: str, content: str) -> str:
+    return hashlib.sha256(f"{target}\x1f{title}\x1f{content}".encode("utf-8")).hexdigest()
+
+
+class PublishQueue:
+    """발행 작업 큐 + 워커 스레드 풀 (submit/status는 여러 Tool 스레드에서 동시에 호출)"""
+
+    def __init__(self, max_workers: int = 4, max_retries: int = 3, retry_base_delay: float = 0.5):
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="publish")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "deduplicated": 0, "succeeded": 0, "failed": 0, "retries": 0}
+
+    def submit(self, kind: str, target: str, publish: Callable[..., Dict[str, Any]], args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        발행 작업 등록 후 바로 핸들 반환
+        - kind: "blog" / "cafe", target: 멱등성 키에 들어가는 발행 위치
+        - publish(**args): 실제 발행 함수 (결과 dict 반환, 실패 시 예외)
+        """
+        key = idempotency_key(target, args.get("title", ""), args.get("content", ""))
+        job_id = f"PJ-{key[:12]}"
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] != "failed":
+                self.stats["deduplicated"] += 1
+                return {**self._handle(job), "deduplicated": True}
+            job = {
+                "job_id": job_id,
+                "kind": kind,
+                "idempotency_key": key,
+                "status": "queued",
+                "attempts": 0,
+                "result": None,
+                "error": None,
+                "submitted_at": time.time(),
+                "finished_at": None
+            }
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+            self._evict()
+            self.stats["submitted"] += 1
+            handle = self._handle(job)
+        self._executor.submit(self._run, job, publish, args)
+        return handle
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._handle(job) if job is not None else None
+
+    def _handle(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        handle = {"job_id": job["job_id"], "kind": job["kind"], "status": job["status"], "attempts": job["attempts"]}
+        if job["result"] is not None:
+            handle.update(job["result"])
+        if job["error"] is not None:
+            handle["error"] = job["error"]
+        return handle
+
+    def _evict(self):
+        # 호출하는 쪽에서 self._lock을 잡고 있어야 함 (진행 중인 작업은 남김)
+        if len(self._jobs) <= MAX_TRACKED_JOBS:
+            return
+        for job_id in [j for j, job in self._jobs.items() if job["status"] in ("succeeded", "failed")]:
+            del self._jobs[job_id]
+            if len(self._jobs) <= MAX_TRACKED_JOBS:
+                break
+
+    def _run(self, job: Dict[str, Any], publish: Callable[..., Dict[str, Any]], args: Dict[str, Any]):
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                job["status"] = "running"
+                job["attempts"] += 1
+            try:
+                result = publish(**args)
+            except Exception as e:
+                with self._lock:
+                    job["error"] = f"{type(e).__name__}: {e}"
+                    if attempt == self.max_retries:
+                        job["status"] = "failed"
+                        job["finished_at"] = time.time()
+                        self.stats["failed"] += 1
+                        return
+                    job["status"] = "queued"
+                    self.stats["retries"] += 1
+                time.sleep(self.retry_base_delay * (2 ** attempt))
+                continue
+            with self._lock:
+                job["status"] = "succeeded"
+                job["result"] = result
+                job["error"] = None
+                job["finished_at"] = time.time()
+                self.stats["succeeded"] += 1
+            return
+
+    def close(self, wait: bool = True):
+        """남은 작업을 (wait=True면 끝까지) 처리한 뒤 종료"""
+        self._executor.shutdown(wait=wait)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+            return {**self.stats, "pending": pending}
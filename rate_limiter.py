@@ -0,0 +1,196 @@
+"""
+rate_limiter.py - Solar API 호출용 적응형 속도 제한 + 재시도(backoff) 레이어
+
+- 요청 수(RPM)와 토큰 수(TPM) 두 개의 Token Bucket을 모든 시나리오가 공유
+- 429 응답 시 Retry-After 헤더를 존중하고, 허용 속도를 일시적으로 낮춘 뒤 점진적으로 회복 (AIMD)
+- 일시적 오류(429, 408, 5xx, 타임아웃, 연결 오류)는 지터가 적용된 지수 backoff로 재시도
+- 재시도/대기 횟수 카운터 제공
+"""
+
+import time
+import random
+import asyncio
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+from openai import APIConnectionError
+
+# 재시도 대상 HTTP 상태 코드 (5xx는 별도로 모두 재시도)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class TokenBucket:
+    """분당 허용량(rate_per_minute)만큼 채워지는 Token Bucket (용량 = 1분치)"""
+
+    def __init__(self, rate_per_minute: float):
+        self.max_rate = float(rate_per_minute)
+        self.rate = float(rate_per_minute)
+        self.capacity = float(rate_per_minute)
+        self.tokens = float(rate_per_minute)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate / 60.0)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 꺼내기 위해 기다려야 하는 시간(초). 0이면 즉시 가능"""
+        self._refill(now)
+        amount = min(amount, self.capacity) # 용량보다 큰 요청도 언젠가는 통과하도록
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.rate
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """추정치와 실제 사용량의 차이 보정 (음수면 추가 차감)"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def slow_down(self, factor: float, floor_ratio: float):
+        self.rate = max(self.max_rate * floor_ratio, self.rate * factor)
+
+    def recover(self, step_ratio: float):
+        self.rate = min(self.max_rate, self.rate + self.max_rate * step_ratio)
+
+
+class RateLimiter:
+    """
+    공유 속도 제한기
+    - requests_per_minute / tokens_per_minute 가 None이면 해당 제한 없음
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        timeout: Optional[float] = 60.0
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.paused_until = 0.0 # Retry-After로 인한 전체 일시 정지 시각
+        self._lock = asyncio.Lock()
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "throttle_waits": 0,
+            "throttle_wait_seconds": 0.0,
+            "failures": 0
+        }
+
+    # --------------------------
+    # 속도 제한
+    # --------------------------
+    async def acquire(self, estimated_tokens: int = 0):
+        """요청 1건 + 추정 토큰만큼 버킷에서 꺼냄 (부족하면 대기). 락으로 FIFO 순서 보장"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = max(0.0, self.paused_until - now)
+                if self.request_bucket:
+                    wait = max(wait, self.request_bucket.wait_time(1, now))
+                if self.token_bucket and estimated_tokens:
+                    wait = max(wait, self.token_bucket.wait_time(estimated_tokens, now))
+                if wait <= 0:
+                    break
+                self.stats["throttle_waits"] += 1
+                self.stats["throttle_wait_seconds"] += wait
+                await asyncio.sleep(wait)
+
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket and estimated_tokens:
+                self.token_bucket.consume(estimated_tokens)
+            self.stats["requests"] += 1
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """성공 응답 후 실제 토큰 사용량으로 버킷 보정 + 속도 회복"""
+        if self.token_bucket and actual_tokens is not None:
+            self.token_bucket.refund(estimated_tokens - actual_tokens)
+        for bucket in (self.request_bucket, self.token_bucket):
+            if bucket:
+                bucket.recover(0.02)
+
+    # --------------------------
+    # 재시도 / backoff
+    # --------------------------
+    def retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        재시도까지 기다릴 시간(초) 반환. 재시도하지 않아야 하면 None
+        - attempt: 지금까지 재시도한 횟수 (0부터)
+        """
+        if attempt >= self.max_retries or not is_retryable(error):
+            self.stats["failures"] += 1
+            return None
+
+        self.stats["retries"] += 1
+        # Full jitter: [0, min(max_delay, base * 2^attempt)]
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+        if getattr(error, "status_code", None) == 429:
+            self.stats["rate_limited"] += 1
+            retry_after = parse_retry_after(error)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            # 한도 초과 → 모든 호출을 잠시 멈추고 허용 속도를 낮춤
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            for bucket in (self.request_bucket, self.token_bucket):
+                if bucket:
+                    bucket.slow_down(0.8, 0.1)
+        return delay
+
+    def summary(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["throttle_wait_seconds"] = round(stats["throttle_wait_seconds"], 3)
+        if self.request_bucket:
+            stats["current_rpm"] = round(self.request_bucket.rate, 1)
+        if self.token_bucket:
+            stats["current_tpm"] = round(self.token_bucket.rate, 1)
+        return stats
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적 오류 여부 (429, 408, 409, 5xx, 타임아웃/연결 오류)"""
+    if isinstance(error, (APIConnectionError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return False
+    return status in RETRYABLE_STATUS_CODES or status >= 500
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """응답 헤더의 retry-after-ms / retry-after(초 또는 HTTP-date)를 초 단위로 변환"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -1,100 +1,58 @@
 """
 evaluate_smartstore.py - O조 (스마트스토어) 프로젝트 평가 스크립트
 
-Tool 개수: 6개 (최적화)
+Tool 개수: 8개 (최적화)
 - get_store_dashboard
 - analyze_product_strategy
+- analyze_products_batch
 - get_top_shopping_trend
 - post_blog_promotion
 - post_cafe_article
+- get_publish_status
 - alert_seller
 """
 
 import json
 import os
 import sys
-from typing import Dict, List, Any, Tuple
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Tuple, Iterable, Iterator, Optional
 from datetime import datetime
 
+from tool_schemas import TOOL_SCHEMAS
+from tool_validators import compile_validators
+from trajectory_decode import decode_entry, DECODE_ERRORS, SELECTIVE_DECODER
+from eval_cache import EvaluationCache, CACHE_BATCH_SIZE, sidecar_path, rules_version, tool_calls_key, load_result
+
 # ============================================================================
-# ⚠️ O조 Tool 정의 (evaluate_final.py 기반으로 수정)
+# ⚠️ O조 Tool 정의: run_scenarios.py와 같은 JSON 스키마(tool_schemas.py)에서 생성
 # ============================================================================
 
-# 정의된 Tool (O조 6개)
-DEFINED_TOOLS = {
-    "get_store_dashboard",
-    "analyze_product_strategy",
-    "get_top_shopping_trend",
-    "post_blog_promotion",
-    "post_cafe_article",
-    "alert_seller"
-}
-
-# 필수 인자 (O조 6개 툴 기준)
-TOOL_REQUIRED_ARGS = {
-    "get_store_dashboard": [],
-    "analyze_product_strategy": ["product_id", "analysis_keyword"],
-    "get_top_shopping_trend": ["category_code"],
-    "post_blog_promotion": ["title", "content"],
-    "post_cafe_article": ["cafe_id", "menu_id", "title", "content"],
-    "alert_seller": ["message", "alert_level"]
-}
-
-# 타입 정의 (O조 6개 툴 기준 - 모두 string 또는 enum(string))
-TOOL_ARG_TYPES = {
-    "get_store_dashboard": {
-        "low_stock_threshold": "string"
-    },
-    "analyze_product_strategy": {
-        "product_id": "string",
-        "analysis_keyword": "string"
-    },
-    "get_top_shopping_trend": {
-        "category_code": "string"
-    },
-    "post_blog_promotion": {
-        "title": "string",
-        "content": "string"
-    },
-    "post_cafe_article": {
-        "cafe_id": "string",
-        "menu_id": "string",
-        "title": "string",
-        "content": "string"
-    },
-    "alert_seller": {
-        "message": "string",
-        "alert_level": "string"
-    }
-}
+# Tool별 인자 검증 함수 (필수 인자 / 타입 / Tool별 enum을 스키마에서 컴파일)
+TOOL_VALIDATORS = compile_validators(TOOL_SCHEMAS)
+
+# 정의된 Tool (O조 8개)
+DEFINED_TOOLS = set(TOOL_VALIDATORS)
+
+# 평가/채점 로직 버전 (evaluate_single_tool_call / evaluate_scenario / 요약 플래그를 바꾸면 올림)
+EVALUATOR_VERSION = 1
 
-# 제약 조건 (O조 6개 툴 기준)
-ARG_CONSTRAINTS = {
-    "alert_level": ["info", "warning", "urgent"] # enum
-}
+# 규칙 버전 (Tool 스키마 / 생성된 검증 함수 코드 / 평가 로직 버전 중 하나라도 바뀌면 증분 평가 캐시 전체 무효화)
+def evaluation_rules_version(validators: Dict[str, Any], evaluator_version: int = EVALUATOR_VERSION) -> str:
+    return rules_version({
+        "TOOL_SCHEMAS": TOOL_SCHEMAS,
+        "TOOL_VALIDATORS": {name: validator.source for name, validator in validators.items()},
+        "EVALUATOR_VERSION": evaluator_version
+    })
+
+
+RULES_VERSION = evaluation_rules_version(TOOL_VALIDATORS)
 
 # ============================================================================
 # (이하 DScover_D조의 evaluate_final.py와 거의 동일한 로직)
 # ============================================================================
 
-def _validate_type(value: Any, expected_type: str) -> bool:
-    """타입 검증 (O조 툴은 모두 string이므로 단순화)"""
-    type_mapping = {
-        "string": str,
-        "integer": int, # (참고: O조 툴은 integer를 사용하지 않음)
-        "boolean": bool # (참고: O조 툴은 boolean을 사용하지 않음)
-    }
-    expected_python_type = type_mapping.get(expected_type)
-    if expected_python_type is None:
-        return True
-    
-    # O조 툴은 모두 string 타입이므로 string인지 확인
-    if expected_type == "string":
-        return isinstance(value, str)
-        
-    return isinstance(value, expected_python_type)
-
-
 def check_hallucinated_calls(tool_calls: List[Dict]) -> Tuple[bool, List[str]]:
     """정의되지 않은 함수 호출 확인"""
     errors = []
@@ -126,37 +84,12 @@ def evaluate_single_tool_call(tool_call: Dict) -> Dict:
     
     result["correct_function_name"] = True
     
-    # 2. Arguments
-    required_args = TOOL_REQUIRED_ARGS.get(tool_name, [])
-    missing_args = [arg for arg in required_args if arg not in arguments]
-    
-    if missing_args:
-        result["errors"].append(f"필수 인자 누락: {missing_args}")
-        # 필수 인자 누락은 심각한 오류이므로 여기서 반환
-        return result
-    
-    # 타입 확인
-    arg_types = TOOL_ARG_TYPES.get(tool_name, {})
-    type_errors = False
-    for arg_name, arg_value in arguments.items():
-        if arg_name in arg_types:
-            expected_type = arg_types[arg_name]
-            if not _validate_type(arg_value, expected_type):
-                result["errors"].append(f"'{arg_name}' 타입 오류 (기대: {expected_type}, 실제: {type(arg_value).__name__})")
-                type_errors = True
-    
-    # 제약 조건 (Enum 등)
-    constraint_errors = False
-    for arg_name, arg_value in arguments.items():
-        if arg_name in ARG_CONSTRAINTS:
-            constraint = ARG_CONSTRAINTS[arg_name]
-            
-            if isinstance(constraint, list): # Enum
-                if arg_value not in constraint:
-                    result["errors"].append(f"'{arg_name}' 허용되지 않는 값: {arg_value} (기대: {constraint})")
-                    constraint_errors = True
-    
-    if not result["errors"] and not type_errors and not constraint_errors:
+    # 2. Arguments (필수 인자 → 타입 → enum → 정의되지 않은 인자, run_scenarios.py 실행 전 검사와 같은 검증 함수)
+    # 필수 인자가 누락되면 심각한 오류이므로 누락 오류만 반환됨
+    arg_errors = TOOL_VALIDATORS[tool_name](arguments)
+    if arg_errors:
+        result["errors"].extend(arg_errors)
+    else:
         result["valid_arguments"] = True
     
     return result
@@ -230,78 +163,258 @@ def evaluate_scenario(scenario: Dict) -> Dict:
     return result
 
 
-def load_scenarios(input_path: str) -> List[Dict]:
-    """JSONL 파일 로드"""
-    scenarios = []
-    
+def iter_scenarios(input_path: str, start: int = 0, end: Optional[int] = None, selective: bool = True) -> Iterator[Dict]:
+    """
+    JSONL 파일을 한 줄씩 파싱해 반환 (파일 전체를 메모리에 올리지 않음)
+    - start / end: 줄 경계에 맞춘 바이트 범위 [start, end)만 읽음 (--workers 병렬 평가용)
+    - selective: 평가에 쓰는 id / tool_calls / metadata.scenario_type만 디코딩 (conversation 건너뜀)
+    """
     if not os.path.exists(input_path):
         print(f"❌ 평가할 입력 파일이 없습니다: {input_path}")
-        return scenarios
-
-    if input_path.endswith(".jsonl"):
-        with open(input_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                if line.strip():
-                    try:
-                        scenarios.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        print(f"⚠️ {input_path} 파일의 {line_num}번째 줄 JSON 파싱 오류. 건너뜁니다.")
-    else:
+        return
+
+    if not input_path.endswith(".jsonl"):
         # (DScover_D조와 달리 .json 리스트는 지원하지 않음. .jsonl만 사용)
         print(f"⚠️ .jsonl 파일만 지원합니다. ({input_path})")
-    
-    return scenarios
+        return
+
+    with open(input_path, "rb") as f:
+        f.seek(start)
+        offset = start
+        line_num = 0
+        for line in f:
+            if end is not None and offset >= end:
+                break
+            line_offset = offset
+            offset += len(line)
+            line_num += 1
+            if line.strip():
+                try:
+                    yield decode_entry(line, selective)
+                except DECODE_ERRORS:
+                    location = f"{line_num}번째 줄" if start == 0 else f"{line_offset}바이트 위치의 줄"
+                    print(f"⚠️ {input_path} 파일의 {location} JSON 파싱 오류. 건너뜁니다.")
+
+
+# 요약에 상세를 출력할 실패 시나리오 수 (전체 실패 수는 따로 집계)
+MAX_FAILED_DETAILS = 50
+
+
+class EvaluationSummary:
+    """
+    평가 결과 누적 집계 (결과 목록을 보관하지 않음)
+    - 실패 상세는 출력용으로 앞의 MAX_FAILED_DETAILS개만 보관
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.correct_function_name = 0
+        self.valid_arguments = 0
+        self.no_hallucinated_calls = 0
+        self.by_type = {"single-turn": [0, 0], "multi-turn": [0, 0]} # 시나리오 유형 → [전체, 통과]
+        self.failed = 0
+        self.failed_details: List[Tuple[str, List[str]]] = []
+        self.reused = 0 # 증분 평가 캐시에서 재사용한 결과 수
 
+    def merge(self, other: "EvaluationSummary"):
+        """다른 구간의 집계를 뒤에 이어 붙임 (실패 상세는 입력 순서 유지)"""
+        self.total += other.total
+        self.passed += other.passed
+        self.correct_function_name += other.correct_function_name
+        self.valid_arguments += other.valid_arguments
+        self.no_hallucinated_calls += other.no_hallucinated_calls
+        for scenario_type, (total, passed) in other.by_type.items():
+            counts = self.by_type.setdefault(scenario_type, [0, 0])
+            counts[0] += total
+            counts[1] += passed
+        self.failed += other.failed
+        self.reused += other.reused
+        self.failed_details.extend(other.failed_details[:MAX_FAILED_DETAILS - len(self.failed_details)])
 
-def print_summary(results: List[Dict]):
+    def add(self, result: Dict):
+        self.total += 1
+        self.passed += result["pass"]
+        self.correct_function_name += result["correct_function_name"]
+        self.valid_arguments += result["valid_arguments"]
+        self.no_hallucinated_calls += result["no_hallucinated_calls"]
+        counts = self.by_type.setdefault(result["scenario_type"], [0, 0])
+        counts[0] += 1
+        counts[1] += result["pass"]
+        if not result["pass"]:
+            self.failed += 1
+            if len(self.failed_details) < MAX_FAILED_DETAILS:
+                self.failed_details.append((result["scenario_id"], result["errors"][:2])) # 최대 2개 오류만 출력
+
+
+def evaluate_stream(scenarios: Iterable[Dict], report, cache: Optional[EvaluationCache] = None) -> EvaluationSummary:
+    """시나리오를 하나씩 평가 → 결과를 report(JSONL)에 한 줄씩 쓰고 요약만 누적"""
+    summary = EvaluationSummary()
+    if cache is not None:
+        batch = []
+        for scenario in scenarios:
+            batch.append(scenario)
+            if len(batch) == CACHE_BATCH_SIZE:
+                _evaluate_cached_batch(batch, report, cache, summary)
+                batch = []
+        _evaluate_cached_batch(batch, report, cache, summary)
+        return summary
+
+    for scenario in scenarios:
+        result = evaluate_scenario(scenario)
+        report.write(json.dumps(result, ensure_ascii=False) + "\n")
+        summary.add(result)
+    return summary
+
+
+# 캐시에 비트로 저장하는 요약 집계 항목 (재사용 시 결과 JSON을 다시 파싱하지 않도록)
+_SUMMARY_FLAGS = ("pass", "correct_function_name", "valid_arguments", "no_hallucinated_calls")
+
+
+def _evaluate_cached_batch(batch: List[Dict], report, cache: EvaluationCache, summary: EvaluationSummary):
+    """
+    묶음 단위 증분 평가: tool_calls 해시로 한 번에 조회 → 없는 것만 평가 후 한 번에 저장
+    저장 값은 scenario_id / scenario_type을 뺀 결과 JSON → 앞에 두 필드를 붙이면 전체 평가와 같은 줄
+    """
+    keys = [tool_calls_key(scenario.get("tool_calls", [])) for scenario in batch]
+    stored = cache.get_many(set(keys))
+    new_items = {}
+    for scenario, key in zip(batch, keys):
+        cached = stored.get(key) or new_items.get(key)
+        if cached is None:
+            result = evaluate_scenario(scenario)
+            value = json.dumps({k: v for k, v in result.items() if k not in ("scenario_id", "scenario_type")}, ensure_ascii=False)
+            new_items[key] = (value, sum(1 << i for i, name in enumerate(_SUMMARY_FLAGS) if result[name]))
+            cache.stats["misses"] += 1
+        else:
+            value, flags = cached
+            result = {"scenario_id": scenario.get("id", "unknown"), "scenario_type": scenario.get("metadata", {}).get("scenario_type", "unknown")}
+            result.update((name, bool(flags >> i & 1)) for i, name in enumerate(_SUMMARY_FLAGS))
+            result["errors"] = [] if result["pass"] else load_result(value)["errors"] # 실패 상세 출력용
+            cache.stats["hits"] += 1
+            summary.reused += 1
+        report.write(
+            f'{{"scenario_id": {json.dumps(result["scenario_id"], ensure_ascii=False)}, '
+            f'"scenario_type": {json.dumps(result["scenario_type"], ensure_ascii=False)}, {value[1:]}\n'
+        )
+        summary.add(result)
+    cache.put_many([(key, value, flags) for key, (value, flags) in new_items.items()])
+
+
+# ============================================================================
+# 병렬 평가 (--workers N): 입력을 줄 경계에 맞춘 바이트 구간으로 나눠 프로세스 풀에서 평가
+# ============================================================================
+
+# 워커 수 x CHUNKS_PER_WORKER개 구간으로 나눔 (구간별 평가 시간이 달라도 워커가 놀지 않도록)
+CHUNKS_PER_WORKER = 4
+
+
+def split_byte_ranges(input_path: str, num_chunks: int) -> List[Tuple[int, int]]:
+    """파일을 num_chunks개 바이트 구간으로 나누고, 각 경계를 다음 줄 시작으로 맞춤"""
+    size = os.path.getsize(input_path)
+    boundaries = [0]
+    with open(input_path, "rb") as f:
+        for i in range(1, num_chunks):
+            f.seek(max(size * i // num_chunks, boundaries[-1]))
+            if f.tell() > 0:
+                f.seek(f.tell() - 1)
+                f.readline() # 경계가 줄 중간이면 그 줄 끝까지 (바로 앞이 줄바꿈이면 그대로)
+            position = f.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _evaluate_chunk(task: Tuple[str, int, int, str, bool, Optional[str]]) -> EvaluationSummary:
+    """워커 프로세스: 구간 하나를 평가해 part 파일에 쓰고 집계만 반환"""
+    input_path, start, end, part_path, selective, cache_path = task
+    cache = EvaluationCache(cache_path, RULES_VERSION) if cache_path else None
+    try:
+        with open(part_path, "w", encoding="utf-8") as report:
+            return evaluate_stream(iter_scenarios(input_path, start, end, selective), report, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def evaluate_parallel(
+    input_path: str,
+    output_path: str,
+    workers: int,
+    selective: bool = True,
+    cache_path: Optional[str] = None
+) -> EvaluationSummary:
+    """
+    구간별 결과를 part 파일로 받은 뒤 입력 순서대로 이어 붙임 → 순차 평가와 같은 리포트 / 집계
+    """
+    ranges = split_byte_ranges(input_path, workers * CHUNKS_PER_WORKER)
+    tasks = [
+        (input_path, start, end, f"{output_path}.part-{i}", selective, cache_path) for i, (start, end) in enumerate(ranges)
+    ]
+    summary = EvaluationSummary()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_summaries = list(executor.map(_evaluate_chunk, tasks))
+        with open(output_path, "wb") as report:
+            for (_, _, _, part_path, _, _), chunk_summary in zip(tasks, chunk_summaries):
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, report, 1024 * 1024)
+                summary.merge(chunk_summary)
+    finally:
+        for _, _, _, part_path, _, _ in tasks:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+    return summary
+
+
+def _percent(part: int, whole: int) -> str:
+    return f"{part/whole*100:.1f}%"
+
+
+def print_summary(summary: EvaluationSummary):
     """평가 결과 요약 출력"""
-    total = len(results)
+    total = summary.total
     if total == 0:
         print("\n" + "="*80)
         print("📊 평가 결과: 0개 항목 (평가할 데이터 없음)")
         print("="*80)
         return
 
-    passed = sum(1 for r in results if r["pass"])
+    passed = summary.passed
     
     print("\n" + "="*80)
     print(f"📊 BFCL 평가 결과 (O조: 스마트스토어)")
     print("="*80)
     
     print(f"\n총 시나리오: {total}개")
-    print(f"✅ 통과: {passed}개 ({passed/total*100:.1f}%)")
+    print(f"✅ 통과: {passed}개 ({_percent(passed, total)})")
     print(f"❌ 실패: {total - passed}개")
     
-    if total > 0:
-        print(f"\n📋 BFCL 평가 항목:")
-        correct_name = sum(1 for r in results if r["correct_function_name"])
-        valid_args = sum(1 for r in results if r["valid_arguments"])
-        no_halluc = sum(1 for r in results if r["no_hallucinated_calls"])
-        
-        print(f"  1️⃣  Correct Function Name: {correct_name}/{total} ({correct_name/total*100:.1f}%)")
-        print(f"  2️⃣  Valid Arguments: {valid_args}/{total} ({valid_args/total*100:.1f}%)")
-        print(f"  3️⃣  No Hallucinated Calls: {no_halluc}/{total} ({no_halluc/total*100:.1f}%)")
+    print(f"\n📋 BFCL 평가 항목:")
+    print(f"  1️⃣  Correct Function Name: {summary.correct_function_name}/{total} ({_percent(summary.correct_function_name, total)})")
+    print(f"  2️⃣  Valid Arguments: {summary.valid_arguments}/{total} ({_percent(summary.valid_arguments, total)})")
+    print(f"  3️⃣  No Hallucinated Calls: {summary.no_hallucinated_calls}/{total} ({_percent(summary.no_hallucinated_calls, total)})")
     
     # 타입별
-    single_results = [r for r in results if r["scenario_type"] == "single-turn"]
-    multi_results = [r for r in results if r["scenario_type"] == "multi-turn"]
+    single_total, single_passed = summary.by_type["single-turn"]
+    multi_total, multi_passed = summary.by_type["multi-turn"]
     
-    if single_results:
-        single_passed = sum(1 for r in single_results if r["pass"])
-        print(f"\n🔹 Single: {single_passed}/{len(single_results)} 통과 ({single_passed/len(single_results)*100:.1f}%)")
+    if single_total:
+        print(f"\n🔹 Single: {single_passed}/{single_total} 통과 ({_percent(single_passed, single_total)})")
     
-    if multi_results:
-        multi_passed = sum(1 for r in multi_results if r["pass"])
-        print(f"🔹 Multi: {multi_passed}/{len(multi_results)} 통과 ({multi_passed/len(multi_results)*100:.1f}%)")
+    if multi_total:
+        print(f"🔹 Multi: {multi_passed}/{multi_total} 통과 ({_percent(multi_passed, multi_total)})")
     
     # 실패 상세
-    failed = [r for r in results if not r["pass"]]
-    if failed:
+    if summary.failed:
         print(f"\n❌ 실패 시나리오:")
-        for r in failed:
-            print(f"\n  [{r['scenario_id']}]")
-            for error in r["errors"][:2]: # 최대 2개 오류만 출력
+        for scenario_id, errors in summary.failed_details:
+            print(f"\n  [{scenario_id}]")
+            for error in errors:
                 print(f"    - {error}")
+        if summary.failed > len(summary.failed_details):
+            print(f"\n  ... 외 {summary.failed - len(summary.failed_details)}개 (전체 목록은 리포트 파일 참고)")
     
     print("\n" + "="*80)
 
@@ -311,7 +424,11 @@ def main():
     
     parser = argparse.ArgumentParser(description="O조 (스마트스토어) 프로젝트 평가 스크립트")
     parser.add_argument("--input", required=True, help="입력 .jsonl 파일 (예: data/smartstore_final.jsonl)")
-    parser.add_argument("--output", default="artifacts/smartstore_report.json", help="평가 결과 .json 리포트 파일")
+    parser.add_argument("--output", default="artifacts/smartstore_report.jsonl", help="평가 결과 리포트 파일 (시나리오당 한 줄, JSONL)")
+    parser.add_argument("--full-decode", action="store_true", help="conversation까지 각 줄 전체를 파싱 (기본: 평가에 필요한 필드만 디코딩)")
+    parser.add_argument("--cache", default=None, help="증분 평가 캐시 SQLite 경로 (기본: 입력 파일 옆 <input>.evalcache.sqlite)")
+    parser.add_argument("--no-cache", action="store_true", help="증분 평가 캐시를 쓰지 않고 모든 줄을 평가")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 평가 프로세스 수 (입력을 줄 경계 바이트 구간으로 나눔, 1 = 순차 평가)")
     
     args = parser.parse_args()
     
@@ -324,20 +441,37 @@ def main():
     print("="*80)
     print(f"\n📂 입력: {args.input}")
     
-    scenarios = load_scenarios(args.input)
-    if not scenarios:
-        return # 로드 실패 시 종료
+    selective = not args.full_decode
+    print(f"🧩 디코딩: {'전체' if args.full_decode else f'필요한 필드만 ({SELECTIVE_DECODER})'}")
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
 
-    print(f"✅ {len(scenarios)}개 시나리오 로드")
-    
-    print("\n🔍 평가 중...")
-    results = [evaluate_scenario(s) for s in scenarios]
-    
-    print_summary(results)
+    cache, cache_path = None, None
+    if not args.no_cache:
+        cache_path = args.cache or sidecar_path(args.input)
+        cache = EvaluationCache(cache_path, RULES_VERSION) # 규칙 버전 확인 (바뀌었으면 여기서 전체 무효화)
+        invalidated = cache.stats["invalidated"]
+        print(f"♻️  증분 평가 캐시: {cache_path} (규칙 버전 {RULES_VERSION[:12]}" + (f", 규칙 변경으로 {invalidated}개 무효화)" if invalidated else ")"))
+
+    try:
+        if args.workers > 1 and args.input.endswith(".jsonl"):
+            print(f"\n🔍 평가 중... ({args.workers}개 프로세스, 바이트 구간 병렬 평가)")
+            summary = evaluate_parallel(args.input, args.output, args.workers, selective, cache_path)
+        else:
+            print("\n🔍 평가 중... (한 줄씩 읽어서 평가 → 리포트에 바로 기록)")
+            with open(args.output, "w", encoding="utf-8") as report:
+                summary = evaluate_stream(iter_scenarios(args.input, selective=selective), report, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    if summary.total == 0:
+        print("⚠️ 평가할 시나리오가 없습니다.")
+        return
+    print(f"✅ {summary.total}개 시나리오 평가")
+    if cache is not None:
+        print(f"♻️  캐시 재사용 {summary.reused}개 / 새로 평가 {summary.total - summary.reused}개")
     
-    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    print_summary(summary)
     
     print(f"\n💾 결과 저장: {args.output}")
 
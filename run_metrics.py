@@ -0,0 +1,97 @@
+"""
+run_metrics.py - 시나리오 메타데이터의 호출별 계측값(토큰/지연 시간/재시도/캐시/비용) 집계
+
+- 시나리오 결과의 metadata["turns"]만 읽어서 누적 → 결과 전체를 메모리에 모을 필요 없음
+- LLM 호출 / Tool 실행 / 시나리오 단위의 지연 시간 p50 / p95 / p99와 합계 제공
+"""
+
+import math
+from typing import Dict, Any, List, Optional
+
+# 1M 토큰당 USD 단가 (비용 추정용, main에서 --price-input / --price-output으로 변경)
+DEFAULT_PRICE_PER_1M_TOKENS = {"prompt": 0.15, "completion": 0.60}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 방식 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # rank = ceil(pct/100 * n) (곱셈을 먼저 해서 0.07 * 100 같은 부동소수 오차로 한 칸 밀리지 않게)
+    rank = max(1, math.ceil(pct * len(ordered) / 100.0))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def estimate_cost(usage: Optional[Dict[str, int]], prices: Dict[str, float]) -> float:
+    """usage({"prompt_tokens", "completion_tokens"})의 추정 비용(USD)"""
+    if not usage:
+        return 0.0
+    return (
+        usage["prompt_tokens"] * prices["prompt"] + usage["completion_tokens"] * prices["completion"]
+    ) / 1_000_000
+
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "p99": round(percentile(values, 99), 1),
+        "total": round(sum(values), 1)
+    }
+
+
+class RunMetrics:
+    """시나리오 결과 metadata의 계측값 누적기"""
+
+    def __init__(self):
+        self.scenarios = 0
+        self.llm_calls = 0
+        self.cached_calls = 0
+        self.failed_calls = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.scenario_latencies: List[float] = []
+        self.llm_latencies: List[float] = []
+        self.tool_latencies: Dict[str, List[float]] = {}
+
+    def add(self, metadata: Dict[str, Any]):
+        self.scenarios += 1
+        if metadata.get("elapsed_ms") is not None:
+            self.scenario_latencies.append(metadata["elapsed_ms"])
+        for turn in metadata.get("turns", []):
+            for call in turn["llm_calls"]:
+                self.llm_calls += 1
+                self.retries += call["retries"]
+                self.prompt_tokens += call["prompt_tokens"]
+                self.completion_tokens += call["completion_tokens"]
+                self.cost_usd += call["cost_usd"]
+                if call["cached"]:
+                    self.cached_calls += 1
+                else:
+                    self.llm_latencies.append(call["elapsed_ms"]) # 캐시 히트는 지연 시간 분포에서 제외
+                if not call["success"]:
+                    self.failed_calls += 1
+            for tool in turn.get("tool_calls", []):
+                self.tool_latencies.setdefault(tool["name"], []).append(tool["elapsed_ms"])
+
+    def summary(self) -> Dict[str, Any]:
+        all_tool_latencies = [ms for values in self.tool_latencies.values() for ms in values]
+        return {
+            "scenarios": self.scenarios,
+            "llm_calls": self.llm_calls,
+            "cached_calls": self.cached_calls,
+            "failed_calls": self.failed_calls,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "scenario_latency_ms": latency_summary(self.scenario_latencies),
+            "llm_latency_ms": latency_summary(self.llm_latencies),
+            "tool_latency_ms": latency_summary(all_tool_latencies),
+            "tool_latency_ms_by_name": {
+                name: latency_summary(values) for name, values in sorted(self.tool_latencies.items())
+            }
+        }
@@ -11,22 +11,47 @@ O조 (스마트스토어 1인 판매자 AI 에이전트) - FIXED 버전
 5. ✅ num_tools_called 메타데이터 추가
 
 도메인: 쇼핑 & 이커머스
-Tool 개수: 6개 (최적화)
+Tool 개수: 8개 (최적화)
 시나리오: Single 2개, Multi 2개
 
 ===============================================================================
 """
 
 import os
+import re
 import sys
 import json
 import uuid
 import random
 import time
-from typing import List, Dict, Any, Optional
+import hashlib
+import asyncio
+import contextvars
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional, Callable, Set, Tuple, Iterator, AsyncIterator
 from datetime import datetime
+import numpy as np
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessage
+
+from rate_limiter import RateLimiter
+from llm_cache import LLMResponseCache, CacheMissError, CACHE_MODES
+from run_metrics import RunMetrics, DEFAULT_PRICE_PER_1M_TOKENS, estimate_cost
+import tracing
+from tool_cache import ToolResultCache
+from catalog_store import CatalogStore
+from product_analytics import analyze_batch
+from trend_engine import TrendEngine, TREND_WINDOWS, DEFAULT_WINDOW, MAX_TOP_N, load_trend_file
+from keyword_index import KeywordIndex
+from alert_dispatcher import AlertDispatcher, KakaoHttpSender
+from publish_queue import PublishQueue
+from tool_backends import MOCK_PRODUCT_DB, BLOG_ID, TOOL_BACKENDS, stable_number, create_backend, load_backend_config
+from tool_schemas import TOOL_SCHEMAS
+from tool_validators import compile_validators
 
 # ============================================================================
 # 환경 설정
@@ -38,16 +63,37 @@ print("="*80)
 
 load_dotenv()
 UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY", "YOUR_API_KEY_HERE")
+# OpenAI 호환 엔드포인트 (로컬 stub_server.py로 바꿔서 오프라인 벤치마크 가능)
+UPSTAGE_BASE_URL = os.getenv("UPSTAGE_BASE_URL", "https://api.upstage.ai/v1")
+
+
+def check_api_key():
+    """시나리오 실행 전 API 키 확인 (--merge처럼 API를 쓰지 않는 작업은 키 없이 실행 가능)"""
+    if UPSTAGE_API_KEY == "YOUR_API_KEY_HERE":
+        print("\n⚠️  .env 파일에 UPSTAGE_API_KEY를 설정해주세요!")
+        print("   (이 파일과 같은 위치에 .env 파일을 만들고 UPSTAGE_API_KEY=\"sk-xxx\" 형식으로 키를 입력하세요.)")
+        sys.exit(1)
+
+
+def create_client(base_url: str = UPSTAGE_BASE_URL, api_key: str = UPSTAGE_API_KEY) -> AsyncOpenAI:
+    """
+    비동기 클라이언트 생성: 여러 시나리오를 동시에 실행하기 위해 사용
+    재시도는 rate_limiter가 담당하므로 SDK 자체 재시도는 끔
+    """
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=0
+    )
+
 
-if UPSTAGE_API_KEY == "YOUR_API_KEY_HERE":
-    print("\n⚠️  .env 파일에 UPSTAGE_API_KEY를 설정해주세요!")
-    print("   (이 파일과 같은 위치에 .env 파일을 만들고 UPSTAGE_API_KEY=\"sk-xxx\" 형식으로 키를 입력하세요.)")
-    sys.exit(1)
+client = create_client()
 
-client = OpenAI(
-    api_key=UPSTAGE_API_KEY,
-    base_url="https://api.upstage.ai/v1"
-)
+# 모든 시나리오가 공유하는 속도 제한기 (main에서 CLI 옵션으로 재설정)
+rate_limiter = RateLimiter()
+
+# 디스크 응답 캐시 (main에서 --cache 옵션으로 활성화, None이면 사용 안 함)
+llm_cache: Optional[LLMResponseCache] = None
 
 os.makedirs("outputs", exist_ok=True)
 os.makedirs("data", exist_ok=True)
@@ -57,92 +103,227 @@ print("✅ 환경 설정 완료\n")
 
 
 # ============================================================================
-# Mock 함수 정의 (O조 6개 툴)
+# Tool 함수 정의 (O조 8개 툴)
 # ============================================================================
 
+# 업스트림 서비스 백엔드 (main에서 --tool-backend로 재설정, 기본: Mock 데이터, tool_backends.py)
+tool_backend = create_backend("mock")
+
 # --------------------------
 # Tool 1: 스토어 대시보드 요약
 # --------------------------
+# 대시보드에 나열할 재고 부족 상품 최대 개수 (전체 개수는 low_stock_count로 제공)
+LOW_STOCK_LIST_LIMIT = 20
+
+
 def get_store_dashboard(low_stock_threshold: str = "10") -> Dict[str, Any]:
     """
     일일 스토어 현황 요약 (신규주문, Q&A 개수, 재고부족)
+    - 재고부족: 재고가 기준 미만인 상품을 재고 적은 순으로 (커머스 백엔드의 재고 순 인덱스 조회, 전체 스캔 없음)
     """
     try:
         threshold = int(low_stock_threshold)
     except ValueError:
         threshold = 10
         
-    # Mock Data
-    return {
-        "new_orders": 5,
-        "pending_qa_count": 2,
-        "low_stock_products": [
-            {"name": "A상품", "stock": 7}
-        ],
-        "analyzed_threshold": threshold
-    }
+    # 주문/Q&A와 재고부족 모두 같은 커머스 백엔드 (Mock / 카탈로그 / HTTP)
+    summary = tool_backend.store_summary()
+    low_stock = tool_backend.low_stock(threshold, LOW_STOCK_LIST_LIMIT)
+    result = {**summary, **low_stock, "analyzed_threshold": threshold}
+    errors = [part["error"] for part in (summary, low_stock) if "error" in part]
+    if errors:
+        result["error"] = "; ".join(errors)
+    return result
+
+
+def record_stock_change(product_id: str, stock: int, name: Optional[str] = None):
+    """재고 변경 이벤트 반영 (커머스 백엔드의 재고 순 인덱스 갱신 + 캐시된 대시보드 결과 무효화)"""
+    tool_backend.update_stock(product_id, stock, name)
+    if tool_cache is not None:
+        tool_cache.invalidate("get_store_dashboard")
 
 # --------------------------
 # Tool 2: 상품 전략 분석 (오류 복구 시나리오 포함)
 # --------------------------
+# 로컬 상품 카탈로그 (main에서 --catalog로 설정, None이면 아래 Mock 데이터 사용)
+product_catalog: Optional[CatalogStore] = None
+
+
+def missing_trend_result(product_id: str, analysis_keyword: str) -> Optional[Dict[str, Any]]:
+    """
+    시나리오 2.2: '울트라 웜 부츠' 키워드가 들어오면 의도적으로 오류 반환 (해당 없으면 None)
+    (트렌드 데이터가 있는 비슷한 키워드를 함께 제시 → 모델이 같은 턴에 바로 재시도 가능)
+    """
+    if "울트라 웜 부츠" not in analysis_keyword:
+        return None
+    return {
+        "product_id": product_id,
+        "stock_level": 200, # 재고는 확인됨
+        "keyword_trend": None,
+        "error": f"No data found for '{analysis_keyword}'", # 트렌드 데이터 없음
+        "suggested_keywords": keyword_index.suggest(analysis_keyword) if keyword_index is not None else []
+    }
+
+
 def analyze_product_strategy(product_id: str, analysis_keyword: str) -> Dict[str, Any]:
     """
     상품 재고(커머스)+키워드 트렌드(쇼핑인사이트) 동시 분석
     *** 시나리오 2.2 (오류 복구)를 위한 로직 포함 ***
     """
-    # 시나리오 2.2: '울트라 웜 부츠' 키워드가 들어오면 의도적으로 오류 반환
-    if "울트라 웜 부츠" in analysis_keyword:
-        return {
-            "product_id": product_id,
-            "stock_level": 200, # 재고는 확인됨
-            "keyword_trend": None,
-            "error": f"No data found for '{analysis_keyword}'" # 트렌드 데이터 없음
-        }
+    scenario_error = missing_trend_result(product_id, analysis_keyword)
+    if scenario_error is not None:
+        return scenario_error
     
-    # Mock Data (정상 케이스)
-    mock_db = {
-        "P123": {"stock_level": 7, "trend": 45.5, "keyword": "캠핑 의자"},
-        "P456": {"stock_level": 150, "trend": -10.2, "keyword": "게이밍 의자"},
-        "P789": {"stock_level": 200, "trend": 15.0, "keyword": "겨울 부츠"}
-    }
+    # 정상 케이스: 재고(커머스) + 트렌드(쇼핑인사이트)는 백엔드에서 조회 (Mock / 카탈로그 / HTTP)
+    return tool_backend.analyze_product(product_id, analysis_keyword)
+
+# --------------------------
+# Tool 2-1: 여러 상품 일괄 전략 분석 (비교 요청용)
+# --------------------------
+MAX_BATCH_PRODUCTS = 100
+
+
+def analyze_products_batch(product_ids: List[str], analysis_keywords: List[str]) -> Dict[str, Any]:
+    """
+    여러 상품의 재고 + 키워드 트렌드를 한 번에 분석하고 재입고 vs 광고 우선순위로 정렬
+    - 상품별 데이터는 analyze_product_strategy와 같은 출처(tool_backend)를 일괄 조회
+      (카탈로그: IN 조회, HTTP: 상품 / 트렌드 일괄 요청 각 1번 → 상품 수만큼 순차 호출하지 않음)
+    - 트렌드 변화율 / 우선순위는 product_analytics의 벡터화 계산으로 한 번에 처리
+    - 분석할 수 없는 상품(데이터 없음 등)은 errors에 따로 모음
+    """
+    if len(product_ids) != len(analysis_keywords):
+        return {"error": f"product_ids({len(product_ids)}개)와 analysis_keywords({len(analysis_keywords)}개)의 개수가 다릅니다"}
+    if not product_ids:
+        return {"error": "분석할 상품이 없습니다"}
+    if len(product_ids) > MAX_BATCH_PRODUCTS:
+        return {"error": f"한 번에 최대 {MAX_BATCH_PRODUCTS}개 상품까지 분석할 수 있습니다 (요청: {len(product_ids)}개)"}
+    
+    pairs = list(zip(product_ids, analysis_keywords))
+    results = [missing_trend_result(product_id, analysis_keyword) for product_id, analysis_keyword in pairs]
+    pending = [i for i, result in enumerate(results) if result is None]
+    for i, single in zip(pending, tool_backend.analyze_products([pairs[i] for i in pending])):
+        results[i] = single
     
-    data = mock_db.get(product_id, {"stock_level": 50, "trend": 5.0, "keyword": analysis_keyword})
+    ids, keywords, stocks, trends = [], [], [], []
+    errors = []
+    for (product_id, analysis_keyword), single in zip(pairs, results):
+        if "error" in single or single["keyword_trend"] is None or single["stock_level"] is None:
+            errors.append({
+                "product_id": product_id,
+                "analysis_keyword": analysis_keyword,
+                "error": single.get("error", "No trend data"),
+                "suggested_keywords": single.get("suggested_keywords", [])
+            })
+            continue
+        ids.append(product_id)
+        keywords.append(single["keyword_trend"]["keyword"])
+        stocks.append(single["stock_level"])
+        trends.append(single["keyword_trend"]["trend_change_percent"])
     
     return {
-        "product_id": product_id,
-        "stock_level": data["stock_level"],
-        "keyword_trend": {
-            "keyword": data["keyword"],
-            "trend_change_percent": data["trend"]
-        }
+        "num_products": len(product_ids),
+        "ranking": analyze_batch(ids, keywords, stocks, trends),
+        "errors": errors
     }
 
 # --------------------------
 # Tool 3: 쇼핑 1위 트렌드 조회
 # --------------------------
-def get_top_shopping_trend(category_code: str) -> Dict[str, Any]:
+# Mock 카테고리별 키워드 (앞쪽일수록 검색량이 많고 상승세)
+MOCK_CATEGORY_KEYWORDS = {
+    "50000000": ["경량 패딩", "겨울 부츠", "롱패딩", "니트 가디건", "기모 바지", "목도리", "어그 부츠", "플리스 자켓", "털모자", "장갑"],
+    "50000001": ["쿠션 팩트", "립밤", "핸드크림", "수분 크림", "선크림", "클렌징 오일", "마스크팩", "바디로션"],
+    "50000002": ["무선 이어폰", "보조배터리", "스마트워치", "블루투스 스피커", "태블릿 거치대", "충전 케이블"],
+    "50000003": ["캠핑 의자", "게이밍 의자", "전기요", "가습기", "수납장", "러그", "무드등"],
+    "50000006": ["귤", "딸기", "견과류", "단백질 쉐이크", "닭가슴살", "라면"],
+    "50000007": ["캠핑 의자", "등산화", "요가 매트", "덤벨", "텐트", "핫팩"]
+}
+MOCK_TREND_DAYS = 2 * max(TREND_WINDOWS.values())
+
+
+def build_mock_trend_engine() -> TrendEngine:
+    """Mock 카테고리마다 키워드별 일별 검색량을 생성해 적재 (같은 입력이면 항상 같은 값)"""
+    engine = TrendEngine()
+    days = np.arange(MOCK_TREND_DAYS)
+    for category, keywords in MOCK_CATEGORY_KEYWORDS.items():
+        series = {}
+        for position, keyword in enumerate(keywords):
+            base = 10000.0 / (position + 1)
+            growth = 0.012 / (position + 1) - 0.002 # 1위 키워드가 가장 가파르게 상승
+            noise = np.random.default_rng(stable_number(category, keyword, low=0, high=2**31)).normal(0, 0.03, len(days))
+            series[keyword] = (base * np.exp(growth * days) * (1 + noise)).round().tolist()
+        engine.ingest(category, series)
+    return engine
+
+
+# 카테고리별 트렌드 롤업 (main에서 --trend-data가 있으면 해당 파일로 다시 생성)
+trend_engine = build_mock_trend_engine()
+
+
+def build_keyword_index() -> KeywordIndex:
+    """트렌드 데이터가 있는 키워드(상품 카탈로그 또는 Mock 상품 + 카테고리 트렌드) 유사도 색인"""
+    if product_catalog is not None:
+        product_keywords = product_catalog.iter_trend_keywords()
+    else:
+        product_keywords = (data["keyword"] for data in MOCK_PRODUCT_DB.values())
+    return KeywordIndex(list(product_keywords) + trend_engine.keywords())
+
+
+# "No data found" 오류에 넣을 대체 키워드 추천 색인 (main에서 데이터 소스가 바뀌면 다시 생성)
+keyword_index: Optional[KeywordIndex] = build_keyword_index()
+
+
+def get_top_shopping_trend(category_code: str, top_n: str = "1", window: str = DEFAULT_WINDOW) -> Dict[str, Any]:
     """
-    카테고리 1위 트렌드 키워드 조회 (Mock)
+    카테고리 트렌드 키워드 순위 조회 (미리 계산된 롤업에서 바로 반환)
+    - top_n: 상위 몇 개까지 (최대 MAX_TOP_N), window: 집계 기간 (7d / 28d)
+    - 데이터가 없는 카테고리는 전체 카테고리 합산 순위 (scope: all_categories)
     """
-    # Mock Data
+    try:
+        top_n_value = int(top_n)
+    except (TypeError, ValueError):
+        top_n_value = 1
+    if window not in TREND_WINDOWS:
+        window = DEFAULT_WINDOW
+    
+    top = trend_engine.top_keywords(category_code, top_n_value, window)
+    if top:
+        return {
+            **top[0],
+            "category_analyzed": category_code,
+            "window": window,
+            "top_keywords": top
+        }
+    
+    # 데이터가 없는 카테고리 코드는 전체 카테고리 합산 트렌드로 대체 (기존처럼 항상 트렌드 반환)
+    top = trend_engine.overall_top_keywords(top_n_value, window)
+    if not top:
+        return {
+            "category_analyzed": category_code,
+            "error": f"No trend data for category '{category_code}'"
+        }
     return {
-        "rank": 1,
-        "keyword": "경량 패딩",
-        "trend_score": 95.8,
-        "change_percent": 45.5,
-        "category_analyzed": category_code
+        **top[0],
+        "category_analyzed": category_code,
+        "window": window,
+        "scope": "all_categories",
+        "note": f"No trend data for category '{category_code}'; showing the all-category trend",
+        "top_keywords": top
     }
 
+# 블로그/카페 발행 작업 큐 (main에서 재생성, 실제 발행은 워커 스레드에서 tool_backend로 진행)
+publish_queue = PublishQueue()
+
 # --------------------------
 # Tool 4: 블로그 포스팅
 # --------------------------
 def post_blog_promotion(title: str, content: str) -> Dict[str, Any]:
     """
-    Solar가 생성한 글을 네이버 블로그에 포스팅 (Mock)
+    Solar가 생성한 글의 네이버 블로그 발행 작업 등록 (바로 job_id 반환, 결과 URL은 get_publish_status로 조회)
     """
+    job = publish_queue.submit("blog", f"blog:{BLOG_ID}", tool_backend.publish_blog, {"title": title, "content": content})
     return {
-        "status": "success",
-        "post_url": f"https://blog.naver.com/my_id/{random.randint(1000, 9999)}",
+        **job,
         "title_length": len(title),
         "content_length": len(content)
     }
@@ -152,177 +333,342 @@ def post_blog_promotion(title: str, content: str) -> Dict[str, Any]:
 # --------------------------
 def post_cafe_article(cafe_id: str, menu_id: str, title: str, content: str) -> Dict[str, Any]:
     """
-    Solar가 생성한 글을 네이버 카페에 포스팅 (Mock)
+    Solar가 생성한 글의 네이버 카페 발행 작업 등록 (바로 job_id 반환, 결과 URL은 get_publish_status로 조회)
     """
+    job = publish_queue.submit(
+        "cafe", f"cafe:{cafe_id}/{menu_id}", tool_backend.publish_cafe,
+        {"cafe_id": cafe_id, "menu_id": menu_id, "title": title, "content": content}
+    )
     return {
-        "status": "success",
-        "article_url": f"https://cafe.naver.com/{cafe_id}/{random.randint(100, 999)}",
+        **job,
         "cafe_id": cafe_id,
         "menu_id": menu_id
     }
 
+# --------------------------
+# Tool 5-1: 발행 작업 상태 조회
+# --------------------------
+def get_publish_status(job_id: str) -> Dict[str, Any]:
+    """
+    블로그/카페 발행 작업 상태 (succeeded면 post_url / article_url 포함)
+    """
+    job = publish_queue.status(job_id)
+    if job is None:
+        return {"job_id": job_id, "error": f"Unknown job_id: {job_id}"}
+    return job
+
 # --------------------------
 # Tool 6: 판매자에게 알림 전송
 # --------------------------
+# 카톡 발송 큐 (main에서 tool_backend / --alert-endpoint로 재설정, 기본: 발송 내용만 기록하는 Mock)
+alert_dispatcher = AlertDispatcher()
+
+
 def alert_seller(message: str, alert_level: str) -> Dict[str, Any]:
     """
-    판매자에게 카톡으로 긴급 알림 전송 (Mock)
+    판매자에게 카톡 알림 전송 요청 (발송 큐에 넣고 바로 반환)
+    - urgent는 즉시 발송, info/warning은 잠시 모았다가 요약 1건으로 발송
+    - 같은 알림을 반복 요청하면 한 번만 발송하고 같은 message_id 반환
     """
+    queued = alert_dispatcher.submit(message, alert_level)
     return {
-        "status": "success",
-        "message_id": f"KA-{random.randint(10000, 99999)}",
+        **queued,
         "sent_message": message,
         "level": alert_level
     }
 
-# Tool 매핑
-TOOL_FUNCTIONS = {
-    "get_store_dashboard": get_store_dashboard,
-    "analyze_product_strategy": analyze_product_strategy,
-    "get_top_shopping_trend": get_top_shopping_trend,
-    "post_blog_promotion": post_blog_promotion,
-    "post_cafe_article": post_cafe_article,
-    "alert_seller": alert_seller
+# Tool 레지스트리
+# - side_effect: 외부에 흔적을 남기는 Tool (병렬 실행/미리 실행/결과 캐시 모두 제외, 호출 순서대로 하나씩 실행)
+# - cacheable / ttl: 같은 인자의 결과를 ttl초 동안 재사용하는 조회 Tool
+TOOL_REGISTRY = {
+    "get_store_dashboard": {"function": get_store_dashboard, "side_effect": False, "cacheable": True, "ttl": 30},
+    "analyze_product_strategy": {"function": analyze_product_strategy, "side_effect": False, "cacheable": True, "ttl": 300},
+    "analyze_products_batch": {"function": analyze_products_batch, "side_effect": False, "cacheable": True, "ttl": 300},
+    "get_top_shopping_trend": {"function": get_top_shopping_trend, "side_effect": False, "cacheable": True, "ttl": 600},
+    "post_blog_promotion": {"function": post_blog_promotion, "side_effect": True, "cacheable": False, "ttl": 0},
+    "post_cafe_article": {"function": post_cafe_article, "side_effect": True, "cacheable": False, "ttl": 0},
+    "get_publish_status": {"function": get_publish_status, "side_effect": False, "cacheable": False, "ttl": 0},
+    "alert_seller": {"function": alert_seller, "side_effect": True, "cacheable": False, "ttl": 0}
 }
 
+# Tool 매핑
+TOOL_FUNCTIONS = {name: spec["function"] for name, spec in TOOL_REGISTRY.items()}
+SIDE_EFFECT_TOOLS = {name for name, spec in TOOL_REGISTRY.items() if spec["side_effect"]}
+CACHEABLE_TOOLS = {name for name, spec in TOOL_REGISTRY.items() if spec["cacheable"] and not spec["side_effect"]}
+
+# 조회 Tool 결과 캐시 (main에서 --tool-cache-size로 크기 설정, 0이면 사용 안 함)
+tool_cache: Optional[ToolResultCache] = ToolResultCache(max_entries=1024)
+
 # ============================================================================
-# Tool JSON 스키마 정의 (O조 6개 툴)
+# Tool JSON 스키마 (O조 8개 툴, tool_schemas.py에서 정의 → 평가 스크립트와 공유)
 # ============================================================================
 
-tools = [
-    {
-        "type": "function",
-        "function": {
-            "name": "get_store_dashboard",
-            "description": "일일 스토어 현황 요약 (신규주문, Q&A 개수, 재고부족)을 조회합니다.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "low_stock_threshold": {
-                        "type": "string", 
-                        "description": "재고 부족으로 간주할 기준 숫자(문자열 형태)"
-                    }
-                },
-                "required": []
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "analyze_product_strategy",
-            "description": "특정 상품의 재고와 키워드 트렌드를 동시에 분석합니다.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "product_id": {"type": "string", "description": "분석할 상품의 고유 ID (예: P123)"},
-                    "analysis_keyword": {"type": "string", "description": "분석에 사용할 연관 키워드 (예: '캠핑 의자')"}
-                },
-                "required": ["product_id", "analysis_keyword"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_top_shopping_trend",
-            "description": "특정 카테고리의 현재 쇼핑 트렌드 1위 키워드를 조회합니다.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "category_code": {"type": "string", "description": "네이버 쇼핑 카테고리 코드 (예: '50000000'은 '패션/잡화')"}
-                },
-                "required": ["category_code"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "post_blog_promotion",
-            "description": "AI(Solar)가 생성한 제목과 본문을 네이버 블로그에 포스팅합니다.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string", "description": "포스팅할 블로그 글의 제목"},
-                    "content": {"type": "string", "description": "포스팅할 블로그 글의 본문 (HTML 또는 텍스트)"}
-                },
-                "required": ["title", "content"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "post_cafe_article",
-            "description": "AI(Solar)가 생성한 글을 네이버 카페에 포스팅합니다.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "cafe_id": {"type": "string", "description": "네이버 카페 고유 ID"},
-                    "menu_id": {"type": "string", "description": "카페 내 게시판(메뉴) ID"},
-                    "title": {"type": "string", "description": "게시글 제목"},
-                    "content": {"type": "string", "description": "게시글 본문"}
-                },
-                "required": ["cafe_id", "menu_id", "title", "content"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "alert_seller",
-            "description": "판매자에게 긴급 알림을 전송합니다(카톡).",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "message": {"type": "string", "description": "전송할 알림 메시지 내용"},
-                    "alert_level": {
-                        "type": "string", 
-                        "description": "알림 수준 (info: 정보, warning: 경고, urgent: 긴급)",
-                        "enum": ["info", "warning", "urgent"]
-                    }
-                },
-                "required": ["message", "alert_level"]
-            }
-        }
-    }
-]
+tools = TOOL_SCHEMAS
+
+# 스키마에서 컴파일한 Tool별 인자 검증 함수 (execute_tool_call에서 실행 전 검사)
+TOOL_VALIDATORS = compile_validators(tools)
 
 # ============================================================================
 # API 호출 및 Tool 실행
 # ============================================================================
 
-def call_solar_api(messages: List[Dict], tools_spec: List[Dict]) -> Dict[str, Any]:
-    """Solar Pro 2 API 호출"""
+# Solar 호출 파라미터 (캐시 키에도 그대로 사용)
+SOLAR_MODEL = "solar-pro"
+TEMPERATURE = 0.7
+TOOL_CHOICE = "auto"  # Tool 자동 선택 활성화
+
+# TPM 계산 시 응답(completion) 몫으로 미리 확보해 두는 토큰 수
+COMPLETION_TOKEN_RESERVE = 512
+
+# stream=True로 응답을 받으며 tool_calls를 조립 (main에서 --stream으로 활성화)
+STREAM_COMPLETIONS = False
+
+
+def estimate_tokens(messages: List[Any], tools_spec: Optional[List[Dict]] = None) -> int:
+    """
+    요청 토큰 수 대략 추정 (TPM 제한용)
+    - 한국어/JSON 혼합 기준 약 2.5자당 1토큰으로 보수적으로 계산
+    """
+    chars = 0
+    for message in messages:
+        if not isinstance(message, dict):
+            message = message.model_dump(exclude_none=True)
+        chars += len(json.dumps(message, ensure_ascii=False))
+    if tools_spec:
+        chars += len(json.dumps(tools_spec, ensure_ascii=False))
+    return int(chars / 2.5) + 1
+
+
+def _is_complete_json(text: str) -> bool:
+    if not text.rstrip().endswith("}"):
+        return False
     try:
-        response = client.chat.completions.create(
-            model="solar-pro",
-            messages=messages,
-            tools=tools_spec,
-            tool_choice="auto",  # Tool 자동 선택 활성화
-            temperature=0.7
-        )
+        json.loads(text)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+async def _stream_completion(messages: List[Dict], tools_spec: List[Dict], on_tool_call: Optional[Callable] = None):
+    """
+    stream=True 호출: content/tool_calls 델타를 조립해 ChatCompletionMessage로 반환
+    - 각 tool_call의 arguments가 완성되는 즉시(JSON 완결 또는 다음 tool_call 시작) on_tool_call 콜백 호출
+    - 반환: (message, usage, timings) / timings = 첫 토큰, 첫 tool_call 완성까지 걸린 시간(ms)
+    """
+    started = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model=SOLAR_MODEL,
+        messages=messages,
+        tools=tools_spec,
+        tool_choice=TOOL_CHOICE,
+        temperature=TEMPERATURE,
+        timeout=rate_limiter.timeout,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    
+    content_parts: List[str] = []
+    calls: Dict[int, Dict[str, Any]] = {} # index → {"id", "name", "arguments"}
+    ready = set()
+    usage = None
+    timings = {"ttft_ms": None, "ttfc_ms": None}
+    
+    def emit(index: int):
+        ready.add(index)
+        if timings["ttfc_ms"] is None:
+            timings["ttfc_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        call = calls[index]
+        if on_tool_call is not None and call["id"]:
+            on_tool_call(SimpleNamespace(
+                id=call["id"],
+                function=SimpleNamespace(name=call["name"], arguments="".join(call["arguments"]))
+            ))
+    
+    async for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if timings["ttft_ms"] is None and (delta.content or delta.tool_calls):
+            timings["ttft_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if delta.content:
+            content_parts.append(delta.content)
+        
+        for tool_delta in delta.tool_calls or []:
+            # 새 tool_call이 시작되면 그 이전 tool_call들은 인자가 모두 도착한 것
+            for index in sorted(calls):
+                if index < tool_delta.index and index not in ready:
+                    emit(index)
+            call = calls.setdefault(tool_delta.index, {"id": None, "name": "", "arguments": []})
+            if tool_delta.id:
+                call["id"] = tool_delta.id
+            if tool_delta.function:
+                if tool_delta.function.name:
+                    call["name"] += tool_delta.function.name
+                if tool_delta.function.arguments:
+                    call["arguments"].append(tool_delta.function.arguments)
+                    if tool_delta.index not in ready and _is_complete_json("".join(call["arguments"])):
+                        emit(tool_delta.index)
+    
+    for index in sorted(calls):
+        if index not in ready:
+            emit(index)
+    
+    message = ChatCompletionMessage.model_validate({
+        "role": "assistant",
+        "content": "".join(content_parts) if content_parts else None,
+        "tool_calls": [
+            {
+                "id": calls[i]["id"],
+                "type": "function",
+                "function": {"name": calls[i]["name"], "arguments": "".join(calls[i]["arguments"])}
+            }
+            for i in sorted(calls)
+        ] or None
+    })
+    return message, usage, timings
+
+
+async def call_solar_api(messages: List[Dict], tools_spec: List[Dict], on_tool_call: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Solar Pro 2 API 호출 (비동기, 응답 캐시 + 속도 제한 + 재시도)
+    - STREAM_COMPLETIONS 모드에서는 인자가 완성된 tool_call마다 on_tool_call(tool_call) 호출
+    - 반환값의 usage / elapsed_ms(대기·재시도 포함 전체 시간) / retries / cached는 메타데이터 계측용
+    """
+    started = time.perf_counter()
+    cache_key = None
+    if llm_cache is not None:
+        cache_key = llm_cache.make_key(SOLAR_MODEL, messages, tools_spec, TEMPERATURE, TOOL_CHOICE)
+        try:
+            cached = llm_cache.get(cache_key)
+        except CacheMissError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "retries": 0,
+                "elapsed_ms": _elapsed_ms(started)
+            }
+        if cached is not None:
+            return {
+                "success": True,
+                "message": ChatCompletionMessage.model_validate(cached["message"]),
+                "retries": 0,
+                "cached": True,
+                "usage": _usage_dict(cached.get("usage")),
+                "elapsed_ms": _elapsed_ms(started),
+                "timings": {"ttft_ms": None, "ttfc_ms": None}
+            }
+    
+    estimated_tokens = estimate_tokens(messages, tools_spec) + COMPLETION_TOKEN_RESERVE
+    retries = 0
+    
+    while True:
+        await rate_limiter.acquire(estimated_tokens)
+        try:
+            if STREAM_COMPLETIONS:
+                message, usage, timings = await _stream_completion(messages, tools_spec, on_tool_call)
+            else:
+                response = await client.chat.completions.create(
+                    model=SOLAR_MODEL,
+                    messages=messages,
+                    tools=tools_spec,
+                    tool_choice=TOOL_CHOICE,
+                    temperature=TEMPERATURE,
+                    timeout=rate_limiter.timeout
+                )
+                message = response.choices[0].message
+                usage = getattr(response, "usage", None)
+                timings = {"ttft_ms": None, "ttfc_ms": None}
+        except Exception as e:
+            delay = rate_limiter.retry_delay(e, retries)
+            if delay is None:
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "retries": retries,
+                    "elapsed_ms": _elapsed_ms(started)
+                }
+            retries += 1
+            await asyncio.sleep(delay)
+            continue
+        
+        rate_limiter.record_usage(estimated_tokens, usage.total_tokens if usage else None)
+        if cache_key is not None:
+            llm_cache.put(cache_key, {
+                "message": message.model_dump(),
+                "usage": usage.model_dump() if usage else None
+            })
         return {
             "success": True,
-            "message": response.choices[0].message
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
+            "message": message,
+            "retries": retries,
+            "cached": False,
+            "usage": _usage_dict(usage),
+            "elapsed_ms": _elapsed_ms(started),
+            "timings": timings
         }
 
 
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, int]]:
+    """response.usage(객체 또는 캐시에 저장된 dict) → {"prompt_tokens", "completion_tokens"}"""
+    if usage is None:
+        return None
+    if not isinstance(usage, dict):
+        usage = usage.model_dump()
+    return {
+        "prompt_tokens": usage.get("prompt_tokens") or 0,
+        "completion_tokens": usage.get("completion_tokens") or 0
+    }
+
+
+def logged_arguments(raw: Optional[str]) -> Any:
+    """평가용 tool_calls 로그의 arguments: 파싱된 딕셔너리 (JSON이 아니면 원문 문자열 → 평가에서 인자 오류)"""
+    try:
+        return json.loads(raw or "{}")
+    except json.JSONDecodeError:
+        return raw
+
+
 def execute_tool_call(tool_call) -> Dict[str, Any]:
-    """Tool 호출 실행 및 결과 반환"""
+    """
+    Tool 호출 실행 및 결과 반환
+    - 인자 JSON 파싱 실패 / 스키마 위반 / Tool 실행 중 예외는 {"error": ...} 결과로 돌려줌
+      (시나리오 전체를 중단하지 않고 모델이 같은 대화에서 고쳐 다시 호출)
+    """
     func_name = tool_call.function.name
-    func_args = json.loads(tool_call.function.arguments)
+    with tracing.thread_span(f"{func_name}: parse_args", "tool", tool_call_id=tool_call.id):
+        try:
+            func_args = json.loads(tool_call.function.arguments or "{}")
+        except json.JSONDecodeError as e:
+            func_args = None
+            arg_errors = [f"arguments가 올바른 JSON이 아님 ({e})"]
+        else:
+            validator = TOOL_VALIDATORS.get(func_name)
+            arg_errors = validator(func_args) if validator is not None else []
     
-    if func_name in TOOL_FUNCTIONS:
-        result = TOOL_FUNCTIONS[func_name](**func_args)
-    else:
-        result = {"error": f"Unknown function: {func_name}"}
+    with tracing.thread_span(f"{func_name}: run", "tool", tool_call_id=tool_call.id) as run_span:
+        try:
+            if arg_errors:
+                # 스키마 위반 인자는 실행하지 않고 오류를 돌려줌 (모델이 인자를 고쳐 다시 호출)
+                result = {"error": f"Invalid arguments: {'; '.join(arg_errors)}"}
+                run_span.set(invalid_arguments=True)
+            elif func_name in CACHEABLE_TOOLS and tool_cache is not None:
+                result, cache_hit = tool_cache.get_or_call(
+                    func_name, TOOL_FUNCTIONS[func_name], func_args, TOOL_REGISTRY[func_name]["ttl"]
+                )
+                run_span.set(cached=cache_hit)
+            elif func_name in TOOL_FUNCTIONS:
+                result = TOOL_FUNCTIONS[func_name](**func_args)
+            else:
+                result = {"error": f"Unknown function: {func_name}"}
+        except Exception as e:
+            result = {"error": f"Tool execution failed: {type(e).__name__}: {e}"}
+            run_span.set(failed=True)
     
     return {
         "role": "tool",
@@ -332,11 +678,221 @@ def execute_tool_call(tool_call) -> Dict[str, Any]:
     }
 
 
+# 한 턴 안의 독립적인 tool_calls를 병렬로 실행 (main에서 --no-parallel-tools로 끌 수 있음)
+PARALLEL_TOOL_CALLS = True
+tool_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="tool")
+
+
+def _execute_tool_call_timed(tool_call) -> Tuple[Dict[str, Any], float]:
+    """execute_tool_call + 실행 시간(ms) 측정 (스레드 풀에서 실행)"""
+    started = time.perf_counter()
+    result = execute_tool_call(tool_call)
+    return result, _elapsed_ms(started)
+
+
+def _submit_tool_call(tool_call) -> asyncio.Future:
+    """tool_executor에서 Tool 실행 시작 (trace의 현재 시나리오 정보를 워커 스레드로 전달)"""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(tool_executor, contextvars.copy_context().run, _execute_tool_call_timed, tool_call)
+
+
+def early_tool_starter():
+    """
+    스트리밍 중 인자가 완성된 조회 Tool을 메시지 전체 도착 전에 바로 실행하는 콜백 생성
+    - 반환: (call_solar_api에 넘길 콜백, tool_call_id → 실행 중인 Future dict)
+    - SIDE_EFFECT_TOOLS는 스트림이 중간에 실패해 재시도될 수 있으므로 미리 실행하지 않음
+    """
+    started: Dict[str, asyncio.Future] = {}
+    
+    def on_tool_call(tool_call):
+        if not PARALLEL_TOOL_CALLS or tool_call.function.name in SIDE_EFFECT_TOOLS:
+            return
+        if tool_call.id not in started:
+            started[tool_call.id] = _submit_tool_call(tool_call)
+    
+    return on_tool_call, started
+
+
+async def execute_tool_calls(
+    tool_calls,
+    started: Optional[Dict[str, asyncio.Future]] = None,
+    metrics: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    assistant 메시지 하나의 tool_calls 실행
+    - 조회 Tool은 스레드 풀에서 병렬 실행, SIDE_EFFECT_TOOLS는 호출 순서대로 하나씩 실행
+    - started: 스트리밍 중 이미 시작된 Tool 실행 (같은 tool_call_id는 다시 실행하지 않음)
+    - metrics: 주어지면 Tool별 실행 시간을 tool_calls 순서대로 추가
+    - 결과는 항상 원래 tool_calls 순서(tool_call_id 순서)대로 반환
+    """
+    started = started or {}
+    
+    def run_in_pool(tool_call):
+        if tool_call.id in started:
+            return started[tool_call.id]
+        return _submit_tool_call(tool_call)
+    
+    timed: List[Optional[Tuple[Dict[str, Any], float]]] = [None] * len(tool_calls)
+    
+    if not PARALLEL_TOOL_CALLS or len(tool_calls) == 1:
+        for i, tool_call in enumerate(tool_calls):
+            timed[i] = await run_in_pool(tool_call)
+    else:
+        await _run_tool_calls_parallel(tool_calls, run_in_pool, timed)
+    
+    if metrics is not None:
+        for tool_call, (_, elapsed_ms) in zip(tool_calls, timed):
+            metrics.append({"name": tool_call.function.name, "elapsed_ms": elapsed_ms})
+    return [result for result, _ in timed]
+
+
+async def _run_tool_calls_parallel(tool_calls, run_in_pool: Callable, results: List):
+    """조회 Tool은 동시에, SIDE_EFFECT_TOOLS는 순서대로 실행해 results[i]에 채움"""
+    parallel_idx = [i for i, tc in enumerate(tool_calls) if tc.function.name not in SIDE_EFFECT_TOOLS]
+    serial_idx = [i for i, tc in enumerate(tool_calls) if tc.function.name in SIDE_EFFECT_TOOLS]
+    
+    async def run_serial():
+        for i in serial_idx:
+            results[i] = await run_in_pool(tool_calls[i])
+    
+    async def run_parallel(i):
+        results[i] = await run_in_pool(tool_calls[i])
+    
+    await asyncio.gather(run_serial(), *(run_parallel(i) for i in parallel_idx))
+
+
+# ============================================================================
+# Multi-turn 대화 컨텍스트 압축
+# ============================================================================
+
+# 요청 messages의 토큰 예산 (main에서 --context-budget으로 설정, 0이면 압축 안 함)
+CONTEXT_TOKEN_BUDGET = 0
+# 이전 턴의 tool 결과를 요약할 때 남길 최대 글자 수
+COMPACT_TOOL_RESULT_CHARS = 300
+
+THINK_PATTERN = re.compile(r"<think>.*?</think>\s*", re.DOTALL)
+
+compaction_stats = {"compactions": 0, "dropped_turns": 0, "tokens_saved": 0}
+
+
+def _summarize_tool_content(content: str, max_chars: int) -> str:
+    """이전 턴의 tool 결과 요약: JSON이면 짧은 최상위 필드만 남기고, 아니면 앞부분만 남김"""
+    if len(content) <= max_chars:
+        return content
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict):
+        summary = {}
+        for key, value in data.items():
+            dumped = json.dumps(value, ensure_ascii=False)
+            summary[key] = value if len(dumped) <= 80 else "...(생략)"
+        content = json.dumps(summary, ensure_ascii=False)
+        if len(content) <= max_chars:
+            return content
+    return content[:max_chars] + "...(생략)"
+
+
+def _compact_history_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """이전 턴 메시지 1개 압축: assistant의 추론 텍스트 제거, tool 결과 요약"""
+    role = message.get("role")
+    if role == "assistant":
+        compacted = dict(message)
+        if compacted.get("tool_calls"):
+            # tool_calls를 만든 assistant의 content는 대부분 추론 과정 → 제거
+            compacted["content"] = None
+        elif compacted.get("content"):
+            compacted["content"] = THINK_PATTERN.sub("", compacted["content"])
+        return compacted
+    if role == "tool":
+        return {**message, "content": _summarize_tool_content(message.get("content") or "", COMPACT_TOOL_RESULT_CHARS)}
+    return message
+
+
+def compact_messages(messages: List[Any], token_budget: int) -> List[Any]:
+    """
+    요청 messages를 토큰 예산 안으로 압축한 사본 반환 (원본 messages는 그대로)
+    - 항상 유지: system 프롬프트, 마지막 user 질의와 그 이후(현재 턴의 tool_call/tool 결과 쌍)
+    - 1단계: 이전 턴의 추론 텍스트 제거 + tool 결과 요약
+    - 2단계: 그래도 초과하면 가장 오래된 턴(user 메시지 단위)부터 통째로 제거 → tool_call 쌍이 깨지지 않음
+    """
+    if token_budget <= 0:
+        return messages
+    original_tokens = estimate_tokens(messages)
+    if original_tokens <= token_budget:
+        return messages
+    
+    last_user_idx = max((i for i, m in enumerate(messages) if _role_of(m) == "user"), default=None)
+    if last_user_idx is None:
+        return messages
+    
+    head = [m for m in messages[:1] if _role_of(m) == "system"]
+    history = [_to_message_dict(m) for m in messages[len(head):last_user_idx]]
+    current = messages[last_user_idx:]
+    
+    # 이전 턴을 user 메시지 기준으로 묶음
+    turns: List[List[Dict[str, Any]]] = []
+    for message in history:
+        if message.get("role") == "user" or not turns:
+            turns.append([])
+        turns[-1].append(_compact_history_message(message))
+    
+    fixed_tokens = estimate_tokens(head + current)
+    turn_tokens = [estimate_tokens(turn) for turn in turns]
+    dropped = 0
+    while turns and fixed_tokens + sum(turn_tokens) > token_budget:
+        turns.pop(0)
+        turn_tokens.pop(0)
+        dropped += 1
+    
+    compacted = head + [m for turn in turns for m in turn] + current
+    compaction_stats["compactions"] += 1
+    compaction_stats["dropped_turns"] += dropped
+    compaction_stats["tokens_saved"] += max(0, original_tokens - estimate_tokens(compacted))
+    return compacted
+
+
+def _role_of(message: Any) -> Optional[str]:
+    return message.get("role") if isinstance(message, dict) else getattr(message, "role", None)
+
+
+def _to_message_dict(message: Any) -> Dict[str, Any]:
+    return message if isinstance(message, dict) else message.model_dump(exclude_none=True)
+
+
 # ============================================================================
 # 시나리오 실행 함수들
 # ============================================================================
 
-def run_single_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str, Any]:
+# 비용 추정 단가 (1M 토큰당 USD, main에서 --price-input / --price-output으로 설정)
+PRICE_PER_1M_TOKENS = dict(DEFAULT_PRICE_PER_1M_TOKENS)
+
+
+def _llm_call_metrics(iteration: int, response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    턴 메타데이터에 기록할 LLM 호출 1회의 지표
+    - TTFT/첫 tool_call 시간은 스트리밍 모드에서만 측정
+    - 캐시 히트는 토큰은 원래 응답 기준으로 기록하되 비용은 0
+    """
+    timings = response.get("timings") or {}
+    usage = response.get("usage")
+    cached = response.get("cached", False)
+    return {
+        "iteration": iteration,
+        "success": response["success"],
+        "cached": cached,
+        "retries": response.get("retries", 0),
+        "prompt_tokens": usage["prompt_tokens"] if usage else 0,
+        "completion_tokens": usage["completion_tokens"] if usage else 0,
+        "cost_usd": 0.0 if cached else round(estimate_cost(usage, PRICE_PER_1M_TOKENS), 8),
+        "elapsed_ms": response.get("elapsed_ms"),
+        "ttft_ms": timings.get("ttft_ms"),
+        "ttfc_ms": timings.get("ttfc_ms")
+    }
+
+
+async def run_single_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str, Any]:
     """Single-turn 시나리오 실행 (수정 버전)"""
     
     scenario_id = scenario["id"]
@@ -365,37 +921,46 @@ def run_single_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str
     
     conversation_log = [{"role": "user", "content": user_query}]
     tool_calls_log = [] # 평가용 툴 호출 로그
+    turn_metrics = {"turn": 1, "llm_calls": [], "tool_calls": []}
+    started = time.perf_counter()
     
     iteration = 0
     max_iterations = 5 # 최대 툴 호출 횟수
     
-    while iteration < max_iterations:
-        iteration += 1
-        
-        response = call_solar_api(messages, tools_spec)
-        if not response["success"]:
-            return {"error": "API 호출 실패", "details": response["error"]}
-        
-        assistant_message = response["message"]
-        conversation_log.append(assistant_message.model_dump()) # 전체 저장
-        
-        if hasattr(assistant_message, 'tool_calls') and assistant_message.tool_calls:
-            messages.append(assistant_message)
+    with tracing.span("turn 1", "turn", turn=1):
+        while iteration < max_iterations:
+            iteration += 1
             
-            for tool_call in assistant_message.tool_calls:
-                tool_result = execute_tool_call(tool_call)
-                messages.append(tool_result)
-                conversation_log.append(tool_result)
-                # 평가 스크립트가 인식하는 형식으로 tool_calls_log에 저장
-                tool_calls_log.append({
-                    "name": tool_result["name"],
-                    "arguments": json.loads(tool_call.function.arguments) # 파싱된 딕셔너리
-                })
-        else:
-            final_answer = assistant_message.content
-            print(f"  💬 답변 완료")
-            print(f"  📊 Tool 호출: {len(tool_calls_log)}회\n")
-            break
+            on_tool_call, started_tools = early_tool_starter()
+            with tracing.span("call_solar_api", "llm", iteration=iteration) as llm_span:
+                response = await call_solar_api(messages, tools_spec, on_tool_call)
+                turn_metrics["llm_calls"].append(_llm_call_metrics(iteration, response))
+                llm_span.set(**turn_metrics["llm_calls"][-1])
+            if not response["success"]:
+                return {"id": scenario_id, "error": "API 호출 실패", "details": response["error"]}
+            
+            assistant_message = response["message"]
+            conversation_log.append(assistant_message.model_dump()) # 전체 저장
+            
+            if hasattr(assistant_message, 'tool_calls') and assistant_message.tool_calls:
+                messages.append(assistant_message)
+                
+                with tracing.span("execute_tool_calls", "tool", num_tool_calls=len(assistant_message.tool_calls)):
+                    tool_results = await execute_tool_calls(assistant_message.tool_calls, started_tools, turn_metrics["tool_calls"])
+                for tool_call, tool_result in zip(assistant_message.tool_calls, tool_results):
+                    messages.append(tool_result)
+                    conversation_log.append(tool_result)
+                    # 평가 스크립트가 인식하는 형식으로 tool_calls_log에 저장
+                    tool_calls_log.append({
+                        "name": tool_result["name"],
+                        "arguments": logged_arguments(tool_call.function.arguments)
+                    })
+            else:
+                final_answer = assistant_message.content
+                print(f"  [{scenario_id}] 💬 답변 완료")
+                print(f"  [{scenario_id}] 📊 Tool 호출: {len(tool_calls_log)}회\n")
+                break
+    turn_metrics["elapsed_ms"] = _elapsed_ms(started)
     
     return {
         "id": scenario_id,
@@ -406,13 +971,15 @@ def run_single_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str
             "scenario_type": "single-turn",
             "num_tools_called": len(tool_calls_log),  # ✅ 누락된 필드 추가
             "tools_used": list(set([t["name"] for t in tool_calls_log])),
+            "turns": [turn_metrics],
+            "elapsed_ms": _elapsed_ms(started),
             **scenario
         }
     }
 
 
-def run_multi_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str, Any]:
-    """Multi-turn 시나리오 실행"""
+async def run_multi_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str, Any]:
+    """Multi-turn 시나리오 실행 (턴 순서는 항상 순차적으로 유지)"""
     
     scenario_id = scenario["id"]
     initial_query = scenario["initial_query"]
@@ -439,50 +1006,64 @@ def run_multi_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str,
     
     all_conversation = []
     all_tool_calls = [] # 평가용 전체 툴 호출 로그
+    all_turn_metrics = []
+    started = time.perf_counter()
     turn_count = 0
     
     queries = [initial_query] + follow_ups
     
     for query_idx, query in enumerate(queries):
         turn_count += 1
-        print(f"  [Turn {turn_count}] {query}")
+        print(f"  [{scenario_id}][Turn {turn_count}] {query}")
         
         user_message = {"role": "user", "content": query}
         messages.append(user_message)
         all_conversation.append(user_message)
         
+        turn_metrics = {"turn": turn_count, "llm_calls": [], "tool_calls": []}
+        all_turn_metrics.append(turn_metrics)
+        turn_started = time.perf_counter()
+        
         max_iterations = 3 # 툴 호출은 턴당 최대 3번 (재호출 등)
         iteration = 0
         
-        while iteration < max_iterations:
-            iteration += 1
-            
-            response = call_solar_api(messages, tools_spec)
-            if not response["success"]:
-                error_msg = {"role": "assistant", "content": f"API 호출 오류: {response['error']}"}
-                messages.append(error_msg)
-                all_conversation.append(error_msg)
-                break
-            
-            assistant_message = response["message"]
-            messages.append(assistant_message)
-            all_conversation.append(assistant_message.model_dump())
-            
-            if hasattr(assistant_message, 'tool_calls') and assistant_message.tool_calls:
-                for tool_call in assistant_message.tool_calls:
-                    tool_result = execute_tool_call(tool_call)
-                    messages.append(tool_result)
-                    all_conversation.append(tool_result)
-                    # 평가 스크립트가 인식하는 형식으로 tool_calls_log에 저장
-                    all_tool_calls.append({
-                        "name": tool_result["name"],
-                        "arguments": json.loads(tool_call.function.arguments) # 파싱된 딕셔너리
-                    })
-            else:
-                print(f"    💬 답변 완료\n")
-                break # 툴 호출 없으면 턴 종료
+        with tracing.span(f"turn {turn_count}", "turn", turn=turn_count):
+            while iteration < max_iterations:
+                iteration += 1
+                
+                on_tool_call, started_tools = early_tool_starter()
+                request_messages = compact_messages(messages, CONTEXT_TOKEN_BUDGET)
+                with tracing.span("call_solar_api", "llm", iteration=iteration) as llm_span:
+                    response = await call_solar_api(request_messages, tools_spec, on_tool_call)
+                    turn_metrics["llm_calls"].append(_llm_call_metrics(iteration, response))
+                    llm_span.set(**turn_metrics["llm_calls"][-1])
+                if not response["success"]:
+                    error_msg = {"role": "assistant", "content": f"API 호출 오류: {response['error']}"}
+                    messages.append(error_msg)
+                    all_conversation.append(error_msg)
+                    break
+                
+                assistant_message = response["message"]
+                messages.append(assistant_message)
+                all_conversation.append(assistant_message.model_dump())
+                
+                if hasattr(assistant_message, 'tool_calls') and assistant_message.tool_calls:
+                    with tracing.span("execute_tool_calls", "tool", num_tool_calls=len(assistant_message.tool_calls)):
+                        tool_results = await execute_tool_calls(assistant_message.tool_calls, started_tools, turn_metrics["tool_calls"])
+                    for tool_call, tool_result in zip(assistant_message.tool_calls, tool_results):
+                        messages.append(tool_result)
+                        all_conversation.append(tool_result)
+                        # 평가 스크립트가 인식하는 형식으로 tool_calls_log에 저장
+                        all_tool_calls.append({
+                            "name": tool_result["name"],
+                            "arguments": logged_arguments(tool_call.function.arguments)
+                        })
+                else:
+                    print(f"    [{scenario_id}] 💬 답변 완료\n")
+                    break # 툴 호출 없으면 턴 종료
+        turn_metrics["elapsed_ms"] = _elapsed_ms(turn_started) # 턴 전체 (LLM 호출 + Tool 실행)
     
-    print(f"  📊 총 Tool 호출: {len(all_tool_calls)}회")
+    print(f"  [{scenario_id}] 📊 총 Tool 호출: {len(all_tool_calls)}회")
     
     return {
         "id": scenario_id,
@@ -494,6 +1075,8 @@ def run_multi_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str,
             "num_turns": turn_count,
             "tools_used": list(set([t["name"] for t in all_tool_calls])),
             "num_tools_called": len(all_tool_calls),
+            "turns": all_turn_metrics,
+            "elapsed_ms": _elapsed_ms(started),
             **scenario
         }
     }
@@ -503,12 +1086,218 @@ def run_multi_turn_scenario(scenario: Dict, tools_spec: List[Dict]) -> Dict[str,
 # 메인 - O조 시나리오 4개 실행
 # ============================================================================
 
-def main():
+async def iter_scenario_results(
+    jobs: List[Tuple[Callable, Dict]],
+    tools_spec: List[Dict],
+    concurrency: int = 1
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    (실행 함수, 시나리오) 목록을 최대 concurrency개까지 동시에 실행하고 결과를 입력 순서대로 하나씩 반환
+    - 완료된 결과는 바로 yield되어 호출 측에서 즉시 저장 가능 (전체 결과를 메모리에 쌓지 않음)
+    - 앞 시나리오가 늦어져도 메모리가 무한히 늘지 않도록 concurrency의 4배까지만 미리 시작
+    - 시나리오 하나에서 예외가 나도 전체 실행은 계속되고 해당 결과에 error가 기록됨
+    """
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    window = concurrency * 4
+    pending: deque = deque()
+    job_iter = iter(jobs)
+    
+    async def run_one(runner, scenario: Dict) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                with tracing.scenario_track(scenario["id"]):
+                    return await runner(scenario, tools_spec)
+            except Exception as e:
+                return {"id": scenario["id"], "error": "시나리오 실행 예외", "details": repr(e)}
+    
+    def fill():
+        while len(pending) < window:
+            job = next(job_iter, None)
+            if job is None:
+                return
+            pending.append(asyncio.create_task(run_one(*job)))
+    
+    fill()
+    try:
+        while pending:
+            result = await pending.popleft()
+            fill()
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def build_jobs(single_scenarios: List[Dict], multi_scenarios: List[Dict]) -> List[Tuple[Callable, Dict]]:
+    """실행 순서(Single → Multi)대로 (실행 함수, 시나리오) 목록 생성"""
+    jobs = [(run_single_turn_scenario, s) for s in single_scenarios]
+    jobs += [(run_multi_turn_scenario, s) for s in multi_scenarios]
+    return jobs
+
+
+async def run_all_scenarios(
+    single_scenarios: List[Dict],
+    multi_scenarios: List[Dict],
+    tools_spec: List[Dict],
+    concurrency: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Single/Multi 시나리오를 최대 concurrency개까지 동시에 실행
+    - Multi-turn 시나리오 내부의 턴은 순차적으로 실행됨
+    - 결과는 입력 순서(Single → Multi)대로 반환되어 출력 순서가 항상 동일함
+    - API 속도 제한은 공유 rate_limiter가 담당
+    """
     print("\n" + "="*80)
-    print("O조 - 스마트스토어 시나리오 4개 실행")
+    print(f"SINGLE {len(single_scenarios)}개 + MULTI {len(multi_scenarios)}개 실행 (동시 실행: {concurrency})")
     print("="*80)
     
-    # 시나리오 JSON 파일 로드
+    jobs = build_jobs(single_scenarios, multi_scenarios)
+    return [result async for result in iter_scenario_results(jobs, tools_spec, concurrency)]
+
+
+def _scan_jsonl_ids(path: str) -> Iterator[Tuple[Optional[str], int, int]]:
+    """
+    결과 .jsonl의 완전한 줄마다 (id, 시작 offset, 길이) 반환 (빈 줄/파싱 불가 줄은 id=None)
+    - 저장 형식상 id가 항상 맨 앞이므로 전체 JSON을 파싱하지 않고 id만 읽음
+    - 줄바꿈 없이 끝난 마지막 줄(쓰는 도중 중단)은 반환하지 않음
+    """
+    id_prefix = '{"id": "'
+    with open(path, "rb") as f:
+        offset = 0
+        for raw_line in f:
+            if not raw_line.endswith(b"\n"):
+                break # 불완전한 마지막 줄
+            line = raw_line.decode("utf-8").strip()
+            scenario_id = None
+            if line:
+                try:
+                    if line.startswith(id_prefix):
+                        scenario_id, _ = json.decoder.scanstring(line, len(id_prefix))
+                    else:
+                        scenario_id = json.loads(line)["id"]
+                except (ValueError, KeyError):
+                    scenario_id = None
+            yield scenario_id, offset, len(raw_line)
+            offset += len(raw_line)
+
+
+def load_completed_ids(output_file: str) -> Set[str]:
+    """
+    --resume용: 기존 출력 파일에서 이미 완료된 시나리오 id 수집
+    - 쓰는 도중 중단되어 줄바꿈 없이 끝난 마지막 줄은 잘라냄 (이후 append가 깨지지 않도록)
+    """
+    completed: Set[str] = set()
+    if not os.path.exists(output_file):
+        return completed
+    
+    valid_end = 0
+    for scenario_id, offset, length in _scan_jsonl_ids(output_file):
+        if scenario_id is not None:
+            completed.add(scenario_id)
+        valid_end = offset + length
+    
+    if valid_end < os.path.getsize(output_file):
+        print(f"⚠️  {output_file}의 불완전한 마지막 줄을 잘라냅니다. (이어서 실행)")
+        with open(output_file, "r+b") as f:
+            f.truncate(valid_end)
+    return completed
+
+
+# ============================================================================
+# 샤딩 (여러 프로세스/머신 분산 실행) 및 병합
+# ============================================================================
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'--shard i/N' 파싱 (0 <= i < N)"""
+    try:
+        index, total = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"--shard는 'i/N' 형식이어야 합니다: {value}")
+    if total < 1 or not 0 <= index < total:
+        raise argparse.ArgumentTypeError(f"--shard 범위 오류 (0 <= i < N): {value}")
+    return index, total
+
+
+def parse_shard_count(value: str) -> int:
+    """'--merge N' 파싱 (N >= 1)"""
+    try:
+        total = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"--merge는 정수여야 합니다: {value}")
+    if total < 1:
+        raise argparse.ArgumentTypeError(f"--merge 샤드 수는 1 이상이어야 합니다: {value}")
+    return total
+
+
+def shard_of(scenario_id: str, num_shards: int) -> int:
+    """시나리오 id의 해시로 샤드 결정 (프로세스/머신이 달라도 항상 같은 결과)"""
+    digest = hashlib.sha1(scenario_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards
+
+
+def shard_part_path(output_file: str, shard: int, num_shards: int) -> str:
+    """샤드별 결과 파일 경로. 예: data/smartstore_final.part-001-of-004.jsonl"""
+    root, ext = os.path.splitext(output_file)
+    return f"{root}.part-{shard:03d}-of-{num_shards:03d}{ext}"
+
+
+def merge_shards(output_file: str, num_shards: int, expected_ids: Set[str]) -> bool:
+    """
+    샤드 결과 파일들을 하나의 .jsonl로 병합 (id 순 정렬)
+    - 누락/중복/잘못된 샤드에 들어간 시나리오가 있으면 병합하지 않고 False 반환
+    - 각 줄의 (파일, offset)만 메모리에 두고 정렬 후 순서대로 복사 (줄 내용은 메모리에 쌓지 않음)
+    """
+    index: Dict[str, Tuple[int, int, int]] = {}
+    errors = []
+    
+    for shard in range(num_shards):
+        part_path = shard_part_path(output_file, shard, num_shards)
+        if not os.path.exists(part_path):
+            errors.append(f"샤드 파일 없음: {part_path}")
+            continue
+        for scenario_id, offset, length in _scan_jsonl_ids(part_path):
+            if scenario_id is None:
+                continue
+            if scenario_id in index:
+                errors.append(f"중복 id: {scenario_id} (샤드 {index[scenario_id][0]}, {shard})")
+                continue
+            if shard_of(scenario_id, num_shards) != shard:
+                errors.append(f"잘못된 샤드: {scenario_id} (샤드 {shard}, 기대 {shard_of(scenario_id, num_shards)})")
+            index[scenario_id] = (shard, offset, length)
+    
+    missing = sorted(expected_ids - index.keys())
+    unexpected = sorted(index.keys() - expected_ids)
+    if missing:
+        errors.append(f"누락된 시나리오 {len(missing)}개: {missing[:5]}{' ...' if len(missing) > 5 else ''}")
+    if unexpected:
+        errors.append(f"정의되지 않은 시나리오 {len(unexpected)}개: {unexpected[:5]}{' ...' if len(unexpected) > 5 else ''}")
+    
+    if errors:
+        print(f"❌ 병합 검증 실패 ({len(errors)}건)")
+        for error in errors[:20]:
+            print(f"  - {error}")
+        return False
+    
+    part_files = [open(shard_part_path(output_file, shard, num_shards), "rb") for shard in range(num_shards)]
+    tmp_file = output_file + ".tmp"
+    try:
+        with open(tmp_file, "wb") as out:
+            for scenario_id in sorted(index):
+                shard, offset, length = index[scenario_id]
+                part_files[shard].seek(offset)
+                out.write(part_files[shard].read(length))
+    finally:
+        for part in part_files:
+            part.close()
+    os.replace(tmp_file, output_file) # 병합이 끝난 뒤에만 원본 교체
+    
+    print(f"✅ {num_shards}개 샤드 병합 완료: {len(index)}개 시나리오 → {output_file}")
+    return True
+
+
+def load_scenario_definitions() -> Optional[Tuple[List[Dict], List[Dict]]]:
+    """시나리오 JSON 파일 로드 → (single, multi). 파일이 없으면 None"""
     try:
         with open("scenarios_single_smartstore.json", "r", encoding="utf-8") as f:
             single_data = json.load(f)
@@ -517,50 +1306,124 @@ def main():
             multi_data = json.load(f)
     except FileNotFoundError:
         print("❌ 시나리오 정의 파일(scenarios_single_smartstore.json 또는 scenarios_multi_smartstore.json)을 찾을 수 없습니다.")
-        return
+        return None
+    return single_data["scenarios"], multi_data["scenarios"]
+
 
-    single_scenarios = single_data["scenarios"]
-    multi_scenarios = multi_data["scenarios"]
+async def main_async(args: argparse.Namespace):
+    global client, rate_limiter, llm_cache, tool_cache, tool_backend, alert_dispatcher, publish_queue, product_catalog, trend_engine, keyword_index, PARALLEL_TOOL_CALLS, STREAM_COMPLETIONS, CONTEXT_TOKEN_BUDGET, PRICE_PER_1M_TOKENS
+    if args.base_url:
+        client = create_client(base_url=args.base_url)
+    PRICE_PER_1M_TOKENS = {"prompt": args.price_input, "completion": args.price_output}
+    if args.trace:
+        tracing.start()
+    tool_cache = ToolResultCache(max_entries=args.tool_cache_size) if args.tool_cache_size > 0 else None
+    if args.catalog:
+        product_catalog = CatalogStore(args.catalog)
+        print(f"📦 상품 카탈로그: {args.catalog} ({product_catalog.count():,}개 상품)")
+    if args.trend_data:
+        trend_engine = load_trend_file(args.trend_data)
+        print(f"📈 트렌드 데이터: {args.trend_data} ({len(trend_engine.categories)}개 카테고리)")
+    if args.catalog or args.trend_data:
+        keyword_index = build_keyword_index()
+        print(f"🔤 대체 키워드 색인: {len(keyword_index):,}개 키워드")
+    tool_backend = create_backend(args.tool_backend, catalog=product_catalog, config=load_backend_config(args.backend_config))
+    if tool_backend.name != "mock":
+        print(f"🌐 Tool 백엔드: {tool_backend.name} ({', '.join(f'{k}={v}' for k, v in tool_backend.endpoints.items())})")
+    alert_dispatcher = AlertDispatcher(
+        sender=KakaoHttpSender(args.alert_endpoint, token=os.getenv("KAKAO_ACCESS_TOKEN")) if args.alert_endpoint else tool_backend.alert_sender(),
+        coalesce_seconds=args.alert_coalesce_seconds,
+        dedupe_seconds=args.alert_dedupe_seconds
+    )
+    publish_queue = PublishQueue(max_workers=args.publish_workers)
+    PARALLEL_TOOL_CALLS = not args.no_parallel_tools
+    STREAM_COMPLETIONS = args.stream
+    CONTEXT_TOKEN_BUDGET = args.context_budget
+    if args.cache != "off":
+        llm_cache = LLMResponseCache(args.cache_path, max_bytes=int(args.cache_max_mb * 1024 * 1024), mode=args.cache)
+    rate_limiter = RateLimiter(
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_retries=args.max_retries,
+        timeout=args.timeout
+    )
+    
+    print("\n" + "="*80)
+    print("O조 - 스마트스토어 시나리오 4개 실행")
+    print("="*80)
+    
+    # 시나리오 JSON 파일 로드
+    definitions = load_scenario_definitions()
+    if definitions is None:
+        return
+    single_scenarios, multi_scenarios = definitions
     
     print(f"\n✅ 시나리오 로드")
     print(f"   - Single: {len(single_scenarios)}개")
     print(f"   - Multi: {len(multi_scenarios)}개")
     
-    all_results = []
+    output_file = args.output
+    if args.shard:
+        shard, num_shards = args.shard
+        single_scenarios = [s for s in single_scenarios if shard_of(s["id"], num_shards) == shard]
+        multi_scenarios = [s for s in multi_scenarios if shard_of(s["id"], num_shards) == shard]
+        output_file = shard_part_path(args.output, shard, num_shards)
+        print(f"   - 샤드 {shard}/{num_shards}: {len(single_scenarios) + len(multi_scenarios)}개 실행 → {output_file}")
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
     
-    # Single-turn
-    print("\n" + "="*80)
-    print("SINGLE-TURN 실행")
-    print("="*80)
-    
-    for scenario in single_scenarios:
-        result = run_single_turn_scenario(scenario, tools)
-        all_results.append(result)
-        time.sleep(1) # API 속도 제한
+    # --resume: 이미 저장된 시나리오는 건너뜀 (유료 LLM 호출 반복 방지)
+    completed_ids = load_completed_ids(output_file) if args.resume else set()
+    if completed_ids:
+        single_scenarios = [s for s in single_scenarios if s["id"] not in completed_ids]
+        multi_scenarios = [s for s in multi_scenarios if s["id"] not in completed_ids]
+        print(f"   - 이어서 실행: 완료된 {len(completed_ids)}개 건너뜀 → 남은 {len(single_scenarios) + len(multi_scenarios)}개")
     
-    # Multi-turn
     print("\n" + "="*80)
-    print("MULTI-TURN 실행")
+    print(f"SINGLE {len(single_scenarios)}개 + MULTI {len(multi_scenarios)}개 실행 (동시 실행: {args.concurrency})")
     print("="*80)
     
-    for scenario in multi_scenarios:
-        result = run_multi_turn_scenario(scenario, tools)
-        all_results.append(result)
-        time.sleep(1) # API 속도 제한
+    # 통계 (결과를 메모리에 모으지 않고 누적)
+    single_count = 0
+    multi_count = 0
+    total_tools_called = 0
+    failed_ids = []
+    run_metrics = RunMetrics()
     
-    # 저장
-    output_file = "data/smartstore_final.jsonl"
-    with open(output_file, "w", encoding="utf-8") as f:
-        for result in all_results:
+    # 저장: 시나리오가 끝나는 대로 한 줄씩 append + flush
+    jobs = build_jobs(single_scenarios, multi_scenarios)
+    await alert_dispatcher.start()
+    with open(output_file, "a" if args.resume else "w", encoding="utf-8") as f:
+        async for result in iter_scenario_results(jobs, tools, args.concurrency):
+            if "error" in result:
+                # 실패한 시나리오는 저장하지 않음 → --resume 시 다시 실행됨
+                failed_ids.append(result["id"])
+                print(f"  ❌ [{result['id']}] {result['error']}: {result.get('details', '')}")
+                continue
+            
             # evaluate_final.py는 'id'와 'tool_calls'를 최상위에 기대합니다.
-            eval_entry = {
-                "id": result["id"],
-                "query": result["query"],
-                "conversation": result["conversation"],
-                "tool_calls": result["tool_calls"], # 
-                "metadata": result["metadata"]
-            }
-            f.write(json.dumps(eval_entry, ensure_ascii=False) + "\n")
+            with tracing.span("write_jsonl", "io", scenario=result["id"]):
+                eval_entry = {
+                    "id": result["id"],
+                    "query": result["query"],
+                    "conversation": result["conversation"],
+                    "tool_calls": result["tool_calls"], # 
+                    "metadata": result["metadata"]
+                }
+                f.write(json.dumps(eval_entry, ensure_ascii=False) + "\n")
+                f.flush()
+            
+            if result["metadata"]["scenario_type"] == "single-turn":
+                single_count += 1
+            else:
+                multi_count += 1
+            total_tools_called += result["metadata"]["num_tools_called"]
+            run_metrics.add(result["metadata"])
+    # 모으는 중인 알림까지 모두 발송한 뒤 종료
+    await alert_dispatcher.close()
+    # 남은 발행 작업이 끝날 때까지 대기
+    await asyncio.to_thread(publish_queue.close)
+    backend_stats = tool_backend.summary()
+    tool_backend.close()
     
     print("\n" + "="*80)
     print("✅ 완료!")
@@ -568,10 +1431,8 @@ def main():
     print(f"\n📁 결과: {output_file}")
     
     # 통계
-    single_count = sum(1 for r in all_results if r["metadata"]["scenario_type"] == "single-turn")
-    multi_count = sum(1 for r in all_results if r["metadata"]["scenario_type"] == "multi-turn")
-    total_tools_called = sum(r["metadata"]["num_tools_called"] for r in all_results)
-    avg_tools = total_tools_called / len(all_results) if len(all_results) > 0 else 0
+    num_saved = single_count + multi_count
+    avg_tools = total_tools_called / num_saved if num_saved > 0 else 0
     
     print(f"\n📊 통계:")
     print(f"  - Single 시나리오: {single_count}개")
@@ -579,9 +1440,127 @@ def main():
     print(f"  - 평균 Tool 호출: {avg_tools:.1f}회")
     print(f"  - 총 Tool 호출: {total_tools_called}회")
     print(f"  - 총 Tool: {len(tools)}개 (O조 최적화)")
+    if failed_ids:
+        print(f"  - 실패(미저장) 시나리오: {len(failed_ids)}개 → --resume으로 다시 실행하세요")
+    
+    limiter_stats = rate_limiter.summary()
+    print(f"\n⏱️  API 호출 통계:")
+    print(f"  - 요청: {limiter_stats['requests']}회 / 재시도: {limiter_stats['retries']}회 (429: {limiter_stats['rate_limited']}회)")
+    print(f"  - 속도 제한 대기: {limiter_stats['throttle_waits']}회 ({limiter_stats['throttle_wait_seconds']}초)")
+    print(f"  - 최종 실패: {limiter_stats['failures']}회")
+    
+    metrics = run_metrics.summary()
+    llm_latency = metrics["llm_latency_ms"]
+    tool_latency = metrics["tool_latency_ms"]
+    scenario_latency = metrics["scenario_latency_ms"]
+    print(f"\n💰 토큰 / 비용 / 지연 시간 (저장된 시나리오 기준):")
+    print(f"  - LLM 호출: {metrics['llm_calls']}회 (캐시 {metrics['cached_calls']}회, 실패 {metrics['failed_calls']}회, 재시도 {metrics['retries']}회)")
+    print(f"  - 토큰: 입력 {metrics['prompt_tokens']:,} / 출력 {metrics['completion_tokens']:,}")
+    print(f"  - 추정 비용: ${metrics['cost_usd']:.4f} (1M 토큰당 입력 ${PRICE_PER_1M_TOKENS['prompt']} / 출력 ${PRICE_PER_1M_TOKENS['completion']})")
+    print(f"  - LLM 호출 지연(ms): p50 {llm_latency['p50']} / p95 {llm_latency['p95']} / p99 {llm_latency['p99']}")
+    print(f"  - Tool 실행 지연(ms): p50 {tool_latency['p50']} / p95 {tool_latency['p95']} / p99 {tool_latency['p99']} ({tool_latency['count']}회)")
+    print(f"  - 시나리오 지연(ms): p50 {scenario_latency['p50']} / p95 {scenario_latency['p95']} / p99 {scenario_latency['p99']}")
+    if args.metrics_output:
+        os.makedirs(os.path.dirname(args.metrics_output) or ".", exist_ok=True)
+        with open(args.metrics_output, "w", encoding="utf-8") as f:
+            json.dump({"price_per_1m_tokens": PRICE_PER_1M_TOKENS, **metrics}, f, ensure_ascii=False, indent=2)
+        print(f"  - 집계 저장: {args.metrics_output}")
+    
+    if args.trace:
+        num_events = tracing.save(args.trace)
+        print(f"\n🔍 Trace: {args.trace} ({num_events}개 구간, https://ui.perfetto.dev 에서 열기)")
+    
+    if compaction_stats["compactions"]:
+        print(f"\n🗜️  컨텍스트 압축 (예산 {CONTEXT_TOKEN_BUDGET} 토큰):")
+        print(f"  - 압축: {compaction_stats['compactions']}회 / 제거된 이전 턴: {compaction_stats['dropped_turns']}개")
+        print(f"  - 절약한 토큰(추정): {compaction_stats['tokens_saved']}")
+    
+    if backend_stats:
+        print(f"\n🌐 업스트림 HTTP 연결 풀 ({tool_backend.name} 백엔드):")
+        for host, stats in backend_stats.items():
+            print(f"  - {host}: 요청 {stats['requests']}회 / 새 연결 {stats['connections_opened']}개 / 재사용 {stats['reused']}회")
+    
+    publish_stats = publish_queue.summary()
+    if publish_stats["submitted"]:
+        print(f"\n📝 블로그/카페 발행 작업:")
+        print(f"  - 등록: {publish_stats['submitted']}건 / 중복 제출(멱등성 키): {publish_stats['deduplicated']}건")
+        print(f"  - 성공: {publish_stats['succeeded']}건 / 실패: {publish_stats['failed']}건 (재시도 {publish_stats['retries']}회)")
+    
+    alert_stats = alert_dispatcher.summary()
+    if alert_stats["submitted"]:
+        print(f"\n📨 판매자 알림 발송 ({args.alert_endpoint or 'Mock'}):")
+        print(f"  - 접수: {alert_stats['submitted']}건 / 중복 제외: {alert_stats['deduplicated']}건")
+        print(f"  - 발송 요청: {alert_stats['deliveries']}회 ({alert_stats['delivered_alerts']}건, 재시도 {alert_stats['retries']}회)")
+        if alert_stats["failed_alerts"]:
+            print(f"  - 발송 실패: {alert_stats['failed_alerts']}건")
+    
+    if tool_cache is not None:
+        tool_cache_stats = tool_cache.summary()
+        print(f"\n🧠 조회 Tool 결과 캐시:")
+        print(f"  - 히트: {tool_cache_stats['hits']}회 / 미스: {tool_cache_stats['misses']}회 (히트율 {tool_cache_stats['hit_rate']*100:.1f}%)")
+        for name, stats in tool_cache_stats["tools"].items():
+            print(f"  - {name}: 히트 {stats['hits']} / 미스 {stats['misses']} (만료 {stats['expired']})")
+    
+    if llm_cache is not None:
+        cache_stats = llm_cache.summary()
+        print(f"\n💾 LLM 캐시 ({cache_stats['mode']}):")
+        print(f"  - 히트: {cache_stats['hits']}회 / 미스: {cache_stats['misses']}회 (히트율 {cache_stats['hit_rate']*100:.1f}%)")
+        print(f"  - 저장: {cache_stats['writes']}건 / LRU 삭제: {cache_stats['evictions']}건")
+        print(f"  - 크기: {cache_stats['entries']}건, {cache_stats['size_mb']}MB")
+        llm_cache.close()
     
     print(f"\n🚀 다음 단계:")
-    print(f"  1. 터미널에서 'python evaluate_smartstore.py --input {output_file}'을 실행하여 평가하세요.")
+    if args.shard:
+        print(f"  1. 모든 샤드가 끝나면 'python run_scenarios.py --merge {args.shard[1]} --output {args.output}'로 병합하세요.")
+    else:
+        print(f"  1. 터미널에서 'python evaluate_smartstore.py --input {output_file}'을 실행하여 평가하세요.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="O조 (스마트스토어) 시나리오 실행 스크립트")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 실행할 최대 시나리오 수 (기본: 1 = 순차 실행)")
+    parser.add_argument("--output", default="data/smartstore_final.jsonl", help="결과 .jsonl 파일")
+    parser.add_argument("--resume", action="store_true", help="기존 결과 파일에 이미 있는 시나리오 id는 건너뛰고 이어서 실행")
+    parser.add_argument("--shard", type=parse_shard, default=None, help="id 해시 기준 i번째 샤드만 실행 (형식: i/N, 0 <= i < N). 결과는 <output>.part-i-of-N.jsonl")
+    parser.add_argument("--merge", type=parse_shard_count, default=None, metavar="N", help="N개 샤드 결과 파일을 검증 후 --output으로 병합 (id 순 정렬)")
+    parser.add_argument("--base-url", default=None, help="OpenAI 호환 API 주소 (예: 로컬 stub_server.py의 http://127.0.0.1:8000/v1)")
+    parser.add_argument("--stream", action="store_true", help="stream=True로 응답을 받아 tool_call 인자가 완성되는 즉시 Tool 실행 (TTFT 측정)")
+    parser.add_argument("--context-budget", type=int, default=0, help="Multi-turn 요청 messages의 토큰 예산. 초과 시 이전 턴 압축 (0 = 압축 안 함)")
+    parser.add_argument("--catalog", default=os.getenv("SMARTSTORE_CATALOG"), help="analyze_product_strategy가 조회할 상품 카탈로그 SQLite 파일 (catalog_store.py load로 생성, 기본: Mock 데이터)")
+    parser.add_argument("--trend-data", default=None, help="get_top_shopping_trend가 사용할 카테고리별 키워드 일별 검색량 .jsonl (기본: Mock 데이터)")
+    parser.add_argument("--tool-cache-size", type=int, default=1024, help="조회 Tool 결과 캐시 최대 항목 수 (0 = 캐시 안 함)")
+    parser.add_argument("--tool-backend", choices=TOOL_BACKENDS, default="mock", help="Tool이 호출할 업스트림 백엔드 (mock: 내장 Mock 데이터, http: 서비스별 HTTP API)")
+    parser.add_argument("--backend-config", default=None, help="http 백엔드 설정 JSON (서비스별 endpoints, max_connections_per_host, timeout, headers / 기본: fake_services.py 기본 포트)")
+    parser.add_argument("--publish-workers", type=int, default=4, help="블로그/카페 발행 작업을 처리할 워커 스레드 수")
+    parser.add_argument("--alert-endpoint", default=os.getenv("KAKAO_ALERT_ENDPOINT"), help="alert_seller 알림을 POST할 카카오 메시지 API 주소 (토큰: KAKAO_ACCESS_TOKEN, 기본: Mock)")
+    parser.add_argument("--alert-coalesce-seconds", type=float, default=2.0, help="info/warning 알림을 모아 요약 1건으로 보내는 구간(초)")
+    parser.add_argument("--alert-dedupe-seconds", type=float, default=300.0, help="같은 알림을 다시 보내지 않는 구간(초)")
+    parser.add_argument("--no-parallel-tools", action="store_true", help="한 턴의 여러 tool_calls를 병렬 실행하지 않고 순차 실행")
+    parser.add_argument("--cache", choices=CACHE_MODES, default="off", help="LLM 응답 캐시 모드 (readwrite: 재사용+저장, replay: 캐시만 사용)")
+    parser.add_argument("--cache-path", default="outputs/llm_cache.sqlite", help="LLM 응답 캐시 파일 경로")
+    parser.add_argument("--cache-max-mb", type=float, default=512, help="LLM 응답 캐시 최대 크기(MB), 초과 시 LRU 삭제")
+    parser.add_argument("--rpm", type=float, default=100, help="분당 최대 API 요청 수 (0 = 제한 없음)")
+    parser.add_argument("--tpm", type=float, default=0, help="분당 최대 토큰 수 (0 = 제한 없음)")
+    parser.add_argument("--max-retries", type=int, default=5, help="일시적 오류(429/5xx/타임아웃) 재시도 횟수")
+    parser.add_argument("--timeout", type=float, default=60.0, help="API 호출 1건당 타임아웃(초)")
+    parser.add_argument("--price-input", type=float, default=DEFAULT_PRICE_PER_1M_TOKENS["prompt"], help="비용 추정용 입력 토큰 단가 (1M 토큰당 USD)")
+    parser.add_argument("--price-output", type=float, default=DEFAULT_PRICE_PER_1M_TOKENS["completion"], help="비용 추정용 출력 토큰 단가 (1M 토큰당 USD)")
+    parser.add_argument("--metrics-output", default=None, help="토큰/비용/지연 시간 집계를 저장할 .json 파일 (기본: 출력만)")
+    parser.add_argument("--trace", default=None, metavar="PATH", help="시나리오/턴/LLM 호출/Tool 실행 구간을 Chrome trace JSON으로 저장 (Perfetto에서 열기)")
+    
+    args = parser.parse_args()
+    
+    if args.merge is not None:
+        definitions = load_scenario_definitions()
+        if definitions is None:
+            sys.exit(1)
+        expected_ids = {s["id"] for s in definitions[0] + definitions[1]}
+        if not merge_shards(args.output, args.merge, expected_ids):
+            sys.exit(1)
+        return
+    
+    check_api_key()
+    asyncio.run(main_async(args))
 
 
 if __name__ == "__main__":
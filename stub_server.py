@@ -0,0 +1,388 @@
+"""
+stub_server.py - 오프라인 벤치마크용 OpenAI 호환 로컬 Stub LLM 서버
+
+run_scenarios.py의 OpenAI(base_url=...) 클라이언트가 사용하는 /v1/chat/completions 프로토콜을 흉내냅니다.
+- 사용자 질의를 규칙 기반으로 해석해 TOOL_FUNCTIONS의 6개 툴에 대한 tool_calls를 스크립트대로 반환
+- 지연 시간 분포(fixed/uniform/exponential/lognormal)와 오류율(500, 429 + Retry-After) 설정 가능
+- "stream": true 요청은 SSE(chat.completion.chunk)로 content와 tool_calls 인자를 조각내어 전송
+
+실행:
+    python stub_server.py --port 8000 --latency-ms 300 --latency-dist lognormal --error-rate 0.02
+    python run_scenarios.py --base-url http://127.0.0.1:8000/v1
+"""
+
+import re
+import json
+import time
+import uuid
+import math
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+LATENCY_DISTS = ("fixed", "uniform", "exponential", "lognormal")
+
+# 시나리오 질의에 등장하는 상품 표기 → Mock 상품 ID
+PRODUCT_LETTER_IDS = {"A": "P123", "B": "P456", "C": "P789"}
+DEFAULT_CATEGORY = "50000000"
+
+
+class StubBehavior:
+    """지연 시간 분포, 오류율, 응답 길이, 스트리밍 조각 설정"""
+
+    def __init__(
+        self,
+        latency_ms: float = 200.0,
+        latency_dist: str = "fixed",
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        reasoning_chars: int = 200,
+        chunk_chars: int = 16,
+        chunk_delay_ms: float = 2.0,
+        seed: Optional[int] = None
+    ):
+        if latency_dist not in LATENCY_DISTS:
+            raise ValueError(f"지원하지 않는 지연 분포: {latency_dist}")
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.reasoning_chars = reasoning_chars
+        self.chunk_chars = max(1, chunk_chars)
+        self.chunk_delay_ms = chunk_delay_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    def sample_latency(self) -> float:
+        """응답 지연 시간(초) 샘플링 (평균이 latency_ms가 되도록)"""
+        mean = self.latency_ms / 1000.0
+        with self._lock:
+            if self.latency_dist == "uniform":
+                return self._rng.uniform(0, 2 * mean)
+            if self.latency_dist == "exponential":
+                return self._rng.expovariate(1 / mean) if mean > 0 else 0.0
+            if self.latency_dist == "lognormal":
+                mu = math.log(mean) - self.latency_sigma ** 2 / 2 if mean > 0 else 0.0
+                return self._rng.lognormvariate(mu, self.latency_sigma) if mean > 0 else 0.0
+            return mean
+
+    def sample_failure(self) -> Optional[int]:
+        """이번 요청에 주입할 HTTP 오류 코드 (없으면 None)"""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+            if roll < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return 429
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.stats["errors"] += 1
+                return 500
+        return None
+
+
+# ============================================================================
+# 스크립트된 응답 생성
+# ============================================================================
+
+def _extract_products(query: str) -> List[Tuple[str, str]]:
+    """질의에서 (상품 ID, 분석 키워드) 목록 추출. 예: "A상품(캠핑 의자)" → ("P123", "캠핑 의자")"""
+    keyword_override = re.search(r"키워드는\s*'([^']+)'", query)
+    products = []
+    for letter, inner in re.findall(r"([A-Z])상품\(([^)]*)\)", query):
+        explicit_id = re.fullmatch(r"P\d+", inner.strip())
+        product_id = explicit_id.group(0) if explicit_id else PRODUCT_LETTER_IDS.get(letter, f"{letter}상품")
+        keyword = keyword_override.group(1) if keyword_override else (inner if not explicit_id else f"{letter}상품")
+        products.append((product_id, keyword))
+
+    # "'겨울 부츠'로 다시 분석" 처럼 키워드만 다시 주는 후속 질의
+    if not products:
+        quoted = re.search(r"'([^']+)'", query)
+        if quoted and "분석" in query:
+            products.append(("P789", quoted.group(1)))
+    return products
+
+
+def build_plan(query: str) -> List[List[Tuple[str, Dict[str, Any]]]]:
+    """
+    사용자 질의 → 단계별 툴 호출 계획
+    - 각 단계는 한 assistant 메시지의 tool_calls (여러 개면 병렬 호출)
+    """
+    plan = []
+    products = _extract_products(query)
+
+    if "현황" in query or "대시보드" in query:
+        plan.append([("get_store_dashboard", {"low_stock_threshold": "10"})])
+
+    if products and ("분석" in query or "재고" in query or "트렌드" in query):
+        plan.append([
+            ("analyze_product_strategy", {"product_id": pid, "analysis_keyword": kw})
+            for pid, kw in products
+        ])
+
+    if "트렌드 키워드" in query or ("카테고리" in query and not products):
+        category = re.search(r"\((\d{8})\)", query)
+        plan.append([("get_top_shopping_trend", {"category_code": category.group(1) if category else DEFAULT_CATEGORY})])
+
+    if "카페" in query:
+        plan.append([("post_cafe_article", {
+            "cafe_id": "smartstore_cafe", "menu_id": "1",
+            "title": "오늘의 트렌드 추천 상품", "content": "지금 가장 인기 있는 상품을 소개합니다."
+        })])
+    elif "블로그" in query:
+        plan.append([("post_blog_promotion", {
+            "title": "오늘의 트렌드 추천 상품", "content": "지금 가장 인기 있는 상품을 소개합니다."
+        })])
+
+    if "카톡" in query or "알림" in query:
+        # 메시지 내용은 앞 단계의 툴 결과를 보고 채움 (None → 동적 생성)
+        plan.append([("alert_seller", None)])
+    return plan
+
+
+def _summarize_tool_results(tool_messages: List[Dict]) -> Tuple[str, str]:
+    """이전 툴 결과를 요약해 alert_seller의 (message, alert_level) 생성"""
+    lines, level = [], "info"
+    for message in tool_messages:
+        try:
+            result = json.loads(message.get("content") or "{}")
+        except json.JSONDecodeError:
+            continue
+        if "stock_level" in result:
+            lines.append(f"{result.get('product_id')} 재고 {result['stock_level']}개")
+            if isinstance(result["stock_level"], int) and result["stock_level"] < 10:
+                level = "warning"
+    return ("[분석 완료] " + ", ".join(lines)) if lines else "[분석 완료] 요청하신 작업을 처리했습니다.", level
+
+
+def scripted_reply(messages: List[Dict], reasoning_chars: int = 200) -> Dict[str, Any]:
+    """대화 기록을 보고 다음 assistant 메시지(dict) 생성"""
+    last_user_idx = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+    query = (messages[last_user_idx].get("content") or "") if last_user_idx >= 0 else ""
+    after_user = messages[last_user_idx + 1:]
+    step = sum(1 for m in after_user if m.get("role") == "assistant" and m.get("tool_calls"))
+
+    plan = build_plan(query)
+    filler = "요청을 분석하고 필요한 툴을 판단합니다. "
+    reasoning = ("<think>" + (filler * (reasoning_chars // len(filler) + 1))[:reasoning_chars] + "</think>") if reasoning_chars else ""
+
+    if step >= len(plan):
+        return {"role": "assistant", "content": reasoning + "요청하신 작업을 완료했습니다."}
+
+    tool_messages = [m for m in after_user if m.get("role") == "tool"]
+    tool_calls = []
+    for name, arguments in plan[step]:
+        if arguments is None:
+            message, level = _summarize_tool_results(tool_messages)
+            arguments = {"message": message, "alert_level": level}
+        tool_calls.append({
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)}
+        })
+    return {"role": "assistant", "content": reasoning, "tool_calls": tool_calls}
+
+
+def _estimate_tokens(text: str) -> int:
+    return int(len(text) / 2.5) + 1
+
+
+def build_completion(request: Dict[str, Any], behavior: StubBehavior) -> Dict[str, Any]:
+    """chat.completion 응답 본문 생성"""
+    message = scripted_reply(request.get("messages", []), behavior.reasoning_chars)
+    prompt_tokens = _estimate_tokens(json.dumps(request.get("messages", []), ensure_ascii=False))
+    completion_tokens = _estimate_tokens(json.dumps(message, ensure_ascii=False))
+    return {
+        "id": f"chatcmpl-stub-{uuid.uuid4().hex[:16]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "solar-pro"),
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "finish_reason": "tool_calls" if message.get("tool_calls") else "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+def _pieces(text: str, size: int) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def stream_events(completion: Dict[str, Any], chunk_chars: int, include_usage: bool):
+    """완성된 응답을 chat.completion.chunk 이벤트 시퀀스로 분해"""
+    base = {
+        "id": completion["id"],
+        "object": "chat.completion.chunk",
+        "created": completion["created"],
+        "model": completion["model"]
+    }
+    choice = completion["choices"][0]
+    message = choice["message"]
+
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+        return {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+    yield chunk({"role": "assistant", "content": ""})
+    for piece in _pieces(message.get("content") or "", chunk_chars):
+        yield chunk({"content": piece})
+    for index, tool_call in enumerate(message.get("tool_calls") or []):
+        yield chunk({"tool_calls": [{
+            "index": index,
+            "id": tool_call["id"],
+            "type": "function",
+            "function": {"name": tool_call["function"]["name"], "arguments": ""}
+        }]})
+        for piece in _pieces(tool_call["function"]["arguments"], chunk_chars):
+            yield chunk({"tool_calls": [{"index": index, "function": {"arguments": piece}}]})
+    yield chunk({}, choice["finish_reason"])
+    if include_usage:
+        yield {**base, "choices": [], "usage": completion["usage"]}
+
+
+# ============================================================================
+# HTTP 서버
+# ============================================================================
+
+def make_handler(behavior: StubBehavior):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # keep-alive 지원
+        disable_nagle_algorithm = True # 헤더/본문을 따로 쓸 때 keep-alive 연결에서 ~40ms 지연(delayed ACK) 방지
+
+        def log_message(self, format, *args):
+            pass # 요청마다 로그를 찍으면 부하 측정이 왜곡됨
+
+        def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _write_chunk(self, text: str):
+            """Transfer-Encoding: chunked 형식으로 한 조각 전송 (빈 문자열 = 종료)"""
+            data = text.encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def _send_stream(self, completion: Dict[str, Any], include_usage: bool):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for event in stream_events(completion, behavior.chunk_chars, include_usage):
+                self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n")
+                if behavior.chunk_delay_ms > 0:
+                    time.sleep(behavior.chunk_delay_ms / 1000.0)
+            self._write_chunk("data: [DONE]\n\n")
+            self._write_chunk("")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path: {self.path}", "type": "not_found"}})
+                return
+            try:
+                request = json.loads(raw or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+                return
+
+            time.sleep(behavior.sample_latency())
+
+            failure = behavior.sample_failure()
+            if failure == 429:
+                self._send_json(
+                    429,
+                    {"error": {"message": "Rate limit exceeded (stub)", "type": "rate_limit_error"}},
+                    {"Retry-After": str(behavior.retry_after)}
+                )
+                return
+            if failure == 500:
+                self._send_json(500, {"error": {"message": "Internal server error (stub)", "type": "server_error"}})
+                return
+
+            completion = build_completion(request, behavior)
+            if request.get("stream"):
+                include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+                self._send_stream(completion, include_usage)
+            else:
+                self._send_json(200, completion)
+
+    return StubHandler
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, behavior: Optional[StubBehavior] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드에서 Stub 서버 시작 → (server, base_url). port=0이면 빈 포트 자동 선택"""
+    server = ThreadingHTTPServer((host, port), make_handler(behavior or StubBehavior()))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="stub-llm-server", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def add_behavior_args(parser: argparse.ArgumentParser):
+    """Stub 동작 관련 CLI 옵션 (load_test.py와 공유)"""
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="평균 응답 지연(ms)")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTS, default="fixed", help="지연 시간 분포")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="lognormal 분포의 sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 오류 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--reasoning-chars", type=int, default=200, help="응답 content에 넣을 <think> 추론 텍스트 길이")
+    parser.add_argument("--chunk-chars", type=int, default=16, help="스트리밍 시 조각당 글자 수")
+    parser.add_argument("--chunk-delay-ms", type=float, default=2.0, help="스트리밍 조각 사이 지연(ms)")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+
+
+def behavior_from_args(args: argparse.Namespace) -> StubBehavior:
+    return StubBehavior(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        reasoning_chars=args.reasoning_chars,
+        chunk_chars=args.chunk_chars,
+        chunk_delay_ms=args.chunk_delay_ms,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 로컬 Stub LLM 서버 (오프라인 벤치마크용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_behavior_args(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(behavior_from_args(args)))
+    server.daemon_threads = True
+    print(f"🧪 Stub LLM 서버 실행 중: http://{args.host}:{args.port}/v1 (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
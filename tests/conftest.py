@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 루트의 최상위 모듈(run_metrics.py 등)을 import할 수 있게
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    """로컬 Stub LLM 서버를 띄우고 run_scenarios의 클라이언트 / Tool 캐시를 교체 → base URL"""
+    import run_scenarios
+    from stub_server import StubBehavior, start_stub_server
+
+    server, base_url = start_stub_server(port=0, behavior=StubBehavior(latency_ms=0.0, seed=0))
+    monkeypatch.setattr(run_scenarios, "client", run_scenarios.create_client(base_url=base_url, api_key="stub-key"))
+    monkeypatch.setattr(run_scenarios, "tool_cache", run_scenarios.ToolResultCache())
+    yield base_url
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,125 @@
+import asyncio
+
+from alert_dispatcher import AlertDispatcher, MockKakaoSender, alert_message_id
+
+
+class FlakySender(MockKakaoSender):
+    """처음 failures번은 예외, 그 뒤로는 기록"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self, seller_id, text, alert_level):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("kakao down")
+        await super().__call__(seller_id, text, alert_level)
+
+
+def test_duplicate_alerts_within_window_are_sent_once():
+    async def scenario():
+        sender = MockKakaoSender()
+        dispatcher = AlertDispatcher(sender=sender, coalesce_seconds=0.05)
+        first = dispatcher.submit("재고 부족: P001", "urgent")
+        second = dispatcher.submit("재고 부족: P001", "urgent") # start() 전 접수도 가능
+        await dispatcher.start()
+        await dispatcher.close()
+        return dispatcher, sender, first, second
+
+    dispatcher, sender, first, second = asyncio.run(scenario())
+    assert first == {"status": "queued", "message_id": alert_message_id("me", "재고 부족: P001", "urgent"), "delivery": "immediate"}
+    assert second["deduplicated"] and second["message_id"] == first["message_id"]
+    assert sender.sent == [{"seller_id": "me", "text": "재고 부족: P001", "level": "urgent"}]
+    assert dispatcher.status(first["message_id"]) == "sent"
+    assert dispatcher.summary()["deduplicated"] == 1
+
+
+def test_dedupe_window_expires():
+    dispatcher = AlertDispatcher(dedupe_seconds=0.0)
+    dispatcher.submit("같은 알림", "info")
+    assert "deduplicated" not in dispatcher.submit("같은 알림", "info")
+    assert dispatcher.summary()["pending"] == 2
+
+
+def test_info_and_warning_alerts_coalesce_into_one_digest_per_seller():
+    async def scenario():
+        sender = MockKakaoSender()
+        dispatcher = AlertDispatcher(sender=sender, coalesce_seconds=0.1)
+        await dispatcher.start()
+        dispatcher.submit("리뷰 3건", "info")
+        dispatcher.submit("재고 5개 남음", "warning")
+        dispatcher.submit("다른 판매자 알림", "info", seller_id="other")
+        dispatcher.submit("주문 폭주", "urgent")
+        await asyncio.sleep(0.03)
+        urgent_first = list(sender.sent) # 모으는 중인 digest보다 urgent가 먼저 발송
+        await asyncio.sleep(0.2)
+        await dispatcher.close()
+        return dispatcher, sender, urgent_first
+
+    dispatcher, sender, urgent_first = asyncio.run(scenario())
+    assert urgent_first == [{"seller_id": "me", "text": "주문 폭주", "level": "urgent"}]
+    by_seller = {(s["seller_id"], s["level"]): s["text"] for s in sender.sent[1:]}
+    assert by_seller == {
+        ("me", "warning"): "[스마트스토어 알림 2건]\n- (정보) 리뷰 3건\n- (경고) 재고 5개 남음",
+        ("other", "info"): "다른 판매자 알림"
+    }
+    assert dispatcher.summary() == {**dispatcher.stats, "pending": 0}
+    assert dispatcher.stats["deliveries"] == 3 and dispatcher.stats["delivered_alerts"] == 4
+
+
+def test_full_digest_is_sent_before_coalesce_window_in_max_digest_chunks():
+    async def scenario():
+        sender = MockKakaoSender()
+        dispatcher = AlertDispatcher(sender=sender, coalesce_seconds=60.0, max_digest=2)
+        await dispatcher.start()
+        for n in range(3):
+            dispatcher.submit(f"알림 {n}", "info")
+        await asyncio.sleep(0.05)
+        sent_early = list(sender.sent)
+        await dispatcher.close()
+        return sent_early
+
+    sent_early = asyncio.run(scenario())
+    assert [s["text"] for s in sent_early] == ["[스마트스토어 알림 2건]\n- (정보) 알림 0\n- (정보) 알림 1", "알림 2"]
+
+
+def test_close_flushes_pending_digest():
+    async def scenario():
+        sender = MockKakaoSender()
+        dispatcher = AlertDispatcher(sender=sender, coalesce_seconds=60.0)
+        await dispatcher.start()
+        handle = dispatcher.submit("마감 전 알림", "warning")
+        await asyncio.sleep(0.02)
+        sent_before_close = len(sender.sent)
+        await dispatcher.close()
+        return dispatcher, sender, handle, sent_before_close
+
+    dispatcher, sender, handle, sent_before_close = asyncio.run(scenario())
+    assert sent_before_close == 0
+    assert sender.sent == [{"seller_id": "me", "text": "마감 전 알림", "level": "warning"}]
+    assert dispatcher.status(handle["message_id"]) == "sent"
+
+
+def test_failed_delivery_is_retried_then_marked_failed(monkeypatch):
+    async def no_sleep(_):
+        pass
+
+    monkeypatch.setattr("alert_dispatcher.asyncio.sleep", no_sleep) # 재시도 backoff 생략
+
+    async def scenario(failures):
+        sender = FlakySender(failures)
+        dispatcher = AlertDispatcher(sender=sender, max_retries=2)
+        handle = dispatcher.submit(f"긴급 {failures}", "urgent")
+        await dispatcher.start()
+        await dispatcher.close()
+        return dispatcher, sender, handle
+
+    dispatcher, sender, handle = asyncio.run(scenario(2))
+    assert sender.calls == 3 and dispatcher.status(handle["message_id"]) == "sent"
+    assert dispatcher.stats["retries"] == 2
+
+    dispatcher, sender, handle = asyncio.run(scenario(3))
+    assert sender.sent == [] and dispatcher.status(handle["message_id"]) == "failed"
+    assert dispatcher.stats["failed_alerts"] == 1
@@ -0,0 +1,77 @@
+import json
+import threading
+
+import pytest
+
+from catalog_store import CatalogStore, load_catalog
+from tool_backends import MockBackend
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    csv_source = tmp_path / "products.csv"
+    csv_source.write_text(
+        "product_id,name,category,stock_level,keyword,trend_change_percent\n"
+        "P1,캠핑 의자,레저,3,캠핑 의자,12.5\n"
+        "P2,텐트,레저,,텐트,\n"
+        "P3,랜턴,레저,40,캠핑 랜턴,-8\n",
+        encoding="utf-8"
+    )
+    jsonl_source = tmp_path / "more.jsonl"
+    jsonl_source.write_text(
+        "\n".join(json.dumps(row, ensure_ascii=False) for row in [
+            {"product_id": "P3", "name": "랜턴 v2", "stock_level": 25, "keyword": " 캠핑 랜턴 ", "trend_change_percent": -8.0},
+            {"product_id": "P4", "name": "코펠", "stock_level": 0, "keyword": None, "trend_change_percent": None}
+        ]) + "\n\n",
+        encoding="utf-8"
+    )
+    db = str(tmp_path / "data" / "catalog.sqlite")
+    assert load_catalog(db, [str(csv_source), str(jsonl_source)]) == 5
+    return CatalogStore(db)
+
+
+def test_load_overwrites_same_product_id_and_parses_empty_values(catalog):
+    assert catalog.count() == 4
+    assert catalog.get_product("P3") == {
+        "product_id": "P3", "name": "랜턴 v2", "category": None, "stock_level": 25, "keyword": "캠핑 랜턴", "trend_change_percent": -8.0
+    }
+    assert catalog.get_product("P2")["stock_level"] is None
+    assert catalog.get_product("P9") is None
+
+
+def test_keyword_trend_lookup(catalog):
+    assert catalog.get_keyword_trend(" 캠핑 의자") == {"keyword": "캠핑 의자", "trend_change_percent": 12.5}
+    assert catalog.get_keyword_trend("텐트") is None # 트렌드가 없는 키워드
+    assert sorted(catalog.iter_trend_keywords()) == ["캠핑 랜턴", "캠핑 의자"]
+
+
+def test_missing_catalog_file_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        CatalogStore(str(tmp_path / "none.sqlite"))
+
+
+def test_catalog_backed_analysis_falls_back_to_product_keyword(catalog):
+    backend = MockBackend(catalog)
+    assert backend.analyze_product("P1", "캠핑 랜턴") == {
+        "product_id": "P1", "stock_level": 3, "keyword_trend": {"keyword": "캠핑 랜턴", "trend_change_percent": -8.0}
+    }
+    assert backend.analyze_product("P1", "없는 키워드")["keyword_trend"] == {"keyword": "캠핑 의자", "trend_change_percent": 12.5}
+    assert backend.analyze_product("P9", "텐트")["error"] == "Unknown product_id 'P9'"
+
+
+def test_lookups_from_many_threads_use_their_own_connections(catalog):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append([catalog.get_product(p)["name"] for p in ("P1", "P3", "P4")])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert results == [["캠핑 의자", "랜턴 v2", "코펠"]] * 8
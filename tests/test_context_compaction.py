@@ -0,0 +1,66 @@
+import json
+
+import run_scenarios
+from run_scenarios import compact_messages, estimate_tokens
+
+
+def _turn(i, tool_payload):
+    return [
+        {"role": "user", "content": f"질문 {i}"},
+        {
+            "role": "assistant",
+            "content": "<think>" + "추론 " * 200 + "</think>",
+            "tool_calls": [{"id": f"call_{i}", "type": "function", "function": {"name": "get_store_dashboard", "arguments": "{}"}}]
+        },
+        {"role": "tool", "tool_call_id": f"call_{i}", "name": "get_store_dashboard", "content": json.dumps(tool_payload, ensure_ascii=False)},
+        {"role": "assistant", "content": f"<think>정리</think>답변 {i}"}
+    ]
+
+
+def _conversation(num_turns):
+    payload = {"new_orders": 5, "low_stock_products": [{"product_id": f"P{n}", "stock": n} for n in range(60)]}
+    messages = [{"role": "system", "content": "시스템"}]
+    for i in range(num_turns):
+        messages += _turn(i, payload)
+    current = _turn(num_turns, payload)[:3] # 현재 턴: user → tool_call → tool 결과
+    return messages + current, current
+
+
+def test_under_budget_or_disabled_returns_messages_unchanged():
+    messages, _ = _conversation(2)
+    assert compact_messages(messages, 0) is messages
+    assert compact_messages(messages, estimate_tokens(messages) + 1) is messages
+
+
+def test_stage_one_strips_reasoning_and_summarises_old_tool_results():
+    messages, current = _conversation(2)
+    original = json.dumps(messages, ensure_ascii=False)
+    compacted = compact_messages(messages, estimate_tokens(messages) - 1)
+
+    assert json.dumps(messages, ensure_ascii=False) == original # 원본은 그대로
+    assert compacted[0] == messages[0]
+    assert compacted[-3:] == current # 현재 턴은 그대로
+    history = compacted[1:-3]
+    assert len(history) == len(messages) - 4 # 턴을 버리지 않음
+    assert all(m["content"] is None for m in history if m["role"] == "assistant" and m.get("tool_calls"))
+    assert [m["content"] for m in history if m["role"] == "assistant" and not m.get("tool_calls")] == ["답변 0", "답변 1"]
+    tool_results = [json.loads(m["content"]) for m in history if m["role"] == "tool"]
+    assert tool_results == [{"new_orders": 5, "low_stock_products": "...(생략)"}] * 2
+
+
+def test_stage_two_drops_oldest_whole_turns_and_keeps_tool_pairs():
+    messages, current = _conversation(6)
+    stats_before = dict(run_scenarios.compaction_stats)
+    single, _ = _conversation(1)
+    one_turn = compact_messages(single, estimate_tokens(single) - 1)[1:-3] # 압축된 이전 턴 1개
+    budget = estimate_tokens([messages[0]] + current) + estimate_tokens(one_turn) * 2
+    compacted = compact_messages(messages, budget)
+
+    assert estimate_tokens(compacted) <= budget
+    assert compacted[-3:] == current
+    history = compacted[1:-3]
+    assert history and history[0]["role"] == "user" # 턴 단위로 잘림
+    assert [m["content"] for m in history if m["role"] == "user"] == ["질문 4", "질문 5"] # 가장 오래된 턴부터 제거
+    call_ids = {c["id"] for m in history if m["role"] == "assistant" for c in m.get("tool_calls") or []}
+    assert call_ids == {m["tool_call_id"] for m in history if m["role"] == "tool"}
+    assert run_scenarios.compaction_stats["dropped_turns"] > stats_before["dropped_turns"]
@@ -0,0 +1,59 @@
+import io
+from types import SimpleNamespace
+
+import run_evaluation
+from eval_cache import EvaluationCache
+
+SCENARIOS = [
+    {"id": "s1", "metadata": {"scenario_type": "single-turn"}, "tool_calls": [{"name": "get_store_dashboard", "arguments": {}}]},
+    {"id": "s2", "metadata": {"scenario_type": "multi-turn"}, "tool_calls": [{"name": "get_publish_status", "arguments": {"job_id": 1}}]},
+    {"id": "s3", "metadata": {"scenario_type": "single-turn"}, "tool_calls": [{"name": "get_store_dashboard", "arguments": {}}]}
+]
+
+
+def _run(cache):
+    report = io.StringIO()
+    summary = run_evaluation.evaluate_stream(SCENARIOS, report, cache)
+    return summary, report.getvalue()
+
+
+def test_cached_run_reuses_results_and_matches_full_evaluation(tmp_path):
+    path = str(tmp_path / "input.jsonl.evalcache.sqlite")
+    _, expected = _run(None)
+
+    cache = EvaluationCache(path, run_evaluation.RULES_VERSION)
+    first, report = _run(cache)
+    cache.close()
+    assert report == expected
+    assert first.reused == 1 # s3는 s1과 tool_calls가 같음
+    assert first.passed == 2
+
+    cache = EvaluationCache(path, run_evaluation.RULES_VERSION)
+    second, report = _run(cache)
+    cache.close()
+    assert report == expected
+    assert second.reused == 3 and cache.stats["invalidated"] == 0
+
+
+def test_rules_change_invalidates_cache(tmp_path):
+    path = str(tmp_path / "input.jsonl.evalcache.sqlite")
+    cache = EvaluationCache(path, run_evaluation.RULES_VERSION)
+    _run(cache)
+    cache.close()
+
+    cache = EvaluationCache(path, run_evaluation.RULES_VERSION + "-changed")
+    summary, _ = _run(cache)
+    cache.close()
+    assert cache.stats["invalidated"] == 2
+    assert summary.reused == 1
+
+
+def test_rules_version_covers_validator_code_and_evaluator_version():
+    base = run_evaluation.evaluation_rules_version(run_evaluation.TOOL_VALIDATORS)
+    assert base == run_evaluation.RULES_VERSION
+
+    changed = dict(run_evaluation.TOOL_VALIDATORS)
+    source = changed["get_store_dashboard"].source
+    changed["get_store_dashboard"] = SimpleNamespace(source=source.replace("정의되지 않은 인자", "알 수 없는 인자"))
+    assert run_evaluation.evaluation_rules_version(changed) != base
+    assert run_evaluation.evaluation_rules_version(run_evaluation.TOOL_VALIDATORS, run_evaluation.EVALUATOR_VERSION + 1) != base
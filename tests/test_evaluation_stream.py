@@ -0,0 +1,55 @@
+import io
+import json
+
+import run_evaluation
+from run_evaluation import EvaluationSummary, evaluate_scenario, evaluate_stream, iter_scenarios
+
+
+def _scenario(n):
+    tool_calls = [{"name": "get_store_dashboard", "arguments": {"low_stock_threshold": "5"}}]
+    if n % 3 == 1:
+        tool_calls = [{"name": "cancel_order", "arguments": {}}] # 정의되지 않은 Tool
+    elif n % 3 == 2:
+        tool_calls = [{"name": "get_publish_status", "arguments": {"job_id": n}}] # 인자 타입 오류
+    return {
+        "id": f"S{n:03d}",
+        "query": "q",
+        "conversation": [{"role": "user", "content": "x" * 50}],
+        "tool_calls": tool_calls,
+        "metadata": {"scenario_type": "single-turn" if n % 2 else "multi-turn"}
+    }
+
+
+def _write_input(tmp_path, count, extra_lines=()):
+    path = tmp_path / "input.jsonl"
+    lines = [json.dumps(_scenario(n), ensure_ascii=False) for n in range(count)]
+    lines[1:1] = extra_lines
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_stream_writes_one_report_line_per_scenario_and_skips_bad_lines(tmp_path, capsys):
+    path = _write_input(tmp_path, 9, extra_lines=["", "{broken"])
+    report = io.StringIO()
+    summary = evaluate_stream(iter_scenarios(path), report)
+
+    assert "파싱 오류" in capsys.readouterr().out
+    rows = [json.loads(line) for line in report.getvalue().splitlines()]
+    assert [row["scenario_id"] for row in rows] == [f"S{n:03d}" for n in range(9)]
+    assert rows == [evaluate_scenario(_scenario(n)) for n in range(9)]
+    assert (summary.total, summary.passed, summary.failed) == (9, 3, 6)
+    assert summary.by_type == {"single-turn": [4, 1], "multi-turn": [5, 2]}
+
+
+def test_summary_keeps_only_first_failure_details(monkeypatch, tmp_path):
+    monkeypatch.setattr(run_evaluation, "MAX_FAILED_DETAILS", 2)
+    summary = evaluate_stream(iter_scenarios(_write_input(tmp_path, 9)), io.StringIO())
+    assert summary.failed == 6
+    assert [scenario_id for scenario_id, _ in summary.failed_details] == ["S001", "S002"]
+
+
+def test_non_jsonl_or_missing_input_yields_nothing(tmp_path, capsys):
+    (tmp_path / "input.json").write_text("[]", encoding="utf-8")
+    assert list(iter_scenarios(str(tmp_path / "input.json"))) == []
+    assert list(iter_scenarios(str(tmp_path / "missing.jsonl"))) == []
+    assert isinstance(evaluate_stream([], io.StringIO()), EvaluationSummary)
@@ -0,0 +1,78 @@
+import http.client
+import socket
+import threading
+
+import pytest
+
+from http_pool import HostPool
+
+
+def _serve(handler):
+    """연결마다 handler(conn)를 실행하는 로컬 TCP 서버 → 포트"""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+
+    def loop():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                conn.recv(65536)
+                handler(conn)
+
+    threading.Thread(target=loop, daemon=True).start()
+    return listener
+
+
+def _tracking_pool(port):
+    pool = HostPool("http", "127.0.0.1", port, max_connections=1, timeout=1.0)
+    opened = []
+    new_connection = pool._new_connection
+
+    def track():
+        conn = new_connection()
+        opened.append(conn)
+        return conn
+
+    pool._new_connection = track
+    return pool, opened
+
+
+def test_truncated_body_closes_connection():
+    listener = _serve(lambda conn: conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\nabc"))
+    pool, opened = _tracking_pool(listener.getsockname()[1])
+    try:
+        for _ in range(3): # 슬롯 1개로도 계속 요청 가능해야 함
+            with pytest.raises(http.client.IncompleteRead):
+                pool.request("GET", "/")
+        assert pool._idle == []
+        assert len(opened) == 3 and all(conn.sock is None for conn in opened)
+    finally:
+        listener.close()
+
+
+def test_failed_retry_closes_new_connection():
+    listener = _serve(lambda conn: None) # 응답 없이 연결 종료
+    pool, opened = _tracking_pool(listener.getsockname()[1])
+    try:
+        pool._idle.append(http.client.HTTPConnection("127.0.0.1", listener.getsockname()[1], timeout=1.0))
+        with pytest.raises(http.client.RemoteDisconnected):
+            pool.request("GET", "/") # 재사용 연결 실패 → 새 연결로 재시도 → 다시 실패
+        assert len(opened) == 1 and opened[0].sock is None
+        assert pool._idle == []
+    finally:
+        listener.close()
+
+
+def test_successful_response_returns_connection_to_pool():
+    listener = _serve(lambda conn: conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"))
+    pool, opened = _tracking_pool(listener.getsockname()[1])
+    try:
+        assert pool.request("GET", "/") == (200, b"ok")
+        assert pool._idle == opened
+    finally:
+        pool.close()
+        listener.close()
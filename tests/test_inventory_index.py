@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+import run_scenarios
+from catalog_store import CatalogStore, load_catalog
+from inventory_index import InventoryIndex
+from tool_backends import MockBackend
+
+ROWS = [
+    ("P1", "A", 7), ("P2", "B", 150), ("P3", "C", 0), ("P4", "D", 7), ("P5", "E", None), ("P6", "F", 9)
+]
+
+
+def _catalog(tmp_path):
+    source = tmp_path / "products.jsonl"
+    source.write_text(
+        "\n".join(json.dumps({"product_id": p, "name": n, "stock_level": s}, ensure_ascii=False) for p, n, s in ROWS),
+        encoding="utf-8"
+    )
+    db = str(tmp_path / "catalog.sqlite")
+    load_catalog(db, [str(source)])
+    return CatalogStore(db)
+
+
+def test_inventory_index_below_is_sorted_and_limited():
+    index = InventoryIndex.from_items(ROWS)
+    assert index.count_below(10) == 4
+    assert [e["product_id"] for e in index.below(10)] == ["P3", "P1", "P4", "P6"]
+    assert [e["product_id"] for e in index.below(10, limit=2)] == ["P3", "P1"]
+    assert index.below(0) == []
+
+
+def test_inventory_index_update_then_query():
+    index = InventoryIndex.from_items(ROWS)
+    index.update_stock("P2", 3)
+    index.update_stock("P7", 5, "G")
+    index.update_stock("P3", 50)
+    index.remove("P1")
+    assert [e["product_id"] for e in index.below(10)] == ["P2", "P7", "P4", "P6"]
+    assert index.count_below(10) == 4
+    assert index.lowest(2) == [{"product_id": "P2", "name": "B", "stock": 3}, {"product_id": "P7", "name": "G", "stock": 5}]
+
+
+def test_catalog_update_then_query_matches_inventory_index(tmp_path):
+    catalog = _catalog(tmp_path)
+    index = InventoryIndex.from_items(ROWS)
+    assert catalog.below(10) == index.below(10) # 조회 연결을 먼저 열어 둔 상태에서 갱신
+    for product_id, stock, name in [("P2", 3, None), ("P7", 5, "G"), ("P3", 50, None), ("P6", 9, "F2")]:
+        catalog.update_stock(product_id, stock, name)
+        index.update_stock(product_id, stock, name)
+    for threshold in (0, 6, 10, 1000):
+        assert catalog.count_below(threshold) == index.count_below(threshold)
+        assert catalog.below(threshold) == index.below(threshold)
+    assert catalog.lowest(3) == index.lowest(3)
+    assert catalog.get_product("P6")["name"] == "F2"
+
+
+@pytest.mark.parametrize("use_catalog", [False, True])
+def test_record_stock_change_invalidates_cached_dashboard(monkeypatch, tmp_path, use_catalog):
+    inventory = _catalog(tmp_path) if use_catalog else InventoryIndex.from_items(ROWS)
+    cache = run_scenarios.ToolResultCache()
+    monkeypatch.setattr(run_scenarios, "tool_backend", MockBackend(inventory=inventory))
+    monkeypatch.setattr(run_scenarios, "tool_cache", cache)
+
+    def dashboard():
+        return cache.get_or_call("get_store_dashboard", run_scenarios.get_store_dashboard, {"low_stock_threshold": "10"}, ttl=60)
+
+    first, hit = dashboard()
+    assert not hit and first["low_stock_count"] == 4
+    assert dashboard()[1] # 변경 전에는 캐시 히트
+
+    run_scenarios.record_stock_change("P2", 1)
+    second, hit = dashboard()
+    assert not hit
+    assert second["low_stock_count"] == 5
+    assert second["low_stock_products"][0] == {"product_id": "P3", "name": "C", "stock": 0}
+    assert second["low_stock_products"][1] == {"product_id": "P2", "name": "B", "stock": 1}
+
+
+def test_catalog_low_stock_matches_inventory_index(tmp_path):
+    catalog = _catalog(tmp_path)
+    index = InventoryIndex.from_items(ROWS)
+    for threshold in (0, 1, 7, 8, 10, 1000):
+        assert catalog.count_below(threshold) == index.count_below(threshold)
+        assert catalog.below(threshold) == index.below(threshold)
+        assert catalog.below(threshold, limit=2) == index.below(threshold, limit=2)
+
+
+def test_catalog_low_stock_uses_stock_index(tmp_path):
+    catalog = _catalog(tmp_path)
+    plan = catalog._conn().execute(
+        "EXPLAIN QUERY PLAN SELECT product_id, name, stock_level FROM products"
+        " WHERE stock_level < ? ORDER BY stock_level, product_id LIMIT ?", (10, 20)
+    ).fetchall()
+    assert any("idx_products_stock" in row[-1] for row in plan)
@@ -0,0 +1,37 @@
+import run_scenarios
+from keyword_index import KeywordIndex, edit_distance, ngrams, to_jamo
+
+VOCABULARY = ["겨울 부츠", "방한 부츠", "울트라 경량 패딩", "캠핑 의자", "캠핑 랜턴", "텐트", "여름 샌들", "겨울 부츠"]
+
+
+def test_jamo_decomposition_ignores_spacing_and_case():
+    assert to_jamo("부츠") == "ㅂㅜㅊㅡ"
+    assert to_jamo("Warm 부 츠") == "warmㅂㅜㅊㅡ"
+    assert ngrams("겨울부츠") == ngrams("겨울 부츠")
+    assert edit_distance("겨울부츠", "겨울부추") == 1
+
+
+def test_suggest_ranks_typos_and_spacing_variants_first():
+    index = KeywordIndex(VOCABULARY)
+    assert len(index) == 7 # 중복 키워드는 한 번만
+
+    assert index.suggest("겨울부츠")[0]["keyword"] == "겨울 부츠"
+    assert index.suggest("캠핑 으자")[0]["keyword"] == "캠핑 의자"
+    suggestions = index.suggest("울트라 웜 부츠", k=3)
+    assert {s["keyword"] for s in suggestions} >= {"겨울 부츠", "방한 부츠"}
+    assert [s["score"] for s in suggestions] == sorted((s["score"] for s in suggestions), reverse=True)
+
+
+def test_suggest_excludes_query_itself_and_unrelated_keywords():
+    index = KeywordIndex(VOCABULARY)
+    assert all(s["keyword"] != "겨울 부츠" for s in index.suggest("겨울  부츠"))
+    assert index.suggest("zzzz") == []
+    assert KeywordIndex([]).suggest("부츠") == []
+
+
+def test_no_data_found_error_carries_suggestions_for_same_turn_retry():
+    result = run_scenarios.analyze_product_strategy("P002", "울트라 웜 부츠")
+    assert result["error"] == "No data found for '울트라 웜 부츠'"
+    assert result["suggested_keywords"]
+    for suggestion in result["suggested_keywords"]:
+        assert run_scenarios.analyze_product_strategy("P002", suggestion["keyword"]).get("keyword_trend") is not None
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+import run_scenarios
+from llm_cache import CacheMissError, LLMResponseCache
+
+
+def test_key_ignores_dict_key_order():
+    a = LLMResponseCache.make_key("m", [{"role": "user", "content": "hi"}], [{"b": 1, "a": 2}], 0.0, "auto")
+    b = LLMResponseCache.make_key("m", [{"content": "hi", "role": "user"}], [{"a": 2, "b": 1}], 0.0, "auto")
+    assert a == b
+    assert a != LLMResponseCache.make_key("m", [{"role": "user", "content": "hi!"}], [{"a": 2, "b": 1}], 0.0, "auto")
+
+
+def test_replay_mode_reads_but_never_writes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = LLMResponseCache(path)
+    cache.put("k1", {"message": {"role": "assistant", "content": "ok"}})
+    cache.close()
+
+    replay = LLMResponseCache(path, mode="replay")
+    assert replay.get("k1")["message"]["content"] == "ok"
+    replay.put("k2", {"message": {}})
+    with pytest.raises(CacheMissError):
+        replay.get("k2")
+    assert replay.summary()["entries"] == 1
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=250)
+    payload = {"message": {"content": "x" * 80}}
+    cache.put("a", payload)
+    cache.put("b", payload)
+    cache.get("a") # a를 최근 사용으로
+    cache.put("c", payload)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_replay_reproduces_a_recorded_scenario_offline(stub_client, monkeypatch, tmp_path):
+    with open("scenarios_single_smartstore.json", "r", encoding="utf-8") as f:
+        scenario = json.load(f)["scenarios"][0]
+    path = str(tmp_path / "cache.sqlite")
+
+    def run():
+        # 알림 dedupe 상태가 Tool 결과(→ 다음 요청 내용)에 들어가므로 실행마다 새 발송기
+        monkeypatch.setattr(run_scenarios, "alert_dispatcher", run_scenarios.AlertDispatcher())
+        return asyncio.run(run_scenarios.run_single_turn_scenario(scenario, run_scenarios.tools))
+
+    recorder = LLMResponseCache(path)
+    monkeypatch.setattr(run_scenarios, "llm_cache", recorder)
+    recorded = run()
+    recorder.close()
+
+    # 서버 없이 (연결할 수 없는 주소) 캐시만으로 재실행
+    replay = LLMResponseCache(path, mode="replay")
+    monkeypatch.setattr(run_scenarios, "llm_cache", replay)
+    monkeypatch.setattr(run_scenarios, "client", run_scenarios.create_client(base_url="http://127.0.0.1:9/v1", api_key="x"))
+    replayed = run()
+    replay.close()
+
+    assert "error" not in replayed
+    assert replayed["tool_calls"] == recorded["tool_calls"]
+    assistant = [[m for m in r["conversation"] if m.get("role") == "assistant"] for r in (recorded, replayed)]
+    assert assistant[0] == assistant[1]
+    assert replay.stats["misses"] == 0 and replay.stats["hits"] == len(assistant[1])
+    assert all(call["cached"] for turn in replayed["metadata"]["turns"] for call in turn["llm_calls"])
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+
+import load_test
+import run_scenarios
+
+
+def test_each_level_starts_with_an_empty_tool_cache_and_reports_turn_latency(stub_client):
+    args = argparse.Namespace(max_retries=1, backoff_base=0.01, timeout=10.0)
+    workload = load_test.build_workload(4)
+    caches, levels = [], []
+
+    async def run_levels(): # load_test.main_async처럼 모든 단계를 같은 이벤트 루프에서
+        for concurrency in (1, 2):
+            levels.append(await load_test.run_level(concurrency, workload, args))
+            caches.append(run_scenarios.tool_cache)
+
+    asyncio.run(run_levels())
+
+    assert caches[0] is not caches[1]
+    # 두 번째 단계도 빈 캐시에서 시작 → 서로 다른 인자마다 미스가 1번씩 (이전 단계 결과를 재사용하지 않음)
+    misses = [{name: s["misses"] for name, s in cache.stats.items()} for cache in caches]
+    assert misses[1] == misses[0] and all(misses[1].values())
+    for level in levels:
+        assert level["scenario_error_rate"] == 0.0
+        assert level["turns"] >= level["scenarios"] # Multi 시나리오는 턴이 여러 개
+        assert level["llm_calls"] > level["turns"] # 턴마다 Tool 호출 후 최종 답변까지 LLM 호출 2번 이상
+        assert level["turn_latency_ms"]["p50"] >= level["llm_call_latency_ms"]["p50"]
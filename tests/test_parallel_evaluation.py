@@ -0,0 +1,64 @@
+import io
+import json
+import os
+
+import pytest
+
+from run_evaluation import evaluate_parallel, evaluate_stream, iter_scenarios, split_byte_ranges
+
+
+def _write_input(tmp_path, count):
+    path = tmp_path / "input.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for n in range(count):
+            name = "get_store_dashboard" if n % 4 else "cancel_order"
+            entry = {
+                "id": f"S{n:04d}",
+                "query": "재고 " * (n % 7),
+                "conversation": [{"role": "user", "content": "긴 대화 " * (n % 13)}],
+                "tool_calls": [{"name": name, "arguments": {}}],
+                "metadata": {"scenario_type": "single-turn" if n % 3 else "multi-turn"}
+            }
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            if n % 50 == 10:
+                f.write("\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("num_chunks", [1, 3, 16, 1000])
+def test_byte_ranges_cover_file_on_line_boundaries(tmp_path, num_chunks):
+    path = _write_input(tmp_path, 200)
+    ranges = split_byte_ranges(path, num_chunks)
+    assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(path)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    data = open(path, "rb").read()
+    assert all(start == 0 or data[start - 1:start] == b"\n" for start, _ in ranges)
+    ids = [s["id"] for start, end in ranges for s in iter_scenarios(path, start, end)]
+    assert ids == [f"S{n:04d}" for n in range(200)] # 빠지거나 두 번 읽히는 줄 없음
+
+
+def test_parallel_report_and_summary_match_sequential(tmp_path):
+    path = _write_input(tmp_path, 300)
+    sequential_report = io.StringIO()
+    sequential = evaluate_stream(iter_scenarios(path), sequential_report)
+
+    output = str(tmp_path / "report.jsonl")
+    parallel = evaluate_parallel(path, output, workers=3)
+
+    assert open(output, encoding="utf-8").read() == sequential_report.getvalue()
+    assert vars(parallel) == vars(sequential)
+    assert sorted(os.listdir(tmp_path)) == ["input.jsonl", "report.jsonl"] # part 파일 정리
+
+
+def test_parallel_evaluation_shares_incremental_cache(tmp_path):
+    path = _write_input(tmp_path, 120)
+    cache_path = str(tmp_path / "input.jsonl.evalcache.sqlite")
+    output = str(tmp_path / "report.jsonl")
+
+    first = evaluate_parallel(path, output, workers=2, cache_path=cache_path)
+    first_report = open(output, encoding="utf-8").read()
+    second = evaluate_parallel(path, output, workers=2, cache_path=cache_path)
+
+    assert open(output, encoding="utf-8").read() == first_report
+    assert second.reused == second.total == 120
+    assert second.passed == first.passed == 90
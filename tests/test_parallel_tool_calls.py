@@ -0,0 +1,71 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import run_scenarios
+
+
+def _tool_call(call_id, name, arguments):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=json.dumps(arguments, ensure_ascii=False)))
+
+
+@pytest.fixture
+def slow_tools(monkeypatch):
+    """조회 Tool은 0.2초 걸리고, 부작용 Tool은 호출 순서와 동시 실행 여부를 기록"""
+    log = {"side_effects": [], "overlap": False}
+    active = threading.Lock()
+
+    def dashboard(low_stock_threshold="10"):
+        time.sleep(0.2)
+        return {"threshold": low_stock_threshold}
+
+    def alert(message, alert_level):
+        if not active.acquire(blocking=False):
+            log["overlap"] = True
+            return {}
+        try:
+            time.sleep(0.02)
+            log["side_effects"].append(message)
+        finally:
+            active.release()
+        return {"sent": message}
+
+    monkeypatch.setattr(run_scenarios, "tool_cache", None)
+    monkeypatch.setitem(run_scenarios.TOOL_FUNCTIONS, "get_store_dashboard", dashboard)
+    monkeypatch.setitem(run_scenarios.TOOL_FUNCTIONS, "alert_seller", alert)
+    return log
+
+
+def _calls():
+    calls = [_tool_call(f"call_{n}", "get_store_dashboard", {"low_stock_threshold": str(n)}) for n in range(4)]
+    calls.insert(1, _tool_call("call_a", "alert_seller", {"message": "첫 번째", "alert_level": "urgent"}))
+    calls.append(_tool_call("call_b", "alert_seller", {"message": "두 번째", "alert_level": "urgent"}))
+    return calls
+
+
+def test_read_only_calls_overlap_and_results_keep_tool_call_order(slow_tools):
+    calls = _calls()
+    metrics = []
+    started = time.perf_counter()
+    results = asyncio.run(run_scenarios.execute_tool_calls(calls, metrics=metrics))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.6 # 순차 실행이면 0.8초 이상
+    assert [r["tool_call_id"] for r in results] == [c.id for c in calls]
+    assert json.loads(results[2]["content"]) == {"threshold": "1"}
+    assert slow_tools["side_effects"] == ["첫 번째", "두 번째"] and not slow_tools["overlap"]
+    assert [m["name"] for m in metrics] == [c.function.name for c in calls]
+    assert all(m["elapsed_ms"] >= 200 for m in metrics if m["name"] == "get_store_dashboard")
+
+
+def test_no_parallel_tools_runs_sequentially(slow_tools, monkeypatch):
+    monkeypatch.setattr(run_scenarios, "PARALLEL_TOOL_CALLS", False)
+    calls = _calls()
+    started = time.perf_counter()
+    results = asyncio.run(run_scenarios.execute_tool_calls(calls))
+    assert time.perf_counter() - started >= 0.8
+    assert [r["tool_call_id"] for r in results] == [c.id for c in calls]
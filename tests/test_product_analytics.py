@@ -0,0 +1,19 @@
+from product_analytics import analyze_batch, rank_restock_vs_ads
+
+
+def test_rank_uses_trend_values_as_given():
+    ranked = rank_restock_vs_ads([7, 150, 200], [45.5, -10.2, 15.0])
+    assert list(ranked["action"]) == ["restock", "advertise", "advertise"]
+    assert list(ranked["rank"]) == [1, 2, 3]
+    assert round(float(ranked["priority_score"][0]), 3) == round((1 - 0.07) * 1.455, 3)
+
+
+def test_analyze_batch_sorts_by_rank_and_keeps_inputs():
+    results = analyze_batch(["A", "B"], ["a", "b"], [150, 5], [-10.2, 80.0])
+    assert [r["product_id"] for r in results] == ["B", "A"]
+    assert results[0]["trend_change_percent"] == 80.0
+    assert results[1]["recommended_action"] == "advertise"
+
+
+def test_analyze_batch_empty():
+    assert analyze_batch([], [], [], []) == []
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from publish_queue import PublishQueue
+
+
+def _wait_for(queue, job_id, states=("succeeded", "failed"), timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        handle = queue.status(job_id)
+        if handle["status"] in states:
+            return handle
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id} 상태: {queue.status(job_id)}")
+
+
+@pytest.fixture
+def queue():
+    queue = PublishQueue(max_workers=2, max_retries=2, retry_base_delay=0.0)
+    yield queue
+    queue.close()
+
+
+def test_submit_returns_handle_without_waiting_and_resubmit_is_idempotent(queue):
+    release = threading.Event()
+    calls = []
+
+    def publish(title, content):
+        calls.append(title)
+        release.wait(5)
+        return {"post_url": "https://blog.example/1"}
+
+    args = {"title": "신상품", "content": "본문"}
+    first = queue.submit("blog", "blog", publish, args)
+    assert first["status"] in ("queued", "running") # 발행 완료를 기다리지 않음
+    second = queue.submit("blog", "blog", publish, dict(args)) # 모델 재시도
+    assert second["job_id"] == first["job_id"] and second["deduplicated"]
+
+    release.set()
+    done = _wait_for(queue, first["job_id"])
+    assert done == {"job_id": first["job_id"], "kind": "blog", "status": "succeeded", "attempts": 1, "post_url": "https://blog.example/1"}
+    assert queue.submit("blog", "blog", publish, args)["deduplicated"] # 성공한 작업도 다시 게시하지 않음
+    assert calls == ["신상품"]
+    assert queue.summary() == {"submitted": 1, "deduplicated": 2, "succeeded": 1, "failed": 0, "retries": 0, "pending": 0}
+
+
+def test_different_target_or_content_is_a_new_job(queue):
+    publish = lambda **args: {"article_url": "https://cafe.example/1"}
+    base = queue.submit("cafe", "cafe:1/10", publish, {"title": "t", "content": "c"})["job_id"]
+    assert queue.submit("cafe", "cafe:1/11", publish, {"title": "t", "content": "c"})["job_id"] != base
+    assert queue.submit("cafe", "cafe:1/10", publish, {"title": "t", "content": "c2"})["job_id"] != base
+
+
+def test_transient_failures_are_retried(queue):
+    attempts = []
+
+    def publish(title, content):
+        attempts.append(title)
+        if len(attempts) < 3:
+            raise ConnectionError("blog api 503")
+        return {"post_url": "https://blog.example/2"}
+
+    handle = queue.submit("blog", "blog", publish, {"title": "재시도", "content": "본문"})
+    done = _wait_for(queue, handle["job_id"])
+    assert done["status"] == "succeeded" and done["attempts"] == 3 and "error" not in done
+    assert queue.summary()["retries"] == 2
+
+
+def test_failed_job_reports_error_and_can_be_resubmitted(queue):
+    outcomes = iter([ValueError("제목 금칙어")] * 3 + [None])
+
+    def publish(title, content):
+        outcome = next(outcomes)
+        if outcome is not None:
+            raise outcome
+        return {"post_url": "https://blog.example/3"}
+
+    args = {"title": "실패", "content": "본문"}
+    handle = queue.submit("blog", "blog", publish, args)
+    failed = _wait_for(queue, handle["job_id"])
+    assert failed["status"] == "failed" and failed["attempts"] == 3
+    assert failed["error"] == "ValueError: 제목 금칙어"
+
+    retried = queue.submit("blog", "blog", publish, args) # 최종 실패한 작업만 재실행
+    assert "deduplicated" not in retried and retried["job_id"] == handle["job_id"]
+    assert _wait_for(queue, handle["job_id"])["status"] == "succeeded"
+
+
+def test_unknown_job_status_is_none(queue):
+    assert queue.status("PJ-없음") is None
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from rate_limiter import RateLimiter, TokenBucket, is_retryable, parse_retry_after
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after(FakeStatusError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert parse_retry_after(FakeStatusError(429, {"retry-after": "7"})) == 7.0
+    http_date = formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= parse_retry_after(FakeStatusError(429, {"retry-after": http_date})) <= 30
+    assert parse_retry_after(FakeStatusError(429)) is None
+
+
+def test_retryable_errors():
+    assert is_retryable(FakeStatusError(429))
+    assert is_retryable(FakeStatusError(503))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(FakeStatusError(400))
+    assert not is_retryable(ValueError("bad"))
+
+
+def test_429_honours_retry_after_pauses_and_slows_down():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=10000, base_delay=0.01)
+    delay = limiter.retry_delay(FakeStatusError(429, {"retry-after": "3"}), attempt=0)
+    assert delay >= 3.0
+    assert limiter.paused_until >= time.monotonic() + 2.9
+    assert limiter.request_bucket.rate == pytest.approx(80.0) # multiplicative decrease
+    assert limiter.token_bucket.rate == pytest.approx(8000.0)
+    assert limiter.stats["rate_limited"] == 1 and limiter.stats["retries"] == 1
+
+
+def test_aimd_decrease_has_floor_and_recovery_is_additive_and_capped():
+    limiter = RateLimiter(requests_per_minute=100, base_delay=0.0)
+    for _ in range(30):
+        limiter.retry_delay(FakeStatusError(429), attempt=0)
+    assert limiter.request_bucket.rate == pytest.approx(10.0) # max_rate * 0.1
+    limiter.record_usage(0, None)
+    assert limiter.request_bucket.rate == pytest.approx(12.0) # + max_rate * 0.02
+    for _ in range(100):
+        limiter.record_usage(0, None)
+    assert limiter.request_bucket.rate == pytest.approx(100.0)
+
+
+def test_no_retry_for_permanent_errors_or_after_max_retries():
+    limiter = RateLimiter(max_retries=2, base_delay=0.01)
+    assert limiter.retry_delay(FakeStatusError(400), attempt=0) is None
+    assert limiter.retry_delay(FakeStatusError(503), attempt=1) is not None
+    assert limiter.retry_delay(FakeStatusError(503), attempt=2) is None
+    assert limiter.stats["failures"] == 2
+
+
+def test_token_bucket_wait_time_and_refund():
+    bucket = TokenBucket(60) # 초당 1개
+    now = bucket.updated_at
+    bucket.consume(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+    bucket.refund(100) # 용량을 넘지 않음
+    assert bucket.tokens == 60
+
+
+def test_acquire_waits_while_paused():
+    limiter = RateLimiter(requests_per_minute=6000)
+    limiter.paused_until = time.monotonic() + 0.2
+    started = time.monotonic()
+    asyncio.run(limiter.acquire())
+    assert time.monotonic() - started >= 0.18
+    assert limiter.stats["throttle_waits"] >= 1 and limiter.stats["requests"] == 1
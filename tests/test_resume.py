@@ -0,0 +1,54 @@
+import json
+import sys
+
+import pytest
+
+import run_scenarios
+from run_scenarios import load_completed_ids
+
+# main_async가 다시 설정하는 모듈 전역 (테스트 후 원래 값으로 복원)
+RUNNER_GLOBALS = [
+    "client", "rate_limiter", "llm_cache", "tool_cache", "tool_backend", "alert_dispatcher", "publish_queue",
+    "product_catalog", "trend_engine", "keyword_index", "PARALLEL_TOOL_CALLS", "STREAM_COMPLETIONS",
+    "CONTEXT_TOKEN_BUDGET", "PRICE_PER_1M_TOKENS"
+]
+
+
+def test_completed_ids_skip_blank_and_broken_lines_and_truncate_partial_tail(tmp_path):
+    path = tmp_path / "out.jsonl"
+    lines = [
+        json.dumps({"id": "S1", "tool_calls": []}, ensure_ascii=False),
+        "",
+        "not json",
+        json.dumps({"query": "x", "id": "S\"2"}), # id가 맨 앞이 아니거나 이스케이프가 있어도 인식
+        json.dumps({"id": "시나리오 3"}, ensure_ascii=False)
+    ]
+    complete = "\n".join(lines) + "\n"
+    path.write_bytes((complete + '{"id": "S4", "conv').encode("utf-8"))
+
+    assert load_completed_ids(str(path)) == {"S1", 'S"2', "시나리오 3"}
+    assert path.read_bytes() == complete.encode("utf-8") # 중단된 마지막 줄만 잘라냄
+    assert load_completed_ids(str(tmp_path / "none.jsonl")) == set()
+
+
+def test_resume_runs_only_missing_scenarios_and_appends(stub_client, monkeypatch, tmp_path):
+    for name in RUNNER_GLOBALS:
+        monkeypatch.setattr(run_scenarios, name, getattr(run_scenarios, name))
+    definitions = run_scenarios.load_scenario_definitions()
+    all_ids = [s["id"] for s in definitions[0] + definitions[1]]
+
+    output = tmp_path / "out.jsonl"
+    done_line = json.dumps({"id": all_ids[0], "query": "이전 실행", "tool_calls": []}, ensure_ascii=False) + "\n"
+    output.write_text(done_line + '{"id": "' + all_ids[1], encoding="utf-8")
+
+    monkeypatch.setattr(run_scenarios, "UPSTAGE_API_KEY", "stub-key")
+    monkeypatch.setattr(sys, "argv", [
+        "run_scenarios.py", "--resume", "--output", str(output), "--base-url", stub_client,
+        "--rpm", "0", "--concurrency", "4", "--alert-coalesce-seconds", "0"
+    ])
+    run_scenarios.main()
+
+    lines = output.read_text(encoding="utf-8").splitlines(keepends=True)
+    assert lines[0] == done_line # 완료된 시나리오는 다시 실행하지 않고 그대로 둠
+    ids = [json.loads(line)["id"] for line in lines]
+    assert sorted(ids) == sorted(all_ids) and len(ids) == len(set(ids))
@@ -0,0 +1,20 @@
+from run_metrics import percentile
+
+
+def test_percentile_exact_rank_boundaries():
+    assert percentile(list(range(1, 11)), 50) == 5
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile(list(range(1, 101)), 99) == 99
+
+
+def test_percentile_rounds_fractional_rank_up():
+    assert percentile(list(range(1, 11)), 95) == 10
+    assert percentile(list(range(1, 101)), 7) == 7
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+
+
+def test_percentile_edges():
+    assert percentile([], 50) == 0.0
+    assert percentile([4.0], 99) == 4.0
+    assert percentile(list(range(1, 11)), 0) == 1
+    assert percentile(list(range(1, 11)), 100) == 10
@@ -0,0 +1,65 @@
+import asyncio
+import random
+
+import run_scenarios
+
+
+def _collect(jobs, concurrency):
+    async def run():
+        return [r async for r in run_scenarios.iter_scenario_results(jobs, [], concurrency=concurrency)]
+    return asyncio.run(run())
+
+
+def test_results_keep_input_order_with_bounded_parallelism():
+    state = {"running": 0, "peak": 0}
+    rng = random.Random(0)
+    delays = {f"S{n}": rng.uniform(0.001, 0.02) for n in range(20)}
+
+    async def runner(scenario, tools_spec):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(delays[scenario["id"]])
+        state["running"] -= 1
+        return {"id": scenario["id"]}
+
+    jobs = [(runner, {"id": scenario_id}) for scenario_id in delays]
+    assert [r["id"] for r in _collect(jobs, 4)] == list(delays)
+    assert state["peak"] == 4
+
+
+def test_failing_scenario_is_recorded_and_others_continue():
+    async def runner(scenario, tools_spec):
+        if scenario["id"] == "S1":
+            raise RuntimeError("boom")
+        return {"id": scenario["id"], "response": "ok"}
+
+    results = _collect([(runner, {"id": f"S{n}"}) for n in range(3)], 2)
+    assert results[0] == {"id": "S0", "response": "ok"}
+    assert results[1] == {"id": "S1", "error": "시나리오 실행 예외", "details": "RuntimeError('boom')"}
+    assert results[2] == {"id": "S2", "response": "ok"}
+
+
+def test_only_a_bounded_window_is_started_ahead_of_a_slow_first_scenario():
+    started = []
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def runner(scenario, tools_spec):
+            started.append(scenario["id"])
+            if scenario["id"] == "S0":
+                await gate.wait()
+            return {"id": scenario["id"]}
+
+        jobs = [(runner, {"id": f"S{n}"}) for n in range(50)]
+        results = run_scenarios.iter_scenario_results(jobs, [], concurrency=2)
+        first = asyncio.ensure_future(results.__anext__())
+        await asyncio.sleep(0.05)
+        started_while_blocked = len(started)
+        gate.set()
+        rest = [await first] + [r async for r in results]
+        return started_while_blocked, rest
+
+    started_while_blocked, results = asyncio.run(run())
+    assert started_while_blocked == 2 * 4 # concurrency의 4배까지만 미리 시작
+    assert [r["id"] for r in results] == [f"S{n}" for n in range(50)]
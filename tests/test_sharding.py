@@ -0,0 +1,71 @@
+import argparse
+import json
+
+import pytest
+
+from run_scenarios import merge_shards, parse_shard, parse_shard_count, shard_of, shard_part_path
+
+IDS = [f"S{n:03d}" for n in range(40)]
+
+
+def _write_shards(output_file, num_shards, ids=IDS):
+    parts = {shard: [] for shard in range(num_shards)}
+    for scenario_id in reversed(ids): # 샤드 안에서는 순서가 섞여 있어도 됨
+        parts[shard_of(scenario_id, num_shards)].append(scenario_id)
+    for shard, shard_ids in parts.items():
+        with open(shard_part_path(str(output_file), shard, num_shards), "w", encoding="utf-8") as f:
+            for scenario_id in shard_ids:
+                f.write(json.dumps({"id": scenario_id, "response": f"응답 {scenario_id}"}, ensure_ascii=False) + "\n")
+    return parts
+
+
+def test_parse_shard_arguments():
+    assert parse_shard("2/4") == (2, 4)
+    assert parse_shard_count("3") == 3
+    for bad in ["4/4", "-1/2", "1", "a/b", "0/0"]:
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(bad)
+    for bad in ["0", "x"]:
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard_count(bad)
+
+
+def test_shard_assignment_is_stable_and_covers_every_shard():
+    assignment = [shard_of(scenario_id, 4) for scenario_id in IDS]
+    assert assignment == [shard_of(scenario_id, 4) for scenario_id in IDS]
+    assert set(assignment) == {0, 1, 2, 3}
+    assert shard_part_path("data/out.jsonl", 1, 4) == "data/out.part-001-of-004.jsonl"
+
+
+def test_merge_sorts_by_id_and_replaces_output(tmp_path):
+    output_file = tmp_path / "out.jsonl"
+    output_file.write_text("이전 결과\n", encoding="utf-8")
+    _write_shards(output_file, 4)
+
+    assert merge_shards(str(output_file), 4, set(IDS))
+    lines = output_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == IDS
+    assert json.loads(lines[0])["response"] == "응답 S000"
+    assert not (tmp_path / "out.jsonl.tmp").exists()
+
+
+@pytest.mark.parametrize("corrupt", ["missing_id", "duplicate", "wrong_shard", "missing_file"])
+def test_merge_refuses_inconsistent_shards(tmp_path, corrupt):
+    output_file = tmp_path / "out.jsonl"
+    output_file.write_text("이전 결과\n", encoding="utf-8")
+    parts = _write_shards(output_file, 3, IDS[:-1] if corrupt == "missing_id" else IDS)
+    if corrupt in ("duplicate", "wrong_shard"):
+        scenario_id = parts[0][0]
+        target = 0 if corrupt == "duplicate" else 1
+        with open(shard_part_path(str(output_file), target, 3), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": scenario_id}) + "\n")
+        if corrupt == "wrong_shard":
+            # 원래 샤드에서는 제거해 중복이 아닌 '잘못된 샤드'만 남김
+            path = shard_part_path(str(output_file), 0, 3)
+            kept = [line for line in open(path, encoding="utf-8") if json.loads(line)["id"] != scenario_id]
+            open(path, "w", encoding="utf-8").writelines(kept)
+    if corrupt == "missing_file":
+        (tmp_path / "out.part-002-of-003.jsonl").unlink()
+
+    assert not merge_shards(str(output_file), 3, set(IDS))
+    assert output_file.read_text(encoding="utf-8") == "이전 결과\n" # 실패 시 원본 유지
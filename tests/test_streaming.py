@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+
+import run_scenarios
+
+QUERY = "A상품(캠핑 의자)이랑 B상품(게이밍 의자) 재고랑 트렌드 비교 분석해줘."
+
+
+@pytest.fixture
+def no_llm_cache(monkeypatch):
+    monkeypatch.setattr(run_scenarios, "llm_cache", None)
+
+
+def _call(on_tool_call=None):
+    return run_scenarios.call_solar_api([{"role": "user", "content": QUERY}], run_scenarios.tools, on_tool_call)
+
+
+def _tool_calls(message):
+    return [(tc.function.name, json.loads(tc.function.arguments)) for tc in message.tool_calls]
+
+
+def test_streamed_message_matches_non_streamed(stub_client, no_llm_cache, monkeypatch):
+    emitted = []
+
+    async def run(): # 클라이언트 연결이 이벤트 루프에 묶이므로 두 호출을 같은 루프에서
+        plain = await _call()
+        monkeypatch.setattr(run_scenarios, "STREAM_COMPLETIONS", True)
+        return plain, await _call(emitted.append)
+
+    plain, streamed = asyncio.run(run())
+
+    assert plain["success"] and streamed["success"]
+    assert len(streamed["message"].tool_calls) >= 2
+    assert _tool_calls(streamed["message"]) == _tool_calls(plain["message"])
+    assert streamed["message"].content == plain["message"].content
+    assert streamed["usage"] == plain["usage"]
+
+    # 인자가 완성된 tool_call마다 한 번씩, 스트림 순서대로 콜백
+    assert [tc.id for tc in emitted] == [tc.id for tc in streamed["message"].tool_calls]
+    assert [(tc.function.name, json.loads(tc.function.arguments)) for tc in emitted] == _tool_calls(streamed["message"])
+    timings = streamed["timings"]
+    assert timings["ttft_ms"] is not None and timings["ttfc_ms"] >= timings["ttft_ms"]
+    assert plain["timings"] == {"ttft_ms": None, "ttfc_ms": None}
+
+
+def test_early_started_read_only_tools_are_not_run_twice(stub_client, no_llm_cache, monkeypatch):
+    monkeypatch.setattr(run_scenarios, "STREAM_COMPLETIONS", True)
+    runs = []
+    original = run_scenarios.TOOL_FUNCTIONS["analyze_product_strategy"]
+    monkeypatch.setitem(run_scenarios.TOOL_FUNCTIONS, "analyze_product_strategy", lambda **args: runs.append(args) or original(**args))
+    monkeypatch.setattr(run_scenarios, "tool_cache", None)
+
+    async def turn():
+        on_tool_call, started = run_scenarios.early_tool_starter()
+        response = await _call(on_tool_call)
+        early = set(started)
+        results = await run_scenarios.execute_tool_calls(response["message"].tool_calls, started)
+        return response["message"], early, results
+
+    message, early, results = asyncio.run(turn())
+    analyze_ids = {tc.id for tc in message.tool_calls if tc.function.name == "analyze_product_strategy"}
+    assert analyze_ids and analyze_ids <= early # 메시지 전체 도착 전에 이미 시작
+    assert len(runs) == len(analyze_ids)
+    assert [r["tool_call_id"] for r in results] == [tc.id for tc in message.tool_calls]
+
+
+def test_side_effect_tools_are_never_started_early(monkeypatch):
+    from types import SimpleNamespace
+
+    async def run():
+        on_tool_call, started = run_scenarios.early_tool_starter()
+        on_tool_call(SimpleNamespace(id="call_1", function=SimpleNamespace(name="alert_seller", arguments="{}")))
+        return started
+
+    assert asyncio.run(run()) == {}
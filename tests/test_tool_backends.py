@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+
+import run_scenarios
+from catalog_store import CatalogStore, load_catalog
+from fake_services import start_fake_services
+from stub_server import StubBehavior
+from tool_backends import HttpBackend, MockBackend
+
+BATCH_ITEMS = [("P123", "캠핑 의자"), ("P456", "없는 키워드"), ("NOPE", "겨울 부츠"), ("P123", "겨울 부츠")]
+
+
+def _start_backend(behavior):
+    servers, endpoints = start_fake_services(behavior=behavior)
+    return servers, HttpBackend(endpoints, timeout=2.0)
+
+
+def _stop(servers, backend):
+    backend.close()
+    # shutdown()은 serve_forever의 poll 간격만큼 기다리므로 서버들을 동시에 종료
+    threads = [threading.Thread(target=server.shutdown) for server in servers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for server in servers:
+        server.server_close()
+
+
+@pytest.fixture
+def failing_upstream():
+    """모든 요청에 HTTP 500을 돌려주는 가짜 업스트림 서비스"""
+    servers, backend = _start_backend(StubBehavior(latency_ms=0.0, error_rate=1.0, seed=0))
+    yield backend
+    _stop(servers, backend)
+
+
+@pytest.fixture
+def healthy_upstream():
+    servers, backend = _start_backend(StubBehavior(latency_ms=0.0, seed=0))
+    yield backend
+    _stop(servers, backend)
+
+
+def test_store_summary_returns_error_payload_on_5xx(failing_upstream):
+    summary = failing_upstream.store_summary()
+    assert summary["new_orders"] is None
+    assert summary["pending_qa_count"] is None
+    assert "HTTP 500" in summary["error"]
+
+
+def test_analyze_product_returns_error_payload_on_5xx(failing_upstream):
+    result = failing_upstream.analyze_product("P123", "캠핑 의자")
+    assert result["stock_level"] is None
+    assert "HTTP 500" in result["error"]
+
+
+def test_low_stock_returns_error_payload_on_5xx(failing_upstream):
+    result = failing_upstream.low_stock(10, 20)
+    assert result["low_stock_products"] is None
+    assert "HTTP 500" in result["error"]
+
+
+def test_http_backend_matches_mock(healthy_upstream):
+    mock = MockBackend()
+    assert healthy_upstream.store_summary() == mock.store_summary()
+    assert healthy_upstream.low_stock(200, 20) == mock.low_stock(200, 20)
+    assert healthy_upstream.analyze_product("P123", "캠핑 의자") == mock.analyze_product("P123", "캠핑 의자")
+
+
+def test_analyze_products_matches_single_calls_with_two_requests(healthy_upstream):
+    singles = [healthy_upstream.analyze_product(*item) for item in BATCH_ITEMS]
+    before = sum(host["requests"] for host in healthy_upstream.summary().values())
+    assert healthy_upstream.analyze_products(BATCH_ITEMS) == singles
+    after = sum(host["requests"] for host in healthy_upstream.summary().values())
+    assert after - before == 2
+
+
+def test_analyze_products_returns_error_payload_on_5xx(failing_upstream):
+    results = failing_upstream.analyze_products(BATCH_ITEMS)
+    assert [r["product_id"] for r in results] == [product_id for product_id, _ in BATCH_ITEMS]
+    assert all(r["stock_level"] is None and "HTTP 500" in r["error"] for r in results)
+
+
+def test_catalog_batch_lookup_matches_single_lookups(tmp_path):
+    source = tmp_path / "products.jsonl"
+    rows = [
+        {"product_id": "P1", "name": "A", "stock_level": 3, "keyword": "캠핑 의자", "trend_change_percent": 12.5},
+        {"product_id": "P2", "name": "B", "stock_level": 80, "keyword": "캠핑 의자", "trend_change_percent": 40.0},
+        {"product_id": "P3", "name": "C", "stock_level": 0, "keyword": "텐트", "trend_change_percent": None}
+    ]
+    source.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in rows), encoding="utf-8")
+    db = str(tmp_path / "catalog.sqlite")
+    load_catalog(db, [str(source)])
+
+    backend = MockBackend(CatalogStore(db))
+    items = [("P1", "캠핑 의자"), ("P2", " 캠핑 의자 "), ("P3", "텐트"), ("P9", "캠핑 의자"), ("P2", "텐트")]
+    assert backend.analyze_products(items) == [backend.analyze_product(*item) for item in items]
+
+
+def test_dashboard_low_stock_comes_from_http_upstream(monkeypatch, healthy_upstream):
+    monkeypatch.setattr(run_scenarios, "tool_backend", healthy_upstream)
+    monkeypatch.setattr(run_scenarios, "tool_cache", None)
+    before = run_scenarios.get_store_dashboard("100")
+    assert before["low_stock_count"] == 1
+    assert [p["product_id"] for p in before["low_stock_products"]] == ["P123"]
+
+    run_scenarios.record_stock_change("P456", 2) # 커머스 가짜 서비스의 재고가 바뀜 (로컬 Mock 인덱스는 그대로)
+    after = run_scenarios.get_store_dashboard("100")
+    assert after["low_stock_count"] == 2
+    assert [p["product_id"] for p in after["low_stock_products"]] == ["P456", "P123"]
+    assert MockBackend().low_stock(100, 20)["low_stock_count"] == 1
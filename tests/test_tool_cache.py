@@ -0,0 +1,84 @@
+import pytest
+
+import tool_cache
+from tool_cache import ToolResultCache, normalize_args
+
+
+def lookup(product_id, include_trend=True):
+    lookup.calls += 1
+    if product_id == "BAD":
+        return {"error": "upstream 503"}
+    return {"product_id": product_id, "include_trend": include_trend}
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    lookup.calls = 0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_key_ignores_argument_order_and_omitted_defaults():
+    assert normalize_args(lookup, {"product_id": "P1"}) == normalize_args(lookup, {"include_trend": True, "product_id": "P1"})
+    assert normalize_args(lookup, {"product_id": "P1", "include_trend": False}) != normalize_args(lookup, {"product_id": "P1"})
+
+    cache = ToolResultCache()
+    assert cache.get_or_call("lookup", lookup, {"product_id": "P1"}, ttl=60) == ({"product_id": "P1", "include_trend": True}, False)
+    assert cache.get_or_call("lookup", lookup, {"include_trend": True, "product_id": "P1"}, ttl=60)[1] is True
+    assert lookup.calls == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ToolResultCache()
+    cache.get_or_call("lookup", lookup, {"product_id": "P1"}, ttl=30)
+    clock[0] += 29
+    assert cache.get_or_call("lookup", lookup, {"product_id": "P1"}, ttl=30)[1] is True
+    clock[0] += 2
+    assert cache.get_or_call("lookup", lookup, {"product_id": "P1"}, ttl=30)[1] is False
+    assert lookup.calls == 2
+    assert cache.summary()["tools"]["lookup"] == {"hits": 1, "misses": 2, "expired": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ToolResultCache(max_entries=2)
+    for product_id in ["P1", "P2", "P1", "P3"]: # P1을 다시 쓴 뒤 P3 추가 → P2 삭제
+        cache.get_or_call("lookup", lookup, {"product_id": product_id}, ttl=60)
+    assert cache.get_or_call("lookup", lookup, {"product_id": "P1"}, ttl=60)[1] is True
+    assert cache.get_or_call("lookup", lookup, {"product_id": "P2"}, ttl=60)[1] is False
+    assert cache.summary()["entries"] == 2
+
+
+def test_error_results_are_not_cached():
+    cache = ToolResultCache()
+    for _ in range(2):
+        result, hit = cache.get_or_call("lookup", lookup, {"product_id": "BAD"}, ttl=60)
+        assert result == {"error": "upstream 503"} and hit is False
+    assert lookup.calls == 2
+    assert cache.summary() == {"entries": 0, "hits": 0, "misses": 2, "hit_rate": 0.0, "tools": {"lookup": {"hits": 0, "misses": 2, "expired": 0}}}
+
+
+def test_runner_caches_read_only_tools_but_not_side_effect_tools(monkeypatch):
+    import json
+    from types import SimpleNamespace
+
+    import run_scenarios
+
+    calls = []
+    monkeypatch.setattr(run_scenarios, "tool_cache", ToolResultCache())
+    monkeypatch.setitem(run_scenarios.TOOL_FUNCTIONS, "get_top_shopping_trend", lambda **args: calls.append("trend") or {"trends": []})
+    monkeypatch.setitem(run_scenarios.TOOL_FUNCTIONS, "alert_seller", lambda **args: calls.append("alert") or {"status": "queued"})
+
+    def call(name, arguments):
+        tool_call = SimpleNamespace(id="call_1", function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+        return run_scenarios.execute_tool_call(tool_call)
+
+    for _ in range(2):
+        call("get_top_shopping_trend", {"category_code": "50000000"})
+        call("alert_seller", {"message": "재고 부족", "alert_level": "urgent"})
+    assert calls == ["trend", "alert", "alert"]
+    assert run_scenarios.tool_cache.summary()["tools"] == {"get_top_shopping_trend": {"hits": 1, "misses": 1, "expired": 0}}
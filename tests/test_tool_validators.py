@@ -0,0 +1,83 @@
+import json
+from types import SimpleNamespace
+
+import run_evaluation
+import run_scenarios
+from tool_schemas import TOOL_SCHEMAS
+from tool_validators import compile_validator, compile_validators
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "message": {"type": "string"},
+        "level": {"type": "string", "enum": ["info", "urgent"]},
+        "ids": {"type": "array", "items": {"type": "string"}},
+        "note": {"description": "타입 없음"}
+    },
+    "required": ["message"],
+    "additionalProperties": False
+}
+
+
+def test_compiled_validator_checks_required_type_enum_and_unknown():
+    validate = compile_validator("demo", PARAMETERS)
+    assert validate({"message": "hi", "level": "info", "ids": ["a"], "note": 1}) == []
+    assert validate({"level": 3}) == ["필수 인자 누락: ['message']"]
+    assert validate("{}") == ["인자가 JSON 객체가 아님 (실제: str)"]
+    assert validate({"message": 1, "level": "low", "ids": ["a", 2], "extra": 0}) == [
+        "'message' 타입 오류 (기대: string, 실제: int)",
+        "'ids' 타입 오류 (기대: array, 실제: list)",
+        "'level' 허용되지 않는 값: low (기대: ['info', 'urgent'])",
+        "정의되지 않은 인자: ['extra']"
+    ]
+
+
+def test_open_schema_allows_unknown_properties():
+    validate = compile_validator("demo", {**PARAMETERS, "additionalProperties": True})
+    assert validate({"message": "hi", "extra": 0}) == []
+
+
+def test_every_tool_schema_rejects_unknown_properties():
+    validators = compile_validators(TOOL_SCHEMAS)
+    assert validators["get_store_dashboard"]({"low_stock_threshold": "5", "verbose": True}) == ["정의되지 않은 인자: ['verbose']"]
+
+
+def test_evaluator_reports_unknown_argument():
+    result = run_evaluation.evaluate_single_tool_call(
+        {"name": "get_publish_status", "arguments": {"job_id": "j1", "force": True}}
+    )
+    assert result["correct_function_name"] is True
+    assert result["valid_arguments"] is False
+    assert result["errors"] == ["정의되지 않은 인자: ['force']"]
+
+
+def _call(name, arguments):
+    tool_call = SimpleNamespace(id="call_1", function=SimpleNamespace(name=name, arguments=arguments))
+    return json.loads(run_scenarios.execute_tool_call(tool_call)["content"])
+
+
+def test_execute_tool_call_returns_error_for_unknown_argument():
+    result = _call("get_store_dashboard", json.dumps({"low_stock_threshold": "5", "verbose": True}))
+    assert result == {"error": "Invalid arguments: 정의되지 않은 인자: ['verbose']"}
+
+
+def test_execute_tool_call_returns_error_for_malformed_json():
+    result = _call("get_store_dashboard", '{"low_stock_threshold": ')
+    assert result["error"].startswith("Invalid arguments: arguments가 올바른 JSON이 아님")
+
+
+def test_execute_tool_call_returns_error_when_tool_raises(monkeypatch):
+    def broken(job_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(run_scenarios.TOOL_FUNCTIONS, "get_publish_status", broken)
+    assert _call("get_publish_status", json.dumps({"job_id": "j1"})) == {"error": "Tool execution failed: RuntimeError: boom"}
+
+
+def test_malformed_arguments_are_logged_raw_and_fail_evaluation():
+    raw = '{"job_id": '
+    assert run_scenarios.logged_arguments(raw) == raw
+    assert run_scenarios.logged_arguments('{"job_id": "j1"}') == {"job_id": "j1"}
+    result = run_evaluation.evaluate_single_tool_call({"name": "get_publish_status", "arguments": run_scenarios.logged_arguments(raw)})
+    assert result["valid_arguments"] is False
+    assert result["errors"] == ["인자가 JSON 객체가 아님 (실제: str)"]
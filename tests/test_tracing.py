@@ -0,0 +1,79 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+import run_scenarios
+import tracing
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", None) # 테스트가 끝나면 다시 꺼짐
+    return tracing.start()
+
+
+def test_disabled_tracing_returns_shared_noop_span(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    with tracing.span("a", "llm") as s:
+        s.set(tokens=1)
+    assert tracing.span("b", "tool") is tracing.thread_span("c", "tool")
+    assert tracing.save(str(tmp_path / "trace.json")) == 0
+    assert not (tmp_path / "trace.json").exists()
+
+
+def test_spans_record_args_errors_and_scenario_lanes(tracer, tmp_path):
+    with tracing.scenario_track("S1"):
+        with tracing.span("call_solar_api", "llm", iteration=1) as s:
+            s.set(prompt_tokens=12)
+        with pytest.raises(ValueError):
+            with tracing.span("execute_tool_calls", "tool"):
+                raise ValueError("boom")
+    with tracing.scenario_track("S2"): # S1이 끝난 lane 재사용
+        with tracing.thread_span("alert_seller: run", "tool"):
+            pass
+    with tracing.span("write_jsonl", "io"):
+        pass
+
+    by_name = {e["name"]: e for e in tracer.events}
+    assert by_name["call_solar_api"]["args"] == {"iteration": 1, "prompt_tokens": 12}
+    assert by_name["execute_tool_calls"]["args"] == {"error": "ValueError"}
+    assert by_name["S1"]["tid"] == by_name["S2"]["tid"] == by_name["call_solar_api"]["tid"] == 1
+    assert by_name["alert_seller: run"]["tid"] >= tracing.THREAD_TRACK_BASE
+    assert by_name["alert_seller: run"]["args"] == {"scenario": "S2"}
+    assert by_name["write_jsonl"]["tid"] == tracing.MAIN_TRACK
+    assert by_name["S1"]["dur"] >= by_name["call_solar_api"]["dur"]
+
+    path = tmp_path / "trace.json"
+    assert tracing.save(str(path)) == 6
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    names = {e["args"]["name"] for e in saved["traceEvents"] if e["name"] == "thread_name"}
+    assert {"main", "scenario lane 1", threading.current_thread().name} <= names
+    assert all(e["ph"] in ("M", "X") for e in saved["traceEvents"])
+
+
+def test_concurrent_scenarios_get_separate_lanes(tracer, stub_client):
+    with open("scenarios_single_smartstore.json", "r", encoding="utf-8") as f:
+        scenarios = json.load(f)["scenarios"][:3]
+
+    async def run():
+        jobs = [(run_scenarios.run_single_turn_scenario, scenario) for scenario in scenarios]
+        return [r async for r in run_scenarios.iter_scenario_results(jobs, run_scenarios.tools, concurrency=3)]
+
+    results = asyncio.run(run())
+    assert all("error" not in r for r in results)
+
+    scenario_spans = {e["name"]: e for e in tracer.events if e["cat"] == "scenario"}
+    assert set(scenario_spans) == {s["id"] for s in scenarios}
+    spans = sorted(scenario_spans.values(), key=lambda e: e["ts"])
+    for i, a in enumerate(spans): # 시간이 겹친 시나리오는 서로 다른 lane
+        for b in spans[i + 1:]:
+            if b["ts"] < a["ts"] + a["dur"]:
+                assert a["tid"] != b["tid"]
+    assert {e["tid"] for e in spans} <= {1, 2, 3}
+    for scenario_id, outer in scenario_spans.items():
+        inner = [e for e in tracer.events if e["tid"] == outer["tid"] and e["cat"] == "llm"]
+        assert inner and all(outer["ts"] <= e["ts"] and e["ts"] + e["dur"] <= outer["ts"] + outer["dur"] + 1 for e in inner)
+    tool_runs = [e for e in tracer.events if e["cat"] == "tool" and e["name"].endswith(": run")]
+    assert tool_runs and all(e["args"]["scenario"] in scenario_spans for e in tool_runs)
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from trajectory_decode import DECODE_ERRORS, decode_entry, full_decode
+
+
+def _line(entry):
+    return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _projection(entry):
+    return {
+        "id": entry.get("id", "unknown"),
+        "tool_calls": entry.get("tool_calls", []),
+        "metadata": {"scenario_type": entry.get("metadata", {}).get("scenario_type", "unknown")}
+    }
+
+
+TOOL_CALLS = [{"name": "alert_seller", "arguments": {"message": "재고 \"부족\"", "alert_level": "urgent"}}]
+
+ENTRIES = [
+    # run_scenarios.py 출력 순서: conversation 안의 tool_calls / 문자열 속 키 이름 / metadata.turns의 중첩 tool_calls
+    {
+        "id": "S\"1",
+        "query": '"tool_calls": [] 라고 적힌 질의',
+        "conversation": [{"role": "assistant", "content": 'x, "metadata": {}', "tool_calls": [{"id": "c1", "function": {"name": "f"}}]}],
+        "tool_calls": TOOL_CALLS,
+        "metadata": {"scenario_type": "multi-turn", "turns": [{"tool_calls": [{"name": "nested"}]}], "note": ', "metadata": '}
+    },
+    {"id": "S2", "query": "q", "conversation": [], "tool_calls": [], "metadata": {"scenario_type": "single-turn"}},
+    # 다른 키 순서 / 누락된 필드 → 전체 파싱으로 대체
+    {"tool_calls": TOOL_CALLS, "id": "S3", "metadata": {"scenario_type": "single-turn"}},
+    {"id": "S4", "query": "metadata 없음", "tool_calls": TOOL_CALLS},
+    {"query": "id 없음", "tool_calls": TOOL_CALLS, "metadata": {}}
+]
+
+
+@pytest.mark.parametrize("entry", ENTRIES, ids=lambda entry: str(entry.get("id")))
+def test_selective_decode_matches_full_decode(entry):
+    line = _line(entry)
+    assert full_decode(line) == entry
+    decoded = decode_entry(line)
+    assert _projection(decoded) == _projection(entry) # 평가가 읽는 필드는 같음
+    if "conversation" in entry:
+        assert decoded == _projection(entry) # runner 출력 순서면 conversation은 건너뜀
+
+
+def test_selective_decode_skips_conversation_on_real_runner_output():
+    with open("data/smartstore_final.jsonl", "rb") as f:
+        for line in f:
+            decoded = decode_entry(line)
+            assert "conversation" not in decoded
+            assert decoded == _projection(full_decode(line))
+
+
+def test_broken_line_raises_decode_error():
+    with pytest.raises(DECODE_ERRORS):
+        decode_entry(b'{"id": "S1", "tool_calls": [}\n')
+    with pytest.raises(DECODE_ERRORS):
+        decode_entry(b'{"id": "S1", "tool_calls": [}\n', selective=False)
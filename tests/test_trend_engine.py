@@ -0,0 +1,46 @@
+import run_scenarios
+from trend_engine import TrendEngine
+
+
+def _engine():
+    engine = TrendEngine()
+    engine.ingest("50000000", {"패딩": [10.0] * 14, "코트": [5.0] * 7 + [10.0] * 7})
+    engine.ingest("50000002", {"패딩": [30.0] * 14, "러닝화": [20.0] * 14})
+    return engine
+
+
+def test_overall_top_sums_keywords_across_categories():
+    top = _engine().overall_top_keywords(3, "7d")
+    assert [row["keyword"] for row in top] == ["패딩", "러닝화", "코트"]
+    assert top[0]["trend_score"] == 100.0
+    assert top[0]["change_percent"] == 0.0
+    assert top[2]["change_percent"] == 100.0
+
+
+def test_overall_top_refreshes_after_new_day():
+    engine = _engine()
+    assert engine.overall_top_keywords(1)[0]["keyword"] == "패딩"
+    engine.add_day("50000002", {"러닝화": 500.0})
+    assert engine.overall_top_keywords(1)[0]["keyword"] == "러닝화"
+
+
+def test_overall_top_empty_engine():
+    assert TrendEngine().overall_top_keywords() is None
+
+
+def test_unknown_category_falls_back_to_all_categories(monkeypatch):
+    monkeypatch.setattr(run_scenarios, "trend_engine", _engine())
+    known = run_scenarios.get_top_shopping_trend("50000000")
+    assert known["keyword"] == "패딩" and "scope" not in known
+
+    unknown = run_scenarios.get_top_shopping_trend("99999999", "2")
+    assert "error" not in unknown
+    assert unknown["category_analyzed"] == "99999999"
+    assert unknown["scope"] == "all_categories"
+    assert unknown["keyword"] == "패딩"
+    assert [row["keyword"] for row in unknown["top_keywords"]] == ["패딩", "러닝화"]
+
+
+def test_unknown_category_with_no_data_is_an_error(monkeypatch):
+    monkeypatch.setattr(run_scenarios, "trend_engine", TrendEngine())
+    assert "error" in run_scenarios.get_top_shopping_trend("99999999")
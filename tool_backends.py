@@ -0,0 +1,278 @@
+"""
+tool_backends.py - Tool이 호출하는 외부 서비스(업스트림) 백엔드
+
+Tool 함수(run_scenarios.py)의 시그니처/결과 형식은 그대로 두고, 실제 데이터를 가져오는 부분만 교체
+- mock: 프로세스 안의 Mock 데이터 (또는 --catalog 로컬 카탈로그)
+- http: 서비스별 HTTP API 호출 (호스트마다 keep-alive 연결 풀 1개 공유, 호스트별 동시 요청 수 상한 + 타임아웃)
+
+업스트림 서비스와 백엔드 메서드:
+    commerce (네이버 커머스)     store_summary(), low_stock(), update_stock(), analyze_product(s)()의 상품/재고 조회
+    datalab  (쇼핑인사이트)       analyze_product(s)()의 키워드 트렌드 조회
+    blog / cafe (네이버 블로그/카페) publish_blog(), publish_cafe()
+    kakao    (카카오 메시지)      alert_sender()
+
+HTTP 경로 규약은 fake_services.py(로컬 가짜 서비스)와 같음
+"""
+
+import json
+import hashlib
+from urllib.parse import quote, urlencode
+from typing import Dict, Any, List, Optional, Tuple
+
+from http_pool import PooledHttpClient
+from catalog_store import CatalogStore
+from inventory_index import InventoryIndex
+from alert_dispatcher import MockKakaoSender, KakaoHttpSender
+
+TOOL_BACKENDS = ("mock", "http")
+UPSTREAM_SERVICES = ("commerce", "datalab", "blog", "cafe", "kakao")
+# fake_services.py 기본 포트 (서비스 순서대로 +0 ~ +4)
+FAKE_SERVICES_BASE_PORT = 18800
+DEFAULT_HTTP_ENDPOINTS = {
+    service: f"http://127.0.0.1:{FAKE_SERVICES_BASE_PORT + i}" for i, service in enumerate(UPSTREAM_SERVICES)
+}
+KAKAO_SEND_PATH = "/v2/api/talk/memo/send"
+BLOG_ID = "my_id"
+
+# Mock 상품 데이터 (카탈로그가 없을 때 사용)
+MOCK_PRODUCT_DB = {
+    "P123": {"name": "A상품", "stock_level": 7, "trend": 45.5, "keyword": "캠핑 의자"},
+    "P456": {"name": "B상품", "stock_level": 150, "trend": -10.2, "keyword": "게이밍 의자"},
+    "P789": {"name": "C상품", "stock_level": 200, "trend": 15.0, "keyword": "겨울 부츠"}
+}
+
+
+def stable_number(*parts: str, low: int, high: int) -> int:
+    """
+    인자 내용으로부터 항상 같은 값을 만드는 Mock ID 생성기
+    (random 대신 사용 → 같은 입력이면 같은 Tool 결과 → LLM 캐시 재사용 가능)
+    """
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).digest()
+    return low + int.from_bytes(digest[:8], "big") % (high - low + 1)
+
+
+def product_analysis(product_id: str, product: Optional[Dict[str, Any]], trend: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    상품 + 키워드 트렌드 조회 결과 → analyze_product_strategy 결과 형식
+    - 분석 키워드의 트렌드가 없으면 상품 대표 키워드의 트렌드
+    """
+    if product is None:
+        return {
+            "product_id": product_id,
+            "stock_level": None,
+            "keyword_trend": None,
+            "error": f"Unknown product_id '{product_id}'"
+        }
+    if trend is None and product.get("trend_change_percent") is not None:
+        trend = {"keyword": product["keyword"], "trend_change_percent": product["trend_change_percent"]}
+    return {
+        "product_id": product_id,
+        "stock_level": product["stock_level"],
+        "keyword_trend": trend
+    }
+
+
+def mock_inventory_index() -> InventoryIndex:
+    return InventoryIndex.from_items((product_id, data["name"], data["stock_level"]) for product_id, data in MOCK_PRODUCT_DB.items())
+
+
+class MockBackend:
+    """
+    프로세스 안의 Mock 데이터 (catalog가 있으면 상품/트렌드/재고 순 조회는 카탈로그에서)
+    - 재고 순 인덱스: 카탈로그의 stock_level 인덱스, 없으면 MOCK_PRODUCT_DB로 만든 InventoryIndex (같은 메서드)
+    """
+
+    name = "mock"
+
+    def __init__(self, catalog: Optional[CatalogStore] = None, inventory: Any = None):
+        self.catalog = catalog
+        self.inventory = inventory if inventory is not None else (catalog if catalog is not None else mock_inventory_index())
+
+    def store_summary(self) -> Dict[str, Any]:
+        """신규 주문 / 미답변 Q&A 수"""
+        return {"new_orders": 5, "pending_qa_count": 2}
+
+    def low_stock(self, threshold: int, limit: int) -> Dict[str, Any]:
+        """재고가 threshold 미만인 상품 (재고 적은 순, 최대 limit개) + 전체 개수"""
+        return {
+            "low_stock_products": self.inventory.below(threshold, limit=limit),
+            "low_stock_count": self.inventory.count_below(threshold)
+        }
+
+    def update_stock(self, product_id: str, stock: int, name: Optional[str] = None):
+        self.inventory.update_stock(product_id, stock, name)
+
+    def analyze_product(self, product_id: str, analysis_keyword: str) -> Dict[str, Any]:
+        """상품 재고 + 키워드 트렌드 (analyze_product_strategy 결과 형식)"""
+        if self.catalog is not None:
+            return self._analyze_from_catalog(product_id, analysis_keyword)
+
+        data = MOCK_PRODUCT_DB.get(product_id, {"stock_level": 50, "trend": 5.0, "keyword": analysis_keyword})
+        return {
+            "product_id": product_id,
+            "stock_level": data["stock_level"],
+            "keyword_trend": {
+                "keyword": data["keyword"],
+                "trend_change_percent": data["trend"]
+            }
+        }
+
+    def _analyze_from_catalog(self, product_id: str, analysis_keyword: str) -> Dict[str, Any]:
+        """카탈로그 기반 분석 (재고: product_id로 조회, 트렌드: 분석 키워드 → 없으면 상품 대표 키워드)"""
+        product = self.catalog.get_product(product_id)
+        if product is None:
+            return product_analysis(product_id, None, None)
+        return product_analysis(product_id, product, self.catalog.get_keyword_trend(analysis_keyword))
+
+    def analyze_products(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """[(product_id, analysis_keyword)] → 같은 순서의 analyze_product 결과 (카탈로그는 상품/트렌드 조회 각 1번)"""
+        if self.catalog is None:
+            return [self.analyze_product(product_id, keyword) for product_id, keyword in items]
+        products = self.catalog.get_products([product_id for product_id, _ in items])
+        trends = self.catalog.get_keyword_trends([keyword for _, keyword in items])
+        return [product_analysis(product_id, products.get(product_id), trends.get(keyword)) for product_id, keyword in items]
+
+    def publish_blog(self, title: str, content: str) -> Dict[str, Any]:
+        return {"post_url": f"https://blog.naver.com/{BLOG_ID}/{stable_number(title, content, low=1000, high=9999)}"}
+
+    def publish_cafe(self, cafe_id: str, menu_id: str, title: str, content: str) -> Dict[str, Any]:
+        return {"article_url": f"https://cafe.naver.com/{cafe_id}/{stable_number(cafe_id, menu_id, title, content, low=100, high=999)}"}
+
+    def alert_sender(self):
+        return MockKakaoSender()
+
+    def summary(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self):
+        pass
+
+
+class UpstreamError(Exception):
+    """업스트림 HTTP 오류 (5xx / 연결 실패 등, 발행 작업은 재시도 대상)"""
+
+
+class HttpBackend:
+    """서비스별 HTTP API 호출 (모든 서비스가 PooledHttpClient 1개를 공유, 호스트마다 연결 풀 1개)"""
+
+    name = "http"
+
+    def __init__(
+        self,
+        endpoints: Optional[Dict[str, str]] = None,
+        max_connections_per_host: int = 8,
+        timeout: float = 5.0,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self.endpoints = {**DEFAULT_HTTP_ENDPOINTS, **(endpoints or {})}
+        self.headers = headers or {}
+        self.http = PooledHttpClient(max_connections_per_host=max_connections_per_host, timeout=timeout)
+
+    def _call(self, method: str, service: str, path: str, payload: Any = None, ok_statuses=(200,)) -> tuple:
+        url = self.endpoints[service].rstrip("/") + path
+        try:
+            status, body = self.http.request_json(method, url, payload, self.headers)
+        except OSError as e: # 연결 실패 / 타임아웃
+            raise UpstreamError(f"{service}: {type(e).__name__}: {e}") from e
+        if status not in ok_statuses:
+            raise UpstreamError(f"{service} {method} {path} → HTTP {status}: {body}")
+        return status, body
+
+    def store_summary(self) -> Dict[str, Any]:
+        """주문/Q&A 수 조회, 업스트림 오류는 analyze_product처럼 Tool 오류 payload로 반환"""
+        try:
+            _, body = self._call("GET", "commerce", "/v1/store/summary")
+        except UpstreamError as e:
+            return {"new_orders": None, "pending_qa_count": None, "error": str(e)}
+        return {"new_orders": body["new_orders"], "pending_qa_count": body["pending_qa_count"]}
+
+    def low_stock(self, threshold: int, limit: int) -> Dict[str, Any]:
+        """재고부족 상품 조회(commerce), 업스트림 오류는 Tool 오류 payload로 반환"""
+        try:
+            _, body = self._call("GET", "commerce", "/v1/inventory/low-stock?" + urlencode({"threshold": threshold, "limit": limit}))
+        except UpstreamError as e:
+            return {"low_stock_products": None, "low_stock_count": None, "error": str(e)}
+        return {"low_stock_products": body["low_stock_products"], "low_stock_count": body["low_stock_count"]}
+
+    def update_stock(self, product_id: str, stock: int, name: Optional[str] = None):
+        """재고 변경을 커머스에 반영 (실패하면 UpstreamError)"""
+        payload = {"stock_level": int(stock)}
+        if name is not None:
+            payload["name"] = name
+        self._call("PUT", "commerce", f"/v1/products/{quote(product_id, safe='')}/stock", payload)
+
+    def analyze_product(self, product_id: str, analysis_keyword: str) -> Dict[str, Any]:
+        """상품 조회(commerce) 후 키워드 트렌드(datalab), 업스트림 오류는 Tool 오류 payload로 반환"""
+        try:
+            status, product = self._call("GET", "commerce", f"/v1/products/{quote(product_id, safe='')}", ok_statuses=(200, 404))
+            if status == 404:
+                return {
+                    "product_id": product_id,
+                    "stock_level": None,
+                    "keyword_trend": None,
+                    "error": f"Unknown product_id '{product_id}'"
+                }
+            status, trend = self._call(
+                "GET", "datalab", f"/v1/keyword-trend?keyword={quote(analysis_keyword, safe='')}", ok_statuses=(200, 404)
+            )
+        except UpstreamError as e:
+            return {"product_id": product_id, "stock_level": None, "keyword_trend": None, "error": str(e)}
+        return product_analysis(product_id, product, trend if status == 200 else None)
+
+    def analyze_products(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        [(product_id, analysis_keyword)] → 같은 순서의 analyze_product 결과
+        상품 일괄 조회(commerce) 1번 + 키워드 트렌드 일괄 조회(datalab) 1번, 업스트림 오류는 모든 상품의 오류 payload로 반환
+        """
+        if not items:
+            return []
+        product_ids = list(dict.fromkeys(product_id for product_id, _ in items))
+        keywords = list(dict.fromkeys(keyword for _, keyword in items))
+        try:
+            _, body = self._call("GET", "commerce", "/v1/products?" + urlencode([("ids", i) for i in product_ids]))
+            products = body["products"]
+            _, body = self._call("GET", "datalab", "/v1/keyword-trends?" + urlencode([("keyword", k) for k in keywords]))
+            trends = body["trends"]
+        except UpstreamError as e:
+            return [
+                {"product_id": product_id, "stock_level": None, "keyword_trend": None, "error": str(e)}
+                for product_id, _ in items
+            ]
+        return [product_analysis(product_id, products.get(product_id), trends.get(keyword)) for product_id, keyword in items]
+
+    def publish_blog(self, title: str, content: str) -> Dict[str, Any]:
+        _, body = self._call("POST", "blog", f"/v1/blogs/{BLOG_ID}/posts", {"title": title, "content": content}, ok_statuses=(200, 201))
+        return {"post_url": body["post_url"]}
+
+    def publish_cafe(self, cafe_id: str, menu_id: str, title: str, content: str) -> Dict[str, Any]:
+        path = f"/v1/cafes/{quote(cafe_id, safe='')}/menus/{quote(menu_id, safe='')}/articles"
+        _, body = self._call("POST", "cafe", path, {"title": title, "content": content}, ok_statuses=(200, 201))
+        return {"article_url": body["article_url"]}
+
+    def alert_sender(self):
+        return KakaoHttpSender(self.endpoints["kakao"].rstrip("/") + KAKAO_SEND_PATH, http=self.http)
+
+    def summary(self) -> Dict[str, Any]:
+        return self.http.summary()
+
+    def close(self):
+        self.http.close()
+
+
+def load_backend_config(path: Optional[str]) -> Dict[str, Any]:
+    """
+    http 백엔드 설정 JSON (모든 키 생략 가능):
+        {"endpoints": {"commerce": "https://...", ...}, "max_connections_per_host": 8, "timeout": 5.0, "headers": {...}}
+    """
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def create_backend(name: str, catalog: Optional[CatalogStore] = None, config: Optional[Dict[str, Any]] = None):
+    if name == "mock":
+        return MockBackend(catalog)
+    if name == "http":
+        return HttpBackend(**(config or {}))
+    raise ValueError(f"Unknown tool backend: {name} (choose from {TOOL_BACKENDS})")
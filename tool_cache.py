@@ -0,0 +1,96 @@
+"""
+tool_cache.py - 조회(읽기 전용) Tool 결과의 TTL 메모이제이션
+
+- 키: (Tool 이름, 기본값을 채우고 키를 정렬한 인자 JSON) → 인자 순서/기본값 생략 여부와 무관하게 같은 키
+- 항목마다 만료 시각(TTL)을 두고, 전체 항목 수 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+- Tool별 hit / miss / expired 카운터 제공
+- 오류가 담긴 결과({"error": ...})는 일시적일 수 있으므로 저장하지 않음
+- 스레드 풀의 여러 워커가 동시에 사용하므로 내부 상태는 락으로 보호
+"""
+
+import json
+import time
+import inspect
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Tuple
+
+
+_signature = lru_cache(maxsize=None)(inspect.signature)
+
+
+def normalize_args(func: Callable, args: Dict[str, Any]) -> str:
+    """함수 시그니처 기본값을 채운 뒤 키를 정렬한 JSON 문자열 (캐시 키용)"""
+    try:
+        bound = _signature(func).bind(**args)
+        bound.apply_defaults()
+        args = dict(bound.arguments)
+    except TypeError:
+        pass # 잘못된 인자는 그대로 호출되어 원래 오류가 나도록 둠
+    return json.dumps(args, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+class ToolResultCache:
+    """크기 제한이 있는 TTL + LRU 캐시"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, key: str):
+        tool_stats = self.stats.setdefault(name, {"hits": 0, "misses": 0, "expired": 0})
+        tool_stats[key] += 1
+
+    def get_or_call(self, name: str, func: Callable, args: Dict[str, Any], ttl: float) -> Tuple[Any, bool]:
+        """캐시에 유효한 결과가 있으면 반환, 없으면 func(**args) 실행 후 저장. 반환: (결과, 캐시 히트 여부)"""
+        key = (name, normalize_args(func, args))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._count(name, "hits")
+                    return result, True
+                del self._entries[key]
+                self._count(name, "expired")
+            self._count(name, "misses")
+
+        result = func(**args)
+        if isinstance(result, dict) and "error" in result:
+            return result, False
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result, False
+
+    def invalidate(self, name: str):
+        """특정 Tool의 캐시 항목 모두 삭제 (원본 데이터가 바뀐 경우)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            per_tool = {name: dict(tool_stats) for name, tool_stats in sorted(self.stats.items())}
+            entries = len(self._entries)
+        hits = sum(s["hits"] for s in per_tool.values())
+        lookups = hits + sum(s["misses"] for s in per_tool.values())
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "tools": per_tool
+        }
@@ -0,0 +1,158 @@
+"""
+tool_schemas.py - O조 8개 Tool의 JSON 스키마 (function calling tools 스펙)
+
+- run_scenarios.py: Solar API 요청의 tools로 그대로 전달 + 실행 전 인자 검증
+- run_evaluation.py: 평가 규칙 (정의된 함수 / 필수 인자 / 타입 / enum / 정의되지 않은 인자)
+검증 함수는 tool_validators.compile_validators()로 이 스키마에서 생성 → 스키마와 검증 규칙이 항상 같음
+"""
+
+TOOL_SCHEMAS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_store_dashboard",
+            "description": "일일 스토어 현황 요약 (신규주문, Q&A 개수, 재고부족)을 조회합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "low_stock_threshold": {
+                        "type": "string", 
+                        "description": "재고 부족으로 간주할 기준 숫자(문자열 형태)"
+                    }
+                },
+                "required": [],
+                "additionalProperties": False
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "analyze_product_strategy",
+            "description": "특정 상품의 재고와 키워드 트렌드를 동시에 분석합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "product_id": {"type": "string", "description": "분석할 상품의 고유 ID (예: P123)"},
+                    "analysis_keyword": {"type": "string", "description": "분석에 사용할 연관 키워드 (예: '캠핑 의자')"}
+                },
+                "required": ["product_id", "analysis_keyword"],
+                "additionalProperties": False
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "analyze_products_batch",
+            "description": "여러 상품(최대 100개)의 재고와 키워드 트렌드를 한 번에 분석하고 재입고/광고 우선순위로 정렬합니다. 상품 2개 이상을 비교할 때 사용합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "product_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "분석할 상품 ID 목록 (예: ['P123', 'P456'])"
+                    },
+                    "analysis_keywords": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "product_ids와 같은 순서의 상품별 연관 키워드 목록 (예: ['캠핑 의자', '게이밍 의자'])"
+                    }
+                },
+                "required": ["product_ids", "analysis_keywords"],
+                "additionalProperties": False
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_top_shopping_trend",
+            "description": "특정 카테고리의 현재 쇼핑 트렌드 1위 키워드(및 상위 키워드 순위)를 조회합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "category_code": {"type": "string", "description": "네이버 쇼핑 카테고리 코드 (예: '50000000'은 '패션/잡화')"},
+                    "top_n": {"type": "string", "description": "조회할 상위 키워드 개수(문자열 형태, 기본 '1', 최대 '10')"},
+                    "window": {
+                        "type": "string",
+                        "description": "트렌드 집계 기간 (7d: 최근 7일, 28d: 최근 28일, 기본 7d)",
+                        "enum": ["7d", "28d"]
+                    }
+                },
+                "required": ["category_code"],
+                "additionalProperties": False
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "post_blog_promotion",
+            "description": "AI(Solar)가 생성한 제목과 본문을 네이버 블로그에 포스팅합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string", "description": "포스팅할 블로그 글의 제목"},
+                    "content": {"type": "string", "description": "포스팅할 블로그 글의 본문 (HTML 또는 텍스트)"}
+                },
+                "required": ["title", "content"],
+                "additionalProperties": False
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "post_cafe_article",
+            "description": "AI(Solar)가 생성한 글을 네이버 카페에 포스팅합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "cafe_id": {"type": "string", "description": "네이버 카페 고유 ID"},
+                    "menu_id": {"type": "string", "description": "카페 내 게시판(메뉴) ID"},
+                    "title": {"type": "string", "description": "게시글 제목"},
+                    "content": {"type": "string", "description": "게시글 본문"}
+                },
+                "required": ["cafe_id", "menu_id", "title", "content"],
+                "additionalProperties": False
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_publish_status",
+            "description": "블로그/카페 발행 작업(job_id)의 진행 상태와 완료된 게시글 URL을 조회합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string", "description": "post_blog_promotion / post_cafe_article이 반환한 발행 작업 ID (예: PJ-1a2b3c4d5e6f)"}
+                },
+                "required": ["job_id"],
+                "additionalProperties": False
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "alert_seller",
+            "description": "판매자에게 긴급 알림을 전송합니다(카톡).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "message": {"type": "string", "description": "전송할 알림 메시지 내용"},
+                    "alert_level": {
+                        "type": "string", 
+                        "description": "알림 수준 (info: 정보, warning: 경고, urgent: 긴급)",
+                        "enum": ["info", "warning", "urgent"]
+                    }
+                },
+                "required": ["message", "alert_level"],
+                "additionalProperties": False
+            }
+        }
+    }
+]
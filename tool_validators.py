@@ -0,0 +1,118 @@
+"""
+tool_validators.py - Tool JSON 스키마 → Tool별 인자 검증 함수 컴파일 (시작 시 1번)
+
+- 스키마의 required / properties.type(array면 items.type) / enum / additionalProperties를 Tool마다 전용 파이썬 함수 1개로 생성
+  → 인자 dict를 한 번만 순회하고, 인자 이름별 검사는 상수로 펼쳐진 if 분기 (규칙 테이블 조회 없음)
+- 검증 함수(arguments) → 오류 메시지 목록 (비어 있으면 통과)
+  - 필수 인자가 빠지면 누락 오류 1개만 반환 (타입/enum 검사 생략)
+  - 타입 오류를 인자 순서대로, 그 뒤에 enum 오류를 인자 순서대로, 마지막에 정의되지 않은 인자 오류 1개
+  - 스키마에 없는 인자는 additionalProperties: false일 때만 오류 (Tool 함수 호출 시 TypeError 방지)
+- run_scenarios.py(실행 전 검사)와 run_evaluation.py(BFCL 평가)가 같은 검증 함수 사용
+"""
+
+from typing import Dict, Any, List, Callable
+
+# JSON 스키마 타입 → 값 v를 검사하는 파이썬 식 (없는 타입은 검사하지 않음)
+_TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "array": "isinstance({v}, list)",
+    "object": "isinstance({v}, dict)",
+    "boolean": "isinstance({v}, bool)",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))"
+}
+
+ToolValidator = Callable[[Any], List[str]]
+
+
+def _type_check(spec: Dict[str, Any], var: str) -> str:
+    """property 스키마 → 타입 검사 식 (array는 items 타입까지), 검사할 것이 없으면 빈 문자열"""
+    check = _TYPE_CHECKS.get(spec.get("type"))
+    if check is None:
+        return ""
+    check = check.format(v=var)
+    items = spec.get("items")
+    if spec.get("type") == "array" and isinstance(items, dict):
+        item_check = _type_check(items, "item")
+        if item_check:
+            check = f"({check} and all({item_check} for item in {var}))"
+    return check
+
+
+def validator_source(parameters: Dict[str, Any]) -> str:
+    """Tool의 parameters 스키마 → 검증 함수 소스 코드"""
+    required = list(parameters.get("required", []))
+    properties = parameters.get("properties", {})
+
+    lines = [
+        "def validate(arguments):",
+        "    if not isinstance(arguments, dict):",
+        "        return [f\"인자가 JSON 객체가 아님 (실제: {type(arguments).__name__})\"]"
+    ]
+    if required:
+        lines += [
+            f"    if {' or '.join(f'{name!r} not in arguments' for name in required)}:",
+            f"        missing = [name for name in {tuple(required)!r} if name not in arguments]",
+            "        return [f\"필수 인자 누락: {missing}\"]"
+        ]
+
+    branches = []
+    for name, spec in properties.items():
+        body = []
+        check = _type_check(spec, "value")
+        if check:
+            body += [
+                f"            if not {check}:",
+                f"                type_errors.append(f\"'{{name}}' 타입 오류 (기대: \" + {spec['type'] + ', 실제: '!r} + f\"{{type(value).__name__}})\")"
+            ]
+        if "enum" in spec:
+            body += [
+                f"            if value not in {tuple(spec['enum'])!r}:",
+                f"                enum_errors.append(f\"'{{name}}' 허용되지 않는 값: {{value}} (기대: \" + {str(list(spec['enum'])) + ')'!r})"
+            ]
+        if body:
+            branches.append((name, body))
+
+    closed = parameters.get("additionalProperties", True) is False
+    if not branches and not closed:
+        lines.append("    return []")
+        return "\n".join(lines) + "\n"
+
+    lines += ["    type_errors = []", "    enum_errors = []"]
+    if closed:
+        lines.append("    unknown = []")
+    lines.append("    for name, value in arguments.items():")
+    for i, (name, body) in enumerate(branches):
+        lines.append(f"        {'if' if i == 0 else 'elif'} name == {name!r}:")
+        lines += body
+    if not closed:
+        lines.append("    return type_errors + enum_errors")
+        return "\n".join(lines) + "\n"
+
+    lines += [
+        f"        {'elif' if branches else 'if'} name not in {tuple(properties)!r}:",
+        "            unknown.append(name)",
+        "    if unknown:",
+        "        return type_errors + enum_errors + [f\"정의되지 않은 인자: {unknown}\"]",
+        "    return type_errors + enum_errors"
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def compile_validator(name: str, parameters: Dict[str, Any]) -> ToolValidator:
+    source = validator_source(parameters)
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<validator {name}>", "exec"), namespace)
+    validator = namespace["validate"]
+    validator.__name__ = validator.__qualname__ = f"validate_{name}"
+    validator.source = source # 디버깅용 (생성된 코드 확인)
+    return validator
+
+
+def compile_validators(tool_schemas: List[Dict[str, Any]]) -> Dict[str, ToolValidator]:
+    """tools 스펙(function calling 형식) → {Tool 이름: 검증 함수}"""
+    validators = {}
+    for tool in tool_schemas:
+        function = tool["function"]
+        validators[function["name"]] = compile_validator(function["name"], function.get("parameters", {}))
+    return validators
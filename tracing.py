@@ -0,0 +1,195 @@
+"""
+tracing.py - 에이전트 루프 실행 구간(span)을 Chrome trace-event JSON으로 기록
+
+- 시나리오 / 턴 / LLM 호출 / Tool 실행(인자 파싱, 함수 실행) / 결과 직렬화 구간을 "X"(complete) 이벤트로 기록
+- 결과 파일은 https://ui.perfetto.dev 또는 chrome://tracing 에서 바로 열림
+- 동시에 실행되는 시나리오는 각자 별도 트랙(lane)에, Tool 실행은 워커 스레드별 트랙에 표시
+- 꺼져 있으면(start() 호출 전) span()은 공유 no-op 객체를 반환 → 오버헤드 거의 없음
+
+사용:
+    tracing.start()
+    with tracing.span("call_solar_api", "llm", iteration=1) as s:
+        ...
+        s.set(prompt_tokens=123)
+    tracing.save("artifacts/trace.json")
+"""
+
+import os
+import json
+import heapq
+import threading
+import contextvars
+from time import perf_counter_ns
+from typing import Dict, Any, List, Optional
+
+# 현재 실행 중인 시나리오의 (트랙 id, 시나리오 id) - asyncio Task마다 독립
+_current_track: contextvars.ContextVar = contextvars.ContextVar("trace_track", default=None)
+
+MAIN_TRACK = 0
+THREAD_TRACK_BASE = 1000
+
+
+class _NullSpan:
+    """tracing이 꺼져 있을 때 사용하는 no-op span"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, cat: str, tid: int, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.tid = tid
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add_complete(self.name, self.cat, self.tid, self.start_ns, end_ns, self.args)
+        return False
+
+    def set(self, **args):
+        """구간이 끝나기 전에 알게 된 값(토큰 수, 재시도 횟수 등)을 args에 추가"""
+        self.args.update(args)
+
+
+class Tracer:
+    """trace 이벤트 수집기 (list.append만 사용하므로 워커 스레드에서도 안전)"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.origin_ns = perf_counter_ns()
+        self.events: List[Dict[str, Any]] = []
+        self.track_names: Dict[int, str] = {MAIN_TRACK: "main"}
+        self._free_lanes: List[int] = []
+        self._num_lanes = 0
+        self._thread_tracks: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _us(self, ns: int) -> float:
+        return (ns - self.origin_ns) / 1000.0
+
+    def add_complete(self, name: str, cat: str, tid: int, start_ns: int, end_ns: int, args: Dict[str, Any]):
+        self.events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self._us(start_ns),
+            "dur": (end_ns - start_ns) / 1000.0,
+            "pid": self.pid,
+            "tid": tid,
+            "args": args
+        })
+
+    def acquire_lane(self) -> int:
+        """비어 있는 시나리오 트랙 중 번호가 가장 작은 것 (동시 실행 수만큼만 트랙 생성)"""
+        if self._free_lanes:
+            return heapq.heappop(self._free_lanes)
+        self._num_lanes += 1
+        self.track_names[self._num_lanes] = f"scenario lane {self._num_lanes}"
+        return self._num_lanes
+
+    def release_lane(self, lane: int):
+        heapq.heappush(self._free_lanes, lane)
+
+    def thread_track(self) -> int:
+        ident = threading.get_ident()
+        track = self._thread_tracks.get(ident)
+        if track is None:
+            with self._lock:
+                track = THREAD_TRACK_BASE + len(self._thread_tracks)
+                self._thread_tracks[ident] = track
+                self.track_names[track] = threading.current_thread().name
+        return track
+
+    def to_json(self) -> Dict[str, Any]:
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "tid": MAIN_TRACK, "args": {"name": "run_scenarios"}}
+        ]
+        for tid, name in sorted(self.track_names.items()):
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+            metadata.append({"name": "thread_sort_index", "ph": "M", "pid": self.pid, "tid": tid, "args": {"sort_index": tid}})
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+
+# main에서 start()로 켜기 전까지는 None (= tracing 꺼짐)
+_tracer: Optional[Tracer] = None
+
+
+def start() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, cat: str, **args):
+    """현재 시나리오 트랙(없으면 main 트랙)에 구간 기록"""
+    if _tracer is None:
+        return _NULL_SPAN
+    current = _current_track.get()
+    return Span(_tracer, name, cat, current[0] if current else MAIN_TRACK, args)
+
+
+def thread_span(name: str, cat: str, **args):
+    """현재 워커 스레드 트랙에 구간 기록 (병렬 Tool 실행처럼 시나리오 트랙에서 겹치는 구간용)"""
+    if _tracer is None:
+        return _NULL_SPAN
+    current = _current_track.get()
+    if current is not None:
+        args["scenario"] = current[1]
+    return Span(_tracer, name, cat, _tracer.thread_track(), args)
+
+
+class scenario_track:
+    """with 블록 동안 현재 Task의 구간을 빈 시나리오 트랙 하나에 기록하고, 블록 전체를 scenario 구간으로 기록"""
+
+    def __init__(self, scenario_id: str):
+        self.scenario_id = scenario_id
+        self.span = None
+
+    def __enter__(self):
+        if _tracer is None:
+            return _NULL_SPAN
+        self.tracer = _tracer
+        self.lane = self.tracer.acquire_lane()
+        self.token = _current_track.set((self.lane, self.scenario_id))
+        self.span = Span(self.tracer, self.scenario_id, "scenario", self.lane, {"scenario": self.scenario_id})
+        return self.span.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.span is None:
+            return False
+        self.span.__exit__(exc_type, exc, tb)
+        _current_track.reset(self.token)
+        self.tracer.release_lane(self.lane)
+        return False
+
+
+def save(path: str) -> int:
+    """수집한 이벤트를 Chrome trace-event JSON으로 저장하고 이벤트 수 반환"""
+    if _tracer is None:
+        return 0
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_tracer.to_json(), f, ensure_ascii=False)
+    return len(_tracer.events)
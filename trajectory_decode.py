@@ -0,0 +1,98 @@
+"""
+trajectory_decode.py - 평가에 필요한 필드(id, tool_calls, metadata)만 골라 읽는 JSONL 디코더
+
+궤적 로그 한 줄의 대부분은 conversation(assistant 메시지 model_dump 전체)이지만 평가에는 쓰지 않음
+- msgspec이 있으면: 필요한 필드만 정의한 타입(Struct)으로 디코딩 → conversation은 객체를 만들지 않고 건너뜀
+- 없으면: 최상위 "tool_calls" 키부터 줄 끝까지만 파싱 (orjson이 있으면 orjson, 없으면 표준 json)
+  - JSON 문자열 안의 따옴표는 항상 이스케이프되므로 '"tool_calls": '가 그대로 나오는 곳은 실제 키뿐
+  - 마지막 ', "metadata": ' 앞에서부터 거꾸로 후보를 찾아 '{' + 나머지를 파싱 → 최상위 키일 때만 괄호 짝이 맞아 성공
+  - id는 줄 맨 앞의 '{"id": "..."' 에서 읽음
+  - run_scenarios.py 출력 순서(id, query, conversation, tool_calls, metadata)가 아니면 전체 파싱으로 대체
+"""
+
+import re
+import json
+from typing import Dict, Any, List, Optional
+
+try:
+    import msgspec
+except ImportError: # 선택 의존성
+    msgspec = None
+
+try:
+    import orjson
+except ImportError: # 선택 의존성
+    orjson = None
+
+_fast_loads = orjson.loads if orjson is not None else json.loads
+_ID_PREFIX = re.compile(rb'\A\s*\{\s*"id"\s*:\s*("(?:[^"\\]|\\.)*")\s*,')
+_TOOL_CALLS_KEY = b'"tool_calls": '
+_METADATA_KEY = b', "metadata": '
+
+# 디코딩 실패 시 발생하는 예외 (건너뛸 줄 판단용)
+DECODE_ERRORS = (ValueError, UnicodeDecodeError) + ((msgspec.DecodeError,) if msgspec is not None else ())
+
+
+if msgspec is not None:
+    class _Metadata(msgspec.Struct):
+        scenario_type: str = "unknown"
+
+    class _Entry(msgspec.Struct):
+        id: Any = "unknown"
+        tool_calls: List[Any] = []
+        metadata: _Metadata = msgspec.field(default_factory=_Metadata)
+
+    _entry_decoder = msgspec.json.Decoder(_Entry)
+
+    def _decode_selective(line: bytes) -> Dict[str, Any]:
+        entry = _entry_decoder.decode(line)
+        return {"id": entry.id, "tool_calls": entry.tool_calls, "metadata": {"scenario_type": entry.metadata.scenario_type}}
+
+    SELECTIVE_DECODER = "msgspec"
+
+else:
+    def _decode_tail(line: bytes) -> Optional[Dict[str, Any]]:
+        """최상위 tool_calls / metadata만 파싱 (형식이 다르면 None)"""
+        # metadata.turns[].tool_calls 같은 뒤쪽 중첩 키는 건너뛰고 최상위 metadata 키 앞부터 후보 탐색
+        end = line.rfind(_METADATA_KEY)
+        if end < 0:
+            end = len(line)
+        while True:
+            position = line.rfind(_TOOL_CALLS_KEY, 0, end)
+            if position <= 0:
+                return None
+            try:
+                tail = _fast_loads(b"{" + line[position:])
+            except ValueError:
+                end = position # 중첩된 키 → 더 앞의 후보
+                continue
+            return tail if isinstance(tail, dict) and "metadata" in tail else None
+
+    def _decode_selective(line: bytes) -> Dict[str, Any]:
+        head = _ID_PREFIX.match(line)
+        tail = _decode_tail(line) if head else None
+        if tail is None:
+            return full_decode(line)
+        metadata = tail["metadata"]
+        return {
+            "id": _fast_loads(head.group(1)),
+            "tool_calls": tail["tool_calls"],
+            "metadata": {"scenario_type": metadata.get("scenario_type", "unknown")} if isinstance(metadata, dict) else metadata
+        }
+
+    SELECTIVE_DECODER = "tail-scan+orjson" if orjson is not None else "tail-scan+json"
+
+
+def full_decode(line: bytes) -> Any:
+    """줄 전체 파싱 (orjson이 거부하는 NaN / 큰 정수 등은 표준 json으로 다시 시도)"""
+    try:
+        return _fast_loads(line)
+    except ValueError:
+        if _fast_loads is json.loads:
+            raise
+        return json.loads(line)
+
+
+def decode_entry(line: bytes, selective: bool = True) -> Any:
+    """평가용 디코딩: selective면 id / tool_calls / metadata.scenario_type만"""
+    return _decode_selective(line) if selective else full_decode(line)
@@ -0,0 +1,160 @@
+"""
+trend_engine.py - get_top_shopping_trend용 카테고리별 키워드 트렌드 롤업
+
+- 카테고리마다 키워드 x 일(day) 검색량 링 버퍼(최근 2 x 최대 윈도우 일수만 보관)
+- 하루치 검색량이 들어올 때마다 윈도우별 현재/직전 구간 합계를 들어온 값과 빠지는 값만으로 갱신 (NumPy, 키워드 전체 한 번에)
+- 같은 시점에 윈도우별 trend_score(카테고리 내 최고 대비 0~100) / change_percent(직전 구간 대비)와 상위 MAX_TOP_N 순위를 미리 계산
+- 조회는 미리 계산된 순위를 잘라서 반환 → 전체 이력을 다시 계산하지 않음
+- 데이터가 없는 카테고리는 전체 카테고리 합산 롤업으로 대체 (카테고리별 구간 합계를 키워드별로 더해 계산, 데이터가 바뀔 때까지 재사용)
+
+트렌드 데이터 파일 (JSONL, 한 줄에 하루치 검색량 1건):
+    {"category": "50000000", "keyword": "경량 패딩", "date": "2025-01-01", "volume": 1234}
+"""
+
+import json
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+# 지원하는 집계 윈도우 (Tool 인자 window 값 → 일수)
+TREND_WINDOWS = {"7d": 7, "28d": 28}
+DEFAULT_WINDOW = "7d"
+# 카테고리별로 미리 계산해 두는 최대 순위 수 (Tool 인자 top_n 상한)
+MAX_TOP_N = 10
+
+
+def rank_keywords(keywords: List[str], current: np.ndarray, previous: np.ndarray, has_previous: bool) -> List[Dict[str, Any]]:
+    """구간 합계 → 상위 MAX_TOP_N개 (trend_score: 최고 대비 0~100, change_percent: 직전 구간 대비)"""
+    k = min(MAX_TOP_N, len(keywords))
+    if k == 0:
+        return []
+    peak = current.max()
+    score = current / peak * 100.0 if peak > 0 else np.zeros_like(current)
+    change = np.where(previous > 0, (current - previous) / np.where(previous > 0, previous, 1.0) * 100.0, 0.0)
+    candidates = np.argpartition(-score, k - 1)[:k]
+    ordered = candidates[np.argsort(-score[candidates], kind="stable")]
+    return [
+        {
+            "rank": rank,
+            "keyword": keywords[i],
+            "trend_score": round(float(score[i]), 1),
+            "change_percent": round(float(change[i]), 1) if has_previous else None
+        }
+        for rank, i in enumerate(ordered, start=1)
+    ]
+
+
+class CategoryRollup:
+    """카테고리 1개의 키워드별 롤링 윈도우 집계"""
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(keywords)
+        self.history_days = 2 * max(TREND_WINDOWS.values())
+        self.buffer = np.zeros((len(self.keywords), self.history_days))
+        self.head = 0 # 다음에 쓸 열
+        self.days = 0
+        self.sums = {
+            name: {"current": np.zeros(len(self.keywords)), "previous": np.zeros(len(self.keywords))}
+            for name in TREND_WINDOWS
+        }
+        self.top: Dict[str, List[Dict[str, Any]]] = {name: [] for name in TREND_WINDOWS}
+
+    def _column(self, days_ago: int) -> int:
+        """days_ago일 전 값이 있는 열 (0 = 가장 최근 날)"""
+        return (self.head - 1 - days_ago) % self.history_days
+
+    def add_day(self, volumes: np.ndarray, rerank: bool = True):
+        """하루치 검색량(키워드 순서) 반영 후 순위 갱신 (일괄 적재 중에는 마지막 날만 rerank)"""
+        for name, window in TREND_WINDOWS.items():
+            sums = self.sums[name]
+            # 오늘이 들어오면 window-1일 전 값은 현재 → 직전 구간으로, 2*window-1일 전 값은 직전 구간에서 빠짐
+            moving = self.buffer[:, self._column(window - 1)] if self.days >= window else 0.0
+            leaving = self.buffer[:, self._column(2 * window - 1)] if self.days >= 2 * window else 0.0
+            sums["current"] += volumes - moving
+            sums["previous"] += moving - leaving
+
+        self.buffer[:, self.head] = volumes
+        self.head = (self.head + 1) % self.history_days
+        self.days += 1
+        if rerank:
+            self._rerank()
+
+    def _rerank(self):
+        for name, window in TREND_WINDOWS.items():
+            sums = self.sums[name]
+            self.top[name] = rank_keywords(self.keywords, sums["current"], sums["previous"], self.days >= 2 * window)
+
+
+class TrendEngine:
+    """카테고리 코드 → CategoryRollup"""
+
+    def __init__(self):
+        self.categories: Dict[str, CategoryRollup] = {}
+        self._version = 0 # 적재할 때마다 증가 → 전체 합산 순위 캐시 무효화
+        self._overall: Dict[str, tuple] = {} # window → (version, 순위)
+
+    def ingest(self, category: str, keyword_series: Dict[str, List[float]]):
+        """카테고리의 키워드별 일별 검색량(오래된 날부터)을 한 번에 적재 (키워드 목록은 첫 적재 기준)"""
+        rollup = self.categories.get(category)
+        if rollup is None:
+            rollup = self.categories[category] = CategoryRollup(list(keyword_series))
+        matrix = np.array([keyword_series.get(k, []) for k in rollup.keywords], dtype=float)
+        num_days = matrix.shape[1] if matrix.ndim == 2 else 0
+        for day in range(num_days):
+            rollup.add_day(matrix[:, day], rerank=(day == num_days - 1))
+        self._version += 1
+
+    def add_day(self, category: str, volumes: Dict[str, float]):
+        """하루치 검색량 이벤트 반영 (목록에 없는 키워드는 무시, 빠진 키워드는 0)"""
+        rollup = self.categories[category]
+        rollup.add_day(np.array([volumes.get(k, 0.0) for k in rollup.keywords], dtype=float))
+        self._version += 1
+
+    def keywords(self) -> List[str]:
+        """모든 카테고리의 키워드 (중복 포함)"""
+        return [k for rollup in self.categories.values() for k in rollup.keywords]
+
+    def top_keywords(self, category: str, top_n: int = 1, window: str = DEFAULT_WINDOW) -> Optional[List[Dict[str, Any]]]:
+        """미리 계산된 상위 top_n개 (카테고리 데이터가 없으면 None)"""
+        rollup = self.categories.get(category)
+        if rollup is None or rollup.days == 0:
+            return None
+        return rollup.top[window][:max(1, min(top_n, MAX_TOP_N))]
+
+    def overall_top_keywords(self, top_n: int = 1, window: str = DEFAULT_WINDOW) -> Optional[List[Dict[str, Any]]]:
+        """전체 카테고리 합산 상위 top_n개 (키워드별 구간 합계를 카테고리에 걸쳐 더함, 데이터가 없으면 None)"""
+        cached = self._overall.get(window)
+        if cached is None or cached[0] != self._version:
+            rollups = [r for r in self.categories.values() if r.days > 0]
+            if not rollups:
+                return None
+            keywords = sorted({k for r in rollups for k in r.keywords})
+            position = {k: i for i, k in enumerate(keywords)}
+            current, previous = np.zeros(len(keywords)), np.zeros(len(keywords))
+            for rollup in rollups:
+                index = [position[k] for k in rollup.keywords]
+                np.add.at(current, index, rollup.sums[window]["current"])
+                np.add.at(previous, index, rollup.sums[window]["previous"])
+            has_previous = all(r.days >= 2 * TREND_WINDOWS[window] for r in rollups)
+            cached = self._overall[window] = (self._version, rank_keywords(keywords, current, previous, has_previous))
+        return cached[1][:max(1, min(top_n, MAX_TOP_N))]
+
+
+def load_trend_file(path: str, engine: Optional[TrendEngine] = None) -> TrendEngine:
+    """트렌드 데이터 JSONL을 카테고리/날짜별로 모아 적재"""
+    engine = engine or TrendEngine()
+    volumes = defaultdict(lambda: defaultdict(dict)) # category → keyword → date → volume
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            volumes[str(row["category"])][row["keyword"]][row["date"]] = float(row["volume"])
+
+    for category, by_keyword in volumes.items():
+        dates = sorted({d for series in by_keyword.values() for d in series})
+        engine.ingest(category, {
+            keyword: [series.get(d, 0.0) for d in dates] for keyword, series in by_keyword.items()
+        })
+    return engine